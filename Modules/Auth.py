@@ -1,11 +1,10 @@
 from flask import Blueprint, jsonify, request
-from werkzeug.security import generate_password_hash, check_password_hash
-from flask_jwt_extended import create_access_token
 # from Modules.misc import users, add_user
-from datetime import timedelta
 import re
 from Modules.SQLModels import User
 from Modules.DBConn import db
+from Modules.jwt_utils import generate_jwt
+from Modules.passwords import PasswordHashingBusy, hash_password, verify_password, needs_rehash
 
 auth = Blueprint("auth", __name__)
 
@@ -36,8 +35,11 @@ def register():
     if existing_user:
         return jsonify({'message': 'Username-ul sau email-ul există deja'}), 409
 
-    # hash parola
-    hashed_pw = generate_password_hash(password)
+    # hash parola (în pool-ul de procese)
+    try:
+        hashed_pw = hash_password(password)
+    except PasswordHashingBusy as e:
+        return _busy(e)
 
     new_user = User(
         id=None,  # dacă e IDENTITY în SQL, poți lăsa None
@@ -52,10 +54,7 @@ def register():
     db.session.add(new_user)
     db.session.commit()
 
-    access_token = create_access_token(
-        identity=new_user.username,
-        expires_delta=timedelta(hours=1)
-    )
+    access_token = generate_jwt(new_user)
 
     return jsonify({
         'message': 'User înregistrat cu succes!',
@@ -80,16 +79,22 @@ def login():
     # căutăm userul în DB
     user = User.query.filter_by(username=username).first()
 
-    if not user or not check_password_hash(user.password, password):
-        return jsonify({'message': 'Credențiale invalide'}), 401
+    try:
+        if not user or not verify_password(user.password, password):
+            return jsonify({'message': 'Credențiale invalide'}), 401
 
-    if not user.is_active:
-        return jsonify({'message': 'Contul este dezactivat'}), 403
+        if not user.is_active:
+            return jsonify({'message': 'Contul este dezactivat'}), 403
 
-    access_token = create_access_token(
-        identity=user.username,
-        expires_delta=timedelta(hours=1)
-    )
+        # hash salvat cu o metodă / un cost mai vechi: îl refacem cât avem parola în clar
+        if needs_rehash(user.password):
+            user.password = hash_password(password)
+            db.session.commit()
+    except PasswordHashingBusy as e:
+        db.session.rollback()
+        return _busy(e)
+
+    access_token = generate_jwt(user)
 
     return jsonify({
         'message': f'Bine ai venit, {user.nume}!',
@@ -97,3 +102,9 @@ def login():
         'name': user.nume,
         'role': user.role
     }), 200
+
+
+def _busy(error):
+    response = jsonify({'message': f'Serviciul de autentificare este ocupat: {error}'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
@@ -1,32 +1,92 @@
 # DBConn.py
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import OperationalError
 from colorama import init, Fore
-from Modules.misc import get_setting
+from Modules.misc import config, get_setting
 
 db = SQLAlchemy()
 
 # Inițializează colorama
 init(autoreset=True)
 
-def init_db(app):
+
+def database_uri():
+    """db.uri dacă e setat (ex. sqlite:///local.db pentru benchmark-uri), altfel SQL Server."""
+    uri = get_setting('db.uri')
+    if uri:
+        return uri
     # Preluăm setările din settings.json
     NUME = get_setting('db.username')
     PAROLA = get_setting('db.password')
     DBNUME = get_setting('db.database')
     SERVER = get_setting('db.server')
+    return f'mssql+pyodbc://{NUME}:{PAROLA}@{SERVER}/{DBNUME}?driver=ODBC+Driver+17+for+SQL+Server'
+
+
+def engine_options(uri):
+    """Opțiunile de pool din config.pool, doar cele pe care dialectul le acceptă."""
+    url = make_url(uri)
+    pool = config.pool
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # SQLite în memorie: o conexiune per thread, fără pool configurabil
+        return {}
+
+    # fiecare thread de request poate ține o conexiune, iar fan-out-ul /search mai are
+    # nevoie de cel puțin una peste cele rezervate: overflow-ul crește dacă nu ajung
+    needed = get_setting('server.threads', 4) + get_setting('limits.search_fanout.reserved_connections', 2) + 1
+    options = {
+        'pool_size': pool.size,
+        'max_overflow': max(pool.max_overflow, needed - pool.size),
+        'pool_pre_ping': pool.pre_ping,
+        'pool_recycle': pool.recycle,
+        'pool_timeout': pool.timeout,
+    }
+    if url.get_backend_name() == "mssql" and url.get_driver_name() == "pyodbc":
+        # executemany trimis într-un singur round-trip de pyodbc (importuri în masă)
+        options['fast_executemany'] = True
+    return options
+
 
-    DATABASE_URI = f'mssql+pyodbc://{NUME}:{PAROLA}@{SERVER}/{DBNUME}?driver=ODBC+Driver+17+for+SQL+Server'
-    app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URI
+def init_db(app):
+    uri = database_uri()
+    app.config['SQLALCHEMY_DATABASE_URI'] = uri
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(uri)
+    db.init_app(app)
+
+    # verificarea folosește engine-ul aplicației și lasă în pool conexiunile deschise
+    with app.app_context():
+        try:
+            if db.engine.dialect.name == "sqlite":
+                # rulare locală / benchmark-uri: schema vine din modele
+                # (pe SQL Server tabelele sunt gestionate separat)
+                db.create_all()
+            warmed = warm_pool(db.engine, config.pool.warm)
+            print(Fore.GREEN + f"Conexiunea la baza de date a fost realizată cu succes ({warmed} conexiuni în pool).")
+        except OperationalError as e:
+            print(Fore.RED + f"Nu s-a putut conecta la baza de date: {e}")
 
+
+def warm_pool(engine, count):
+    """Deschide `count` conexiuni simultan și le returnează în pool."""
+    count = max(1, min(int(count), config.pool.size))
+    connections = []
     try:
-        engine = create_engine(DATABASE_URI)
-        connection = engine.connect()
-        connection.close()
-        print(Fore.GREEN + "Conexiunea la baza de date a fost realizată cu succes.")
-    except OperationalError as e:
-        print(Fore.RED + f"Nu s-a putut conecta la baza de date: {e}")
+        for _ in range(count):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
 
-    db.init_app(app)
+
+def pool_stats(engine=None):
+    """Starea pool-ului: dimensiune, conexiuni împrumutate / libere / overflow."""
+    pool = (engine or db.engine).pool
+    stats = {"class": type(pool).__name__}
+    for name in ("size", "checkedout", "checkedin", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    return stats
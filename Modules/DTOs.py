@@ -1,5 +1,6 @@
 # dtos.py
-from pydantic import BaseModel, validator, field_validator
+from functools import lru_cache
+from pydantic import BaseModel, TypeAdapter, ValidationError, field_validator
 from typing import List, Any, Optional
 
 # -------------------------------
@@ -19,7 +20,8 @@ class ProductDTO(BaseModel):
     imagine: Optional[str] = ""
     data_adaugare: Optional[str] = None
 
-    @validator("pret")
+    @field_validator("pret")
+    @classmethod
     def pret_must_be_positive(cls, v):
         if v < 0:
             raise ValueError("Pretul trebuie să fie pozitiv")
@@ -51,8 +53,10 @@ class UserDTO(BaseModel):
 class UpdateDTO(BaseModel):
     filter: Any
     update: Any
+    max_rows: Optional[int] = None  # abort dacă filter-ul potrivește mai multe rânduri
 
-    @validator("update")
+    @field_validator("update")
+    @classmethod
     def update_not_empty(cls, v):
         if not v:
             raise ValueError("Update nu poate fi gol")
@@ -96,3 +100,38 @@ TABLE_DTOS = {
 
 def get_dto_class(table_name: str):
     return TABLE_DTOS.get(table_name.lower())
+
+
+@lru_cache(maxsize=None)
+def get_list_adapter(table_name: str):
+    """Validatorul precompilat list[DTO] al tabelului (construit o singură dată per proces)."""
+    dto_class = get_dto_class(table_name)
+    return TypeAdapter(List[dto_class]) if dto_class else None
+
+
+def _row_errors(e: ValidationError):
+    """Erorile lotului grupate pe index; `loc` fără indexul din listă, ca la validarea unui singur DTO."""
+    grouped = {}
+    for err in e.errors():
+        index, *loc = err["loc"]
+        if "ctx" in err:  # ctx poate conține excepția din validator (nu e serializabilă JSON)
+            err["ctx"] = {k: str(v) if isinstance(v, Exception) else v for k, v in err["ctx"].items()}
+        grouped.setdefault(index, []).append(dict(err, loc=tuple(loc)))
+    return grouped
+
+
+def validate_rows(table_name: str, rows: list):
+    """
+    Validează tot lotul într-un singur apel → (dict-uri valide, erori).
+    Erorile au formatul de la /add: [{"index": i, "error": [...]}]; rândurile valide
+    sunt întoarse (în ordine) chiar dacă altele au eșuat.
+    """
+    adapter = get_list_adapter(table_name)
+    try:
+        return adapter.dump_python(adapter.validate_python(rows)), []
+    except ValidationError as e:
+        grouped = _row_errors(e)
+
+    errors = [{"index": i, "error": grouped[i]} for i in sorted(grouped)]
+    valid = [row for i, row in enumerate(rows) if i not in grouped]
+    return adapter.dump_python(adapter.validate_python(valid)), errors
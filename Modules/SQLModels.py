@@ -35,6 +35,8 @@ class Feedback(db.Model):
     Message = db.Column(db.Text, nullable=False)
     DateSent = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __watermark__ = "DateSent"  # export CSV incremental: ?since=<timestamp>
+
     # Normal Project
 
 class Product(db.Model):
@@ -126,6 +128,21 @@ class OrderProduct(db.Model):
     def __repr__(self):
         return f"<OrderProduct order={self.order_id} produs={self.produs_id}>"
 
+class ChangeLog(db.Model):
+    """Jurnalul modificărilor pentru exportul CSV incremental (?since_version=); vezi changelog.py."""
+    __tablename__ = 'ChangeLog'
+
+    Version = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    TableName = db.Column(db.String(100), nullable=False)
+    RowId = db.Column(db.String(100))  # NULL = tot tabelul (notificare fără chei)
+    Op = db.Column(db.String(10), nullable=False)
+    ChangedAt = db.Column(db.DateTime, nullable=False, server_default=db.func.current_timestamp())
+
+    __table_args__ = (db.Index('IX_ChangeLog_Table_Version', 'TableName', 'Version'),)
+
+    def __repr__(self):
+        return f"<ChangeLog {self.Version} {self.TableName}:{self.RowId} {self.Op}>"
+
 MODEL_MAP = {
     "products": Product,
     "orders": Order,
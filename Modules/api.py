@@ -1,101 +1,290 @@
-from flask import Blueprint, jsonify, request
-from Modules.jwt_utils import allowed_users
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from Modules.jwt_utils import allowed_users, principal_cache
 from Modules.SQLModels import MODEL_MAP, db
-from sqlalchemy import and_, or_
+from sqlalchemy import select, update, delete, func, exists
+from sqlalchemy.orm import ONETOMANY
 from pydantic import ValidationError
-from Modules.DTOs import DeleteDTO,UpdateDTO,get_dto_class
+from Modules.DTOs import DeleteDTO,UpdateDTO,get_dto_class,validate_rows
+from Modules.bulk import insertable, insert_rows_returning
+from Modules.misc import config
+from Modules.query_plan import get_schema, compile_filters, plan_cache
+from Modules.pagination import SEARCH_OPTIONS, PageRequest
+from Modules.fanout import run_parallel, table_timeout
+from Modules.signals import notify_rows_changed
+from Modules.changelog import record_changes
+from Modules.response_cache import response_cache
+from Modules.json_provider import dumps_bytes
 api = Blueprint("api", __name__)
 
+NDJSON_MIMETYPE = "application/x-ndjson"
+NDJSON_CHUNK_SIZE = 1000
+
 def serialize_sql_row(row):
     """Convert SQLAlchemy row → dict"""
     return {col.name: getattr(row, col.name) for col in row.__table__.columns}
 
+def primary_key(model):
+    """Prima coloană din cheia primară (id / Id / order_id ...)"""
+    return model.__table__.primary_key.columns.values()[0]
+
+def filter_conditions(model, filter_criteria):
+    """Filtrul din UpdateDTO/DeleteDTO → listă de condiții SQL (exact, like, min/max)"""
+    columns = model.__table__.columns
+    conditions = []
+
+    for k, v in filter_criteria.items():
+        col = columns.get(k)
+        if col is None:
+            continue
+
+        if isinstance(v, dict):
+            if "like" in v:
+                conditions.append(col.ilike(f"%{v['like']}%"))
+            else:
+                min_val = v.get("min", None)
+                max_val = v.get("max", None)
+                if min_val is not None:
+                    conditions.append(col >= min_val)
+                if max_val is not None:
+                    conditions.append(col <= max_val)
+        else:
+            conditions.append(col == v)
+
+    return conditions
+
+def delete_matching(model, conditions, batch_size=None, detached=None):
+    """
+    DELETE set-based pe loturi de chei primare consecutive:
+        DELETE FROM t WHERE pk IN (SELECT TOP n pk FROM t WHERE ... ORDER BY pk)
+    Fiecare statement atinge cel mult batch_size rânduri, deci lock-urile și
+    log-ul tranzacției rămân mărginite. Întoarce cheile șterse (OUTPUT/RETURNING);
+    copiii cărora FK-ul le-a devenit NULL sunt adăugați în `detached` ({tabel: chei}).
+    """
+    # implicit 1000: sub pragul de lock escalation (5000) și sub limita de 2100 parametri din SQL Server
+    batch_size = batch_size or config.limits.delete_batch_size
+    table = model.__table__
+    pk = primary_key(model)
+    returning = db.session.get_bind().dialect.delete_returning
+    deleted_ids = []
+
+    while True:
+        batch = select(pk).where(*conditions).order_by(pk).limit(batch_size)
+        if not returning:
+            batch_ids = db.session.execute(batch).scalars().all()
+            if not batch_ids:
+                break
+            batch = batch_ids
+
+        for child_table, child_ids in _detach_children(model, pk.in_(batch)).items():
+            if detached is not None:
+                detached.setdefault(child_table, []).extend(child_ids)
+        stmt = delete(table).where(pk.in_(batch))
+        if returning:
+            batch_ids = db.session.execute(stmt.returning(pk)).scalars().all()
+        else:
+            db.session.execute(stmt)
+
+        deleted_ids.extend(batch_ids)
+        if len(batch_ids) < batch_size:
+            break
+
+    return deleted_ids
+
+class ReferencedRowsError(Exception):
+    """Rândurile de șters sunt referite prin cheia primară a altui tabel (FK-ul nu poate deveni NULL)."""
+
+
+def _detach_children(model, parent_condition):
+    """
+    Ca la session.delete(): copiii din relațiile one-to-many rămân în DB cu FK = NULL.
+    Dacă FK-ul face parte din cheia primară a copilului (ex. OrderProducts.produs_id),
+    NULL nu e posibil: ridică ReferencedRowsError când există astfel de copii.
+    Întoarce {tabel copil: chei} pentru rândurile actualizate (ChangeLog, notificări).
+    """
+    returning = db.session.get_bind().dialect.update_returning
+    detached = {}
+    for rel in model.__mapper__.relationships:
+        if rel.direction is not ONETOMANY or rel.passive_deletes or "delete" in rel.cascade:
+            continue
+        for local, remote in rel.local_remote_pairs:
+            parents = select(local).where(parent_condition)
+            if remote.primary_key:
+                if db.session.scalar(select(exists().where(remote.in_(parents)))):
+                    raise ReferencedRowsError(
+                        f"Rândurile sunt folosite în '{remote.table.name}' ({remote.key}); ștergeți-le întâi de acolo"
+                    )
+                continue
+            child_pk = primary_key(rel.mapper.class_)
+            stmt = update(remote.table).where(remote.in_(parents)).values({remote.key: None})
+            if returning:
+                child_ids = db.session.execute(stmt.returning(child_pk)).scalars().all()
+            else:
+                child_ids = db.session.execute(select(child_pk).where(remote.in_(parents))).scalars().all()
+                if child_ids:
+                    db.session.execute(stmt)
+            if child_ids:
+                detached.setdefault(table_name(rel.mapper.class_), []).extend(child_ids)
+    return detached
+
+
+def table_name(model):
+    """Cheia din MODEL_MAP a modelului (numele folosit în ChangeLog și în rows_changed)."""
+    return next(name for name, m in MODEL_MAP.items() if m is model)
+
 # GET /search
 @api.route("/search", methods=["GET"])
 @api.route("/search/<string:table>", methods=["GET"])
 @allowed_users(["Angajat", "Administrator"])
 def search_data(table=None):
-    data = request.get_json(silent=True) or request.args
+    body = request.get_json(silent=True)
+    data = body or request.args.to_dict()
     queries = {}
 
+    # opțiuni de paginare din query string (valabile pentru toate tabelele)
+    options = {k: request.args[k] for k in SEARCH_OPTIONS if k in request.args}
+
     # --- Determine queries ---
     if not table:
+        if not body:
+            data = {k: v for k, v in data.items() if k not in SEARCH_OPTIONS}
         if not data:
             return jsonify({"error": "Trebuie să specifici tabele și criterii"}), 400
         queries = data
     else:
+        data = dict(data)
+        options.update({k: data.pop(k) for k in SEARCH_OPTIONS if k in data})
         queries = {table.lower(): [data]}
 
-    response = {}
-
+    jobs = {}
     for tbl, filters in queries.items():
-        model = MODEL_MAP.get(tbl.capitalize()) or MODEL_MAP.get(tbl)
-        if not model:
-            response[tbl] = {"error": f"Tabelul '{tbl}' nu există"}
-            continue
-
-        results_total = []
-
-        for f in filters:
-            conditions = []
-
-            for col, val in f.items():
-                if col == "string":
-                    like_val = val.get("like", val).lower()
-                    like_conditions = [model.__dict__[c.name].ilike(f"%{like_val}%")
-                                       for c in model.__table__.columns
-                                       if str(c.type).startswith("VARCHAR")]
-                    conditions.append(or_(*like_conditions))
-                    continue
-
-                if col == "number":
-                    min_v = val.get("min", None)
-                    max_v = val.get("max", None)
-
-                    num_cols = [c.name for c in model.__table__.columns
-                                if "INT" in str(c.type).upper() or
-                                   "FLOAT" in str(c.type).upper() or
-                                   "DECIMAL" in str(c.type).upper()]
-
-                    num_conditions = []
-
-                    for nc in num_cols:
-                        column = getattr(model, nc)
-                        if min_v is not None:
-                            num_conditions.append(column >= min_v)
-                        if max_v is not None:
-                            num_conditions.append(column <= max_v)
-
-                    if num_conditions:
-                        conditions.append(and_(*num_conditions))
-
-                    continue
-
-                # normal filters
-                column = getattr(model, col, None)
-                if not column:
-                    continue
-
-                if isinstance(val, dict):  # min/max or LIKE
-                    if "like" in val:
-                        conditions.append(column.ilike(f"%{val['like']}%"))
-                    if "min" in val:
-                        conditions.append(column >= val["min"])
-                    if "max" in val:
-                        conditions.append(column <= val["max"])
-                else:
-                    conditions.append(column == val)
-
-            query = model.query.filter(and_(*conditions))
-            results_total.extend(query.all())
-
-        response[tbl] = {
-            "count": len(results_total),
-            "results": [serialize_sql_row(x) for x in results_total]
-        }
+        table_options = options
+        if isinstance(filters, dict):  # {"filters": [...], "limit": ..., "cursor": ...}
+            # un criteriu pus direct în dict (fără "filters") ar fi ignorat în tăcere → 400
+            unknown = [k for k in filters if k != "filters" and k not in SEARCH_OPTIONS]
+            if unknown:
+                return jsonify({"error": f"Chei necunoscute pentru '{tbl}': {', '.join(map(str, unknown))}; "
+                                         f"criteriile se trimit în \"filters\": [...]"}), 400
+            table_options = {**options, **{k: filters[k] for k in SEARCH_OPTIONS if k in filters}}
+            filters = filters.get("filters", [{}])
+        jobs[tbl] = (search_table, (tbl, filters, table_options))
+
+    # Accept: application/x-ndjson → rândurile unui tabel, streamed pe măsură ce vin din cursor
+    if _wants_ndjson():
+        if len(jobs) != 1:
+            return jsonify({"error": "Răspunsul NDJSON e disponibil doar pentru un singur tabel"}), 400
+        _, args = next(iter(jobs.values()))
+        return stream_table(*args)
+
+    if len(jobs) > 1:
+        # mai multe tabele: fiecare pe conexiunea lui, în paralel
+        response = run_parallel(jobs, {tbl: table_timeout(tbl.lower()) for tbl in jobs})
+    else:
+        response = {tbl: fn(*args) for tbl, (fn, args) in jobs.items()}
 
     return jsonify(response), 200
 
+def _wants_ndjson():
+    # "*/*" sau lipsa header-ului rămân pe JSON; NDJSON doar dacă e preferat explicit
+    accept = request.accept_mimetypes
+    return accept[NDJSON_MIMETYPE] > accept["application/json"]
+
+
+def _search_plan(tbl, filters, options, streaming=False):
+    """(page, keys, query, params) pentru /search sau un dict {"error"/"count": ...} gata de răspuns."""
+    schema = get_schema(tbl)
+    if not schema:
+        return {"error": f"Tabelul '{tbl}' nu există"}
+
+    try:
+        page = PageRequest(schema, options, streaming=streaming)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    try:
+        columns = schema.projection(options.get("fields"))
+    except ValueError as e:
+        return {"error": str(e)}
+
+    # toate filtrele tabelului → un singur query (OR), fără duplicate
+    clauses, params = compile_filters(schema, filters)
+
+    if page.count_only:
+        query = select(func.count()).select_from(schema.table).where(*clauses)
+        return {"count": db.session.execute(query, params).scalar()}
+
+    # doar coloanele cerute pleacă din DB; cheile de ordonare sunt adăugate
+    # la final (pentru cursor) și nu apar în răspuns dacă nu au fost cerute
+    keys = [c.key for c in columns]
+    selected = columns + [c for c in page.order_by if c.key not in keys]
+
+    # limit + 1 rânduri după cursor, în ordinea cheii → pagina și has_more, fără OFFSET
+    query = (select(*selected)
+             .where(*clauses, *page.keyset())
+             .order_by(*page.order_by)
+             .limit(page.limit + 1))
+    return page, keys, query, params
+
+
+def search_table(tbl, filters, options):
+    """O pagină (sau doar COUNT-ul) pentru un tabel din /search."""
+    plan = _search_plan(tbl, filters, options)
+    if isinstance(plan, dict):
+        return plan
+    page, keys, query, params = plan
+
+    rows = db.session.execute(query, params).all()
+    has_more = len(rows) > page.limit
+    rows = rows[:page.limit]
+
+    result = {
+        "count": len(rows),
+        "results": [dict(zip(keys, row)) for row in rows],
+        "has_more": has_more
+    }
+    if has_more:
+        result["next_cursor"] = page.next_cursor(rows[-1])
+    return result
+
+def stream_table(tbl, filters, options):
+    """
+    /search în NDJSON: un rând JSON per linie, scris pe măsură ce vine din cursor
+    (yield_per), plus o ultimă linie {"_page": {"count", "has_more", "next_cursor"?}}.
+    """
+    plan = _search_plan(tbl, filters, options, streaming=True)
+    if isinstance(plan, dict):
+        if "error" in plan:
+            return jsonify(plan), 400
+        return Response(dumps_bytes(plan) + b"\n", mimetype=NDJSON_MIMETYPE)
+    page, keys, query, params = plan
+
+    result = db.session.execute(query.execution_options(yield_per=NDJSON_CHUNK_SIZE), params)
+
+    def generate():
+        count, last, has_more = 0, None, False
+        try:
+            for partition in result.partitions():
+                lines = []
+                for row in partition:
+                    if count == page.limit:
+                        has_more = True
+                        break
+                    lines.append(dumps_bytes(dict(zip(keys, row))))
+                    count += 1
+                    last = row
+                if lines:
+                    yield b"\n".join(lines) + b"\n"
+                if has_more:
+                    break
+        finally:
+            result.close()
+
+        trailer = {"count": count, "has_more": has_more}
+        if has_more:
+            trailer["next_cursor"] = page.next_cursor(last)
+        yield dumps_bytes({"_page": trailer}) + b"\n"
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+
 # POST /add
 @api.route("/add", methods=["POST"])
 @api.route("/add/<string:table>", methods=["POST"])
@@ -124,30 +313,25 @@ def add_data(table=None):
     # normalizează la listă
     objects = objects if isinstance(objects, list) else [objects]
 
-    validated_objects = []
-    errors = []
+    # tot lotul printr-un singur validator list[DTO] precompilat
+    validated_objects, errors = validate_rows(table, objects)
+    if errors:
+        return jsonify({"errors": errors}), 400
 
-    for i, obj in enumerate(objects):
+    # un singur INSERT ... OUTPUT/RETURNING pentru tot lotul
+    rows = []
+    for i, obj in enumerate(validated_objects):
         try:
-            dto = dto_class(**obj)
-            validated_objects.append(dto.dict())
-        except ValidationError as e:
-            errors.append({"index": i, "error": e.errors()})
-        except Exception as e:
+            rows.append(insertable(model_class, obj))
+        except ValueError as e:
             errors.append({"index": i, "error": str(e)})
-
     if errors:
         return jsonify({"errors": errors}), 400
+    added_ids = insert_rows_returning(model_class, rows)
 
-    added_ids = []
-
-    for obj in validated_objects:
-        instance = model_class(**obj)
-        db.session.add(instance)
-        db.session.flush()  # obținem ID-ul generat
-        added_ids.append(instance.id)
-
+    record_changes(table, "insert", added_ids)  # în aceeași tranzacție cu datele
     db.session.commit()
+    notify_rows_changed(table, "insert", added_ids)
 
     return jsonify({
         "message": f"{len(added_ids)} obiect(e) adăugat(e) în '{table}'",
@@ -196,43 +380,42 @@ def update_data(table=None):
             warnings.append("Nu există filter specificat, obiectul nu a fost actualizat")
             continue
 
-        query = db.session.query(model_class)
+        # Un singur UPDATE ... WHERE ... OUTPUT/RETURNING, fără hidratare ORM
+        pk = primary_key(model_class)
+        columns = model_class.__table__.columns
+        values = {
+            key: value for key, value in update_fields.items()
+            if key in columns and not columns[key].primary_key
+        }
+        if not values:
+            warnings.append(f"Niciun câmp din 'update' nu există în '{table}'")
+            continue
 
-        # Aplicăm filtre
-        for k, v in filter_criteria.items():
-            col = getattr(model_class, k, None)
-            if not col:
-                continue
+        conditions = filter_conditions(model_class, filter_criteria)
+        stmt = update(model_class.__table__).where(*conditions).values(**values)
 
-            if isinstance(v, dict):
-                if "like" in v:
-                    query = query.filter(col.ilike(f"%{v['like']}%"))
-                else:
-                    min_val = v.get("min", None)
-                    max_val = v.get("max", None)
-                    if min_val is not None:
-                        query = query.filter(col >= min_val)
-                    if max_val is not None:
-                        query = query.filter(col <= max_val)
-            else:
-                query = query.filter(col == v)
+        if db.session.get_bind().dialect.update_returning:
+            matched_ids = db.session.execute(stmt.returning(pk)).scalars().all()
+        else:
+            matched_ids = db.session.execute(select(pk).where(*conditions)).scalars().all()
+            db.session.execute(stmt)
 
-        matched_items = query.all()
-        if not matched_items:
+        if not matched_ids:
             warnings.append(f"Nu s-a găsit niciun obiect pentru filter-ul specificat în '{table}'")
             continue
 
-        # Aplicare update
-        for item in matched_items:
-            for key, value in update_fields.items():
-                if key == "id":
-                    continue
-                if hasattr(item, key):
-                    setattr(item, key, value)
-            updated_ids.append(item.id)
+        if dto.max_rows is not None and len(matched_ids) > dto.max_rows:
+            db.session.rollback()
+            return jsonify({
+                "error": f"Filter-ul potrivește {len(matched_ids)} obiect(e), peste limita max_rows={dto.max_rows}; nimic nu a fost actualizat"
+            }), 400
+
+        updated_ids.extend(matched_ids)
 
     if updated_ids:
+        record_changes(table, "update", updated_ids)  # în aceeași tranzacție cu datele
         db.session.commit()
+        notify_rows_changed(table, "update", updated_ids)
 
     response = {
         "message": f"{len(updated_ids)} obiect(e) actualizat(e) în '{table}'",
@@ -266,45 +449,33 @@ def delete_data(table=None):
 
     objects = objects if isinstance(objects, list) else [objects]
     deleted_ids = []
+    detached = {}  # copiii rămași cu FK = NULL: {tabel: chei}
     warnings = []
 
     for obj in objects:
         dto = DeleteDTO(**obj)
         filter_criteria = dto.filter
 
-        query = db.session.query(model_class)
-
-        # Aplicăm filtre
-        for k, v in filter_criteria.items():
-            col = getattr(model_class, k, None)
-            if not col:
-                continue
-
-            if isinstance(v, dict):
-                if "like" in v:
-                    query = query.filter(col.ilike(f"%{v['like']}%"))
-                else:
-                    min_val = v.get("min", None)
-                    max_val = v.get("max", None)
-                    if min_val is not None:
-                        query = query.filter(col >= min_val)
-                    if max_val is not None:
-                        query = query.filter(col <= max_val)
-            else:
-                query = query.filter(col == v)
-
-        matched_items = query.all()
-        if not matched_items:
+        conditions = filter_conditions(model_class, filter_criteria)
+        try:
+            matched_ids = delete_matching(model_class, conditions, detached=detached)
+        except ReferencedRowsError as e:
+            db.session.rollback()  # nimic din cerere nu rămâne șters
+            return jsonify({"error": str(e)}), 409
+        if not matched_ids:
             warnings.append(f"Nu s-a găsit niciun obiect pentru filter-ul specificat în '{table}'")
             continue
 
-        # Ștergere obiecte
-        for item in matched_items:
-            deleted_ids.append(item.id)
-            db.session.delete(item)
+        deleted_ids.extend(matched_ids)
 
     if deleted_ids:
+        record_changes(table, "delete", deleted_ids)  # în aceeași tranzacție cu datele
+        for child_table, child_ids in detached.items():
+            record_changes(child_table, "update", child_ids)
         db.session.commit()
+        notify_rows_changed(table, "delete", deleted_ids)
+        for child_table, child_ids in detached.items():
+            notify_rows_changed(child_table, "update", child_ids)
 
     response = {
         "message": f"{len(deleted_ids)} obiect(e) șters(e) din '{table}'",
@@ -318,3 +489,13 @@ def delete_data(table=None):
 ###############
 # END OF CRUD #
 ###############
+
+# GET /cache/stats
+@api.route("/cache/stats", methods=["GET"])
+@allowed_users(["Administrator"])
+def cache_stats():
+    return jsonify({
+        "principal": principal_cache.stats(),
+        "search_plans": plan_cache.stats(),
+        "responses": response_cache.stats()
+    }), 200
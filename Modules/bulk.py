@@ -0,0 +1,60 @@
+# bulk.py — inserări în masă (executemany) pe sesiunea curentă
+from itertools import groupby
+from sqlalchemy import insert
+from Modules.DBConn import db
+
+
+def insert_rows(model, rows) -> int:
+    """
+    Inserează o listă de dict-uri cu câte un singur executemany pentru fiecare
+    grup consecutiv de rânduri cu aceleași coloane (pyodbc: fast_executemany).
+    Nu face commit.
+    """
+    table = model.__table__
+    count = 0
+    for _, group in groupby(rows, key=tuple):
+        batch = list(group)
+        db.session.execute(insert(table), batch)
+        count += len(batch)
+    return count
+
+
+def insertable(model, data: dict) -> dict:
+    """
+    Păstrează doar coloanele tabelului; cheile primare None sunt lăsate DB-ului (IDENTITY).
+    Câmpurile fără coloană (ex. OrderDTO.produse) sunt acceptate doar goale: o valoare
+    reală ar fi pierdută la INSERT, deci ridică ValueError.
+    """
+    table = model.__table__
+    unknown = [k for k, v in data.items() if k not in table.columns and v not in (None, "", [], {})]
+    if unknown:
+        raise ValueError(f"Câmpuri care nu pot fi salvate în '{table.name}': {', '.join(map(str, unknown))}")
+    return {
+        k: v for k, v in data.items()
+        if k in table.columns and not (v is None and table.columns[k].primary_key)
+    }
+
+
+def insert_rows_returning(model, rows) -> list:
+    """
+    Inserează rândurile și întoarce cheile primare generate, în ordinea rândurilor.
+    Un singur statement pe lot: OUTPUT INSERTED.<pk> pe SQL Server, RETURNING pe
+    SQLite/Postgres. Dialectele fără suport cad pe add() + flush() per rând.
+    """
+    table = model.__table__
+    pk = table.primary_key.columns.values()[0]
+    dialect = db.session.get_bind().dialect
+
+    ids = []
+    if not dialect.insert_executemany_returning_sort_by_parameter_order:
+        for row in rows:
+            instance = model(**row)
+            db.session.add(instance)
+            db.session.flush()
+            ids.append(getattr(instance, pk.key))
+        return ids
+
+    stmt = insert(table).returning(pk, sort_by_parameter_order=True)
+    for _, group in groupby(rows, key=tuple):
+        ids.extend(db.session.execute(stmt, list(group)).scalars().all())
+    return ids
@@ -0,0 +1,123 @@
+# changelog.py — jurnalul modificărilor pentru exportul CSV incremental (?since_version=)
+#
+# Fiecare insert/update/delete devine un rând în ChangeLog (Version crescător, TableName,
+# RowId, Op). Exportul citește doar Version > watermark, deci costul scalează cu delta,
+# nu cu mărimea tabelului.
+#   RowId NULL  → modificare fără chei (ex. import CSV într-un tabel cu cheie text):
+#                 consumatorul primește din nou tot tabelul
+#   after_id    → importul CSV: rândurile noi (cheie > after_id) sunt copiate cu un INSERT ... SELECT
+# record_changes() scrie pe db.session, în aceeași tranzacție cu datele, și e apelat
+# înainte de commit: o modificare salvată are mereu rândul ei în jurnal, iar un rollback
+# le anulează pe amândouă.
+from colorama import Fore
+from sqlalchemy import Integer, String, select, insert, func, cast, literal, exists
+from sqlalchemy.exc import SQLAlchemyError
+from Modules.DBConn import db
+from Modules.SQLModels import ChangeLog, MODEL_MAP
+from Modules.misc import get_setting
+
+_enabled = False
+
+
+def single_pk(model):
+    """Coloana cheii primare dacă e una singură (tabelele cu cheie compusă nu sunt urmărite)."""
+    columns = list(model.__table__.primary_key.columns)
+    return columns[0] if len(columns) == 1 else None
+
+
+def integer_pk(model):
+    pk = single_pk(model)
+    return pk if pk is not None and isinstance(pk.type, Integer) else None
+
+
+def changelog_enabled():
+    return _enabled
+
+
+def record_changes(table_name, op, ids=None, after_id=None):
+    """
+    Adaugă modificările în ChangeLog pe db.session, fără commit (îl face apelantul,
+    împreună cu datele). Întoarce numărul de rânduri din jurnal.
+    """
+    model = MODEL_MAP.get(table_name)
+    pk = single_pk(model) if model is not None else None
+    if not _enabled or pk is None or ids == []:
+        return 0
+
+    table = ChangeLog.__table__
+    if ids is not None:
+        db.session.execute(insert(table), [{"TableName": table_name, "RowId": str(i), "Op": op} for i in ids])
+        return len(ids)
+    if after_id is not None:
+        source = select(literal(table_name), cast(pk, String(100)), literal(op)).where(pk > after_id)
+        return db.session.execute(insert(table).from_select(["TableName", "RowId", "Op"], source)).rowcount
+    db.session.execute(insert(table).values(TableName=table_name, RowId=None, Op=op))
+    return 1
+
+
+def record_inserts_after(table_name, after_id):
+    """
+    Import cu mai multe commit-uri: jurnalizează rândurile cu cheia > after_id și întoarce
+    cheia maximă de acum, de la care continuă commit-ul următor (fără rânduri duble).
+    Fără cheie întreagă (ex. camera) nu există un „după”: se scrie o notificare fără chei
+    (RowId NULL), iar consumatorul primește din nou tot tabelul.
+    """
+    if not _enabled:
+        return after_id
+    pk = integer_pk(MODEL_MAP[table_name])
+    if pk is None or after_id is None:
+        record_changes(table_name, "insert")
+        return after_id
+    record_changes(table_name, "insert", after_id=after_id)
+    return db.session.scalar(select(func.coalesce(func.max(pk), after_id)))
+
+
+def current_version():
+    """Watermark-ul curent (ultima versiune din jurnal; 0 dacă e gol)."""
+    return db.session.scalar(select(func.coalesce(func.max(ChangeLog.Version), 0)))
+
+
+def changes_since(table_name, pk, since_version, until_version):
+    """
+    (subquery cu cheile de exportat, chei șterse) pentru versiunile (since, until];
+    None dacă în interval există o notificare fără chei (trebuie exportat tot tabelul).
+    Contează doar ultima operație a fiecărui rând.
+    """
+    in_range = (ChangeLog.TableName == table_name,
+                ChangeLog.Version > since_version,
+                ChangeLog.Version <= until_version)
+
+    if db.session.scalar(select(exists().where(*in_range, ChangeLog.RowId.is_(None)))):
+        return None
+
+    latest = (
+        select(ChangeLog.RowId, func.max(ChangeLog.Version).label("Version"))
+        .where(*in_range)
+        .group_by(ChangeLog.RowId)
+        .subquery()
+    )
+    last = (
+        select(latest.c.RowId, ChangeLog.Op)
+        .join(ChangeLog, ChangeLog.Version == latest.c.Version)
+        .subquery()
+    )
+    upserts = select(cast(last.c.RowId, pk.type)).where(last.c.Op != "delete")
+    deleted = db.session.scalars(select(cast(last.c.RowId, pk.type)).where(last.c.Op == "delete")).all()
+    return upserts, deleted
+
+
+def init_changelog(app):
+    """Creează tabelul ChangeLog dacă lipsește și activează jurnalizarea."""
+    global _enabled
+    if not get_setting('changelog.enabled', True):
+        return False
+
+    with app.app_context():
+        try:
+            ChangeLog.__table__.create(db.engine, checkfirst=True)
+        except SQLAlchemyError as e:
+            print(Fore.RED + f"ChangeLog indisponibil (exportul incremental since_version e dezactivat): {e}")
+            return False
+
+    _enabled = True
+    return True
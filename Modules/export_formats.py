@@ -0,0 +1,169 @@
+# export_formats.py — formatele exportului /csv/<table>, alese prin ?format= sau Accept
+#
+#   csv      text/csv                               (implicit)
+#   csv.gz   application/gzip                       CSV comprimat din mers (zlib, header gzip)
+#   ndjson   application/x-ndjson                   un obiect JSON pe linie (ca /search, dar datele în ISO 8601)
+#   arrow    application/vnd.apache.arrow.stream    Arrow IPC (stream), tipuri din modelele SQLAlchemy
+#
+# Toate formatele primesc aceleași bucăți de rânduri (yield_per) și le scriu pe măsură ce
+# sosesc: memoria rămâne constantă indiferent de mărimea tabelului.
+# pyarrow e opțional: fără el, cererile pentru arrow primesc 406.
+import csv
+import io
+import zlib
+from itertools import chain
+
+from sqlalchemy import types
+from Modules.json_provider import dumps_bytes
+from Modules.misc import get_setting
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+# format → (mimetype, extensia fișierului)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "csv.gz": ("application/gzip", "csv.gz"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+}
+FORMAT_ALIASES = {"gzip": "csv.gz", "gz": "csv.gz", "jsonl": "ndjson", "ipc": "arrow"}
+
+
+class FormatError(Exception):
+    """Format necunoscut (400) sau indisponibil pe server (406)."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def negotiate_format(args, accept):
+    """
+    ?format= are prioritate; altfel cel mai potrivit tip din Accept (csv dacă nimic nu se
+    potrivește, ca înainte). Ridică FormatError.
+    """
+    name = args.get("format")
+    if name:
+        name = FORMAT_ALIASES.get(name.lower(), name.lower())
+        if name not in EXPORT_FORMATS:
+            raise FormatError(f"Format necunoscut '{args['format']}'; disponibile: {', '.join(EXPORT_FORMATS)}.")
+    else:
+        # fără pyarrow, arrow nu e candidat: "arrow, text/csv;q=0.5" primește CSV
+        offered = [m for n, (m, _) in EXPORT_FORMATS.items() if n != "arrow" or pyarrow is not None]
+        mimetype = accept.best_match(offered)
+        if mimetype is None and accept.quality(EXPORT_FORMATS["arrow"][0]) and pyarrow is None:
+            name = "arrow"
+        else:
+            name = next(n for n, (m, _) in EXPORT_FORMATS.items() if m == (mimetype or "text/csv"))
+
+    if name == "arrow" and pyarrow is None:
+        raise FormatError("Exportul Arrow necesită pyarrow, care nu este instalat pe server.", 406)
+    return name
+
+
+def export_stream(name, columns, fieldnames, first_chunk, chunks):
+    """Generatorul de bytes pentru formatul ales; `columns` dau tipurile (Arrow)."""
+    chunks = chain([first_chunk] if first_chunk else [], chunks)
+    if name == "csv":
+        return csv_stream(fieldnames, chunks)
+    if name == "csv.gz":
+        return gzip_stream(csv_stream(fieldnames, chunks))
+    if name == "ndjson":
+        return ndjson_stream(fieldnames, chunks)
+    return arrow_stream(arrow_schema(columns, fieldnames), chunks)
+
+
+def csv_stream(fieldnames, chunks):
+    """Generează CSV-ul bucată cu bucată (header + câte un chunk de rânduri)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fieldnames)
+
+    for chunk in chunks:
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():  # delta goală: doar header-ul
+        yield buffer.getvalue().encode("utf-8")
+
+
+def gzip_stream(body):
+    """Comprimă un flux de bytes din mers; wbits=31 → header și trailer gzip (fișier .gz valid)."""
+    compressor = zlib.compressobj(get_setting('csv.gzip_level', 6), zlib.DEFLATED, 31)
+    for data in body:
+        out = compressor.compress(data)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def ndjson_stream(fieldnames, chunks):
+    for chunk in chunks:
+        yield b"\n".join(dumps_bytes(dict(zip(fieldnames, row)), iso_dates=True) for row in chunk) + b"\n"
+
+
+# ---------------------------------------------------------------------------
+# Arrow IPC
+# ---------------------------------------------------------------------------
+
+def arrow_type(sql_type):
+    """Tipul SQLAlchemy al coloanei → tip Arrow (string pentru tipurile necunoscute)."""
+    pa = pyarrow
+    if isinstance(sql_type, types.Boolean):
+        return pa.bool_()
+    if isinstance(sql_type, types.BigInteger):
+        return pa.int64()
+    if isinstance(sql_type, types.SmallInteger):
+        return pa.int16()
+    if isinstance(sql_type, types.Integer):
+        return pa.int32()
+    if isinstance(sql_type, types.Numeric) and not isinstance(sql_type, types.Float):
+        if sql_type.precision is not None and sql_type.asdecimal:
+            return pa.decimal128(sql_type.precision, sql_type.scale or 0)
+        return pa.float64()
+    if isinstance(sql_type, types.Float):
+        return pa.float64()
+    if isinstance(sql_type, types.DateTime):
+        return pa.timestamp("us")
+    if isinstance(sql_type, types.Date):
+        return pa.date32()
+    if isinstance(sql_type, types.Time):
+        return pa.time64("us")
+    if isinstance(sql_type, types.LargeBinary):
+        return pa.binary()
+    return pa.string()
+
+
+def arrow_schema(columns, fieldnames):
+    """Schema din coloanele modelului (nullable: rândurile șterse din delta au doar cheia); _op e string."""
+    by_key = {c.key: c for c in columns}
+    return pyarrow.schema([
+        pyarrow.field(name, arrow_type(by_key[name].type) if name in by_key else pyarrow.string(),
+                      nullable=not (name in by_key and by_key[name].primary_key))
+        for name in fieldnames
+    ])
+
+
+def arrow_stream(schema, chunks):
+    """Un RecordBatch per chunk, scris în formatul IPC stream (citibil cu pyarrow.ipc.open_stream)."""
+    sink = io.BytesIO()
+    with pyarrow.ipc.new_stream(sink, schema) as writer:
+        for chunk in chunks:
+            columns = list(zip(*chunk))
+            writer.write_batch(pyarrow.record_batch(
+                [pyarrow.array(col, type=field.type) for col, field in zip(columns, schema)],
+                schema=schema
+            ))
+            yield _drain(sink)
+    yield _drain(sink)  # marcajul de sfârșit (sau doar schema, la delta goală)
+
+
+def _drain(sink):
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
@@ -0,0 +1,156 @@
+# fanout.py — rulează query-urile pe mai multe tabele în paralel, fiecare pe conexiunea lui
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextlib import contextmanager
+
+from flask import current_app
+from sqlalchemy.pool import QueuePool
+from Modules.DBConn import db
+from Modules.misc import config, get_setting
+
+_executor = None
+_executor_sizing = None  # (server.threads, reserved_connections) cu care a fost creat executorul
+_executor_lock = threading.Lock()
+
+
+def _sizing():
+    # limits.search_fanout.reserved_connections: conexiuni lăsate libere pentru request-urile obișnuite
+    return get_setting('server.threads', 4), get_setting('limits.search_fanout.reserved_connections', 2)
+
+
+def fanout_workers(app, engine):
+    """
+    Câte thread-uri de fan-out încap în pool: pool_size + max_overflow (din opțiunile
+    cu care a fost creat engine-ul) minus câte o conexiune pentru fiecare thread de
+    request (server.threads; cel care așteaptă fan-out-ul își ține conexiunea) și
+    minus cele rezervate. None pentru pool-uri fără limită fixă.
+    """
+    if not isinstance(engine.pool, QueuePool):
+        return None
+    options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}
+    capacity = options.get('pool_size', engine.pool.size()) + max(options.get('max_overflow', 0), 0)
+    request_threads, reserved = _sizing()
+    return max(1, capacity - request_threads - reserved)
+
+
+def get_executor():
+    """
+    Un singur executor per proces, dimensionat după pool-ul engine-ului: toate
+    request-urile împart aceleași thread-uri, deci fan-out-ul nu poate cere mai
+    multe conexiuni decât are pool-ul (minus cele ale request-urilor și cele rezervate).
+    """
+    global _executor, _executor_sizing
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = fanout_workers(current_app, db.engine)
+                if workers is None:
+                    return None
+                _executor_sizing = _sizing()
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="search-fanout")
+    return _executor
+
+
+@config.on_reload
+def _resize_executor(cfg):
+    """Setările de dimensionare s-au schimbat: următorul fan-out creează un executor nou."""
+    global _executor
+    with _executor_lock:
+        if _executor is None or _executor_sizing == _sizing():
+            return
+        old, _executor = _executor, None
+    old.shutdown(wait=False)  # job-urile deja trimise se termină pe executorul vechi
+
+
+def _after_fork():
+    # thread-urile executorului nu supraviețuiesc fork-ului: copilul își creează altul
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def table_timeout(table_name):
+    """limits.search.tables.<tabel>.timeout, altfel timeout-ul global de fan-out."""
+    per_table = (get_setting('limits.search.tables', {}) or {}).get(table_name, {})
+    return per_table.get("timeout", get_setting('limits.search_fanout.timeout', 10))
+
+
+@contextmanager
+def statement_timeout(connection, seconds):
+    """
+    Limitează durata query-urilor de pe conexiune, ca un job depășit să fie oprit de
+    driver (future.cancel() nu poate opri un job care rulează deja).
+      mssql+pyodbc  Connection.timeout (secunde întregi, 0 = fără limită)
+      sqlite        progress handler care întrerupe query-ul după termen
+    Alte dialecte rulează fără limită.
+    """
+    dbapi = connection.connection.driver_connection
+    dialect = connection.dialect
+    if dialect.name == "mssql" and dialect.driver == "pyodbc":
+        previous = dbapi.timeout
+        dbapi.timeout = max(1, math.ceil(seconds))
+        try:
+            yield
+        finally:
+            dbapi.timeout = previous
+    elif dialect.name == "sqlite":
+        deadline = time.monotonic() + seconds
+        dbapi.set_progress_handler(lambda: time.monotonic() > deadline, 10000)
+        try:
+            yield
+        finally:
+            dbapi.set_progress_handler(None, 0)
+    else:
+        yield
+
+
+def _run_in_app(app, fn, args, deadline):
+    with app.app_context():  # sesiune (și conexiune) proprie pentru thread
+        try:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:  # a așteptat în coadă tot timpul alocat
+                return {"error": "Timeout înainte de execuție"}
+            with statement_timeout(db.session.connection(), remaining):
+                return fn(*args)
+        finally:
+            db.session.remove()
+
+
+def run_parallel(jobs, timeouts=None):
+    """
+    jobs: {cheie: (fn, args)}. Întoarce {cheie: rezultat}; un job care depășește
+    timeout-ul sau aruncă excepție devine {"error": ...}, restul rămân valide.
+    Fără executor (pool fără limită fixă, ex. SQLite în memorie) rulează secvențial.
+    """
+    timeouts = timeouts or {}
+    default_timeout = get_setting('limits.search_fanout.timeout', 10)
+    executor = get_executor() if get_setting('limits.search_fanout.enabled', True) else None
+    if executor is None:
+        return {key: fn(*args) for key, (fn, args) in jobs.items()}
+
+    app = current_app._get_current_object()
+    started = time.monotonic()
+    deadlines = {key: started + timeouts.get(key, default_timeout) for key in jobs}
+    futures = {key: executor.submit(_run_in_app, app, fn, args, deadlines[key])
+               for key, (fn, args) in jobs.items()}
+
+    results = {}
+    for key, future in futures.items():
+        timeout = timeouts.get(key, default_timeout)
+        remaining = max(0.0, deadlines[key] - time.monotonic())
+        try:
+            results[key] = future.result(timeout=remaining)
+        except FutureTimeout:
+            # un job încă în coadă e anulat aici; unul care rulează e oprit de statement_timeout
+            future.cancel()
+            results[key] = {"error": f"Timeout după {timeout}s"}
+        except Exception as e:
+            results[key] = {"error": str(e)}
+    return results
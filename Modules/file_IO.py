@@ -1,15 +1,22 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 import csv
 import io
-from pydantic import ValidationError
-from Modules.DTOs import get_dto_class
-from Modules.misc import SENSITIVE_FIELDS
+import time
+from datetime import datetime, timedelta
+from itertools import chain
+from sqlalchemy import select, func
+from Modules.DTOs import get_dto_class, validate_rows
+from Modules.misc import SENSITIVE_FIELDS, get_setting
 from Modules.jwt_utils import allowed_users
 from Modules.DBConn import db
 from Modules.SQLModels import MODEL_MAP
+from Modules.bulk import insert_rows, insertable
+from Modules.signals import notify_rows_changed
+from Modules.export_formats import EXPORT_FORMATS, FormatError, negotiate_format, export_stream
+from Modules.changelog import (single_pk, integer_pk, current_version, changes_since, changelog_enabled,
+                               record_inserts_after)
 
 CSV_IO = Blueprint("CSV_IO", __name__)
-MAX_FILE_SIZE = 2 * 1024 * 1024  # 2MB
 
 # =============================================================================
 # ✅ IMPORT CSV — salvează în baza de date
@@ -26,6 +33,21 @@ def import_csv(table_name):
     dto_class = get_dto_class(table_name)
 
     full_match = request.form.get("full_match", "false").lower() == "true"
+    # commit_every: 0 = o singură tranzacție pentru tot fișierul; N > 0 = commit de îndată ce
+    # există cel puțin N rânduri inserate și necomise. Commit-ul se face doar la granița unui
+    # lot, de aceea loturile sunt micșorate la N când N < csv.import_batch_size; rândurile
+    # respinse la validare nu se numără, deci o tranzacție poate cuprinde ceva mai mult de N rânduri citite.
+    try:
+        commit_every = int(request.form.get("commit_every", 0))
+    except ValueError:
+        return jsonify({"eroare": "'commit_every' trebuie să fie un număr întreg."}), 400
+    if commit_every < 0:
+        return jsonify({"eroare": "'commit_every' trebuie să fie 0 (o singură tranzacție) sau pozitiv."}), 400
+    # setările csv.* sunt citite la fiecare cerere (settings.json se reîncarcă din mers)
+    import_batch_size = get_setting('csv.import_batch_size', 1000)
+    max_file_size = get_setting('csv.max_file_size', 512 * 1024 * 1024)  # 512MB
+    max_reported_errors = get_setting('csv.max_reported_errors', 1000)
+    batch_size = min(import_batch_size, commit_every) if commit_every else import_batch_size
 
     # ----------------------------------------
     # 1. FIȘIER
@@ -39,81 +61,142 @@ def import_csv(table_name):
         return jsonify({"eroare": "Fișierul trebuie să fie CSV."}), 400
 
     file.seek(0, 2)
-    if file.tell() > MAX_FILE_SIZE:
-        return jsonify({"eroare": "Fișier prea mare (max 2MB)."}), 400
+    if file.tell() > max_file_size:
+        return jsonify({"eroare": f"Fișier prea mare (max {max_file_size // (1024 * 1024)}MB)."}), 400
     file.seek(0)
 
+    # decodare incrementală: fișierul nu este încărcat niciodată integral în memorie
+    stream = io.TextIOWrapper(file.stream, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(stream)
+
     try:
-        content = file.read().decode("utf-8")
-    except Exception:
+        fieldnames = reader.fieldnames or []
+    except UnicodeDecodeError:
         return jsonify({"eroare": "CSV trebuie să fie UTF-8."}), 400
 
-    reader = csv.DictReader(io.StringIO(content))
+    columns = set(Model.__table__.columns.keys())
 
     # Determinăm câmpurile așteptate: DTO dacă există, altfel coloanele SQLAlchemy
     if dto_class:
-        expected_fields = dto_class.__fields__.keys()
+        expected_fields = dto_class.model_fields.keys()
     else:
         expected_fields = [col.name for col in Model.__table__.columns]
 
     if full_match:
-        missing = [f for f in expected_fields if f not in reader.fieldnames]
-        extra = [f for f in reader.fieldnames if f not in expected_fields]
+        missing = [f for f in expected_fields if f not in fieldnames]
+        extra = [f for f in fieldnames if f not in expected_fields]
         if missing or extra:
             return jsonify({"eroare": "Structura CSV nu corespunde.", "lipsesc": missing, "extra": extra}), 400
 
     # ----------------------------------------
-    # 2. PROCESARE RÂNDURI
+    # 2. PROCESARE PE LOTURI + SALVARE
     # ----------------------------------------
-    total, reusite, esecuri = 0, 0, 0
-    erori, importate = [], []
+    total, esecuri, salvate = 0, 0, 0
+    erori = []
+    pending = 0  # rânduri inserate dar încă necomise
+    started = time.perf_counter()
 
-    for row in reader:
-        total += 1
-        try:
-            row.pop("id", None)  # DB generează automat ID
-
-            # completăm câmpurile lipsă cu valori implicite (DTO dacă există)
-            if dto_class:
-                for key, field in dto_class.__fields__.items():
-                    if key not in row or row[key] == "":
-                        default = field.default if field.default is not None else None
-                        row[key] = default
-
-                # validare DTO
-                valid = dto_class(**row)
-                data = valid.dict()
-                data.pop("id", None)
-            else:
-                data = row  # folosește direct datele din CSV pentru SQLAlchemy
-
-            obj = Model(**data)
-            db.session.add(obj)
-            importate.append(data)
-            reusite += 1
-
-        except ValidationError as e:
-            esecuri += 1
-            erori.append({"rand": total, "date_initiale": row, "erori": [err["msg"] for err in e.errors()]})
-        except Exception as e:
+    def add_error(rand, row, messages):
+        if len(erori) < max_reported_errors:
+            erori.append({"rand": rand, "date_initiale": row, "erori": messages})
+
+    def prepare(batch):
+        """Lotul brut (rand, row) → dict-uri de inserat; rândurile invalide ajung în `erori`."""
+        nonlocal esecuri
+        if not dto_class:
+            rows = []
+            for rand, row in batch:
+                unknown = [k for k in row if k not in columns]
+                if unknown:
+                    esecuri += 1
+                    add_error(rand, row, [f"Coloane necunoscute: {', '.join(map(str, unknown))}"])
+                else:
+                    rows.append(row)  # folosește direct datele din CSV pentru SQLAlchemy
+            return rows
+
+        # celulele goale lipsesc → DTO pune valoarea implicită (sau „Field required”)
+        data = [{k: v for k, v in row.items() if v != ""} for _, row in batch]
+        valid, errors = validate_rows(table_name, data)
+        for err in errors:
             esecuri += 1
-            erori.append({"rand": total, "date_initiale": row, "erori": [str(e)]})
+            rand, row = batch[err["index"]]
+            add_error(rand, row, [e["msg"] for e in err["error"]])
 
-    # ----------------------------------------
-    # 3. SALVARE ÎN BAZA DE DATE
-    # ----------------------------------------
-    try:
+        # păstrăm doar coloanele tabelului pentru INSERT (câmpurile fără coloană trebuie să fie goale)
+        rejected = {err["index"] for err in errors}
+        accepted = [item for i, item in enumerate(batch) if i not in rejected]
+        rows = []
+        for (rand, row), obj in zip(accepted, valid):
+            try:
+                rows.append(insertable(Model, obj))
+            except ValueError as e:
+                esecuri += 1
+                add_error(rand, row, [str(e)])
+        return rows
+
+    def commit():
+        # ChangeLog în aceeași tranzacție: rândurile cu cheia > logged_until, apoi commit
+        nonlocal logged_until
+        if pending:
+            logged_until = record_inserts_after(table_name, logged_until)
         db.session.commit()
+
+    def flush(batch):
+        nonlocal pending, salvate
+        pending += insert_rows(Model, prepare(batch))
+        if commit_every and pending >= commit_every:
+            commit()
+            salvate += pending
+            pending = 0
+
+    # rândurile importate primesc chei > after_id: ChangeLog le preia cu un singur INSERT ... SELECT.
+    # Maximul e citit fără lock: rândurile inserate în paralel de alte cereri (cheie > after_id)
+    # sunt jurnalizate și ca inserări ale importului. Sunt deja în jurnal prin cererea lor,
+    # deci rezultă doar duplicate, pe care consumatorii le aplică ca upsert.
+    pk = integer_pk(Model)
+    after_id = db.session.scalar(select(func.coalesce(func.max(pk), 0))) if pk is not None else None
+    logged_until = after_id
+
+    try:
+        batch = []
+        try:
+            for row in reader:
+                total += 1
+                row.pop("id", None)  # DB generează automat ID
+                batch.append((total, row))
+                if len(batch) >= batch_size:
+                    flush(batch)
+                    batch = []
+        except UnicodeDecodeError:
+            db.session.rollback()
+            return jsonify({"eroare": "CSV trebuie să fie UTF-8.", "rand": total, "salvate": salvate}), 400
+
+        pending += insert_rows(Model, prepare(batch))
+
+        # ----------------------------------------
+        # 3. SALVARE ÎN BAZA DE DATE
+        # ----------------------------------------
+        commit()
+        salvate += pending
     except Exception as e:
         db.session.rollback()
-        return jsonify({"eroare": f"Eroare salvare DB: {str(e)}"}), 500
+        return jsonify({"eroare": f"Eroare salvare DB: {str(e)}", "rand": total, "salvate": salvate}), 500
+    finally:
+        stream.detach()
+        if salvate:
+            # executemany nu întoarce cheile: abonații reîncarcă tabelul
+            notify_rows_changed(table_name, "insert", after_id=after_id)
+
+    durata = time.perf_counter() - started
 
     return jsonify({
         "totalRanduri": total,
-        "reusite": reusite,
+        "reusite": salvate,
         "esecuri": esecuri,
-        "importate": importate,
-        "erori": erori
+        "erori": erori,
+        "eroriNeafisate": max(0, esecuri - len(erori)),
+        "durataSecunde": round(durata, 3),
+        "randuriPeSecunda": round(total / durata, 1) if durata else total
     })
 
 
@@ -123,36 +206,156 @@ def import_csv(table_name):
 @CSV_IO.route("/<table_name>", methods=["GET"])
 @allowed_users(["Client", "Angajat", "Administrator"])
 def export_csv(table_name):
+    """
+    Export complet sau incremental, după watermark-ul din query string:
+      ?since_id=N          rândurile cu cheia > N (tabele cu cheie întreagă; doar inserări)
+      ?since=<ISO 8601>    rândurile cu coloana __watermark__ > since (ex. Feedback.DateSent)
+      ?since_version=V     rândurile inserate/modificate după versiunea V din ChangeLog, plus
+                           coloana `_op` (upsert / delete; la delete e completată doar cheia)
+    Header-ul X-Next-Watermark conține query string-ul pentru apelul următor (ex. since_version=42).
+    Formatul (csv, csv.gz, ndjson, arrow) vine din ?format= sau Accept; vezi export_formats.py.
+
+    Cheile IDENTITY (id-urile și ChangeLog.Version) sunt alocate la insert, dar devin vizibile
+    la commit, nu neapărat în ordine: o tranzacție lentă poate face commit cu o cheie mai mică
+    decât maximul deja exportat. De aceea watermark-ul următor e coborât cu csv.watermark_window
+    chei/versiuni (la ?since=, cu csv.watermark_window_seconds secunde), iar ultimele rânduri
+    sunt trimise din nou la apelul următor. Consumatorul aplică rândurile ca upsert după cheie,
+    deci duplicatele nu schimbă rezultatul. O tranzacție care rămâne deschisă mai mult decât
+    fereastra poate fi totuși ratată.
+    """
     table_name = table_name.lower()
 
     if table_name not in MODEL_MAP:
         return jsonify({"eroare": "Tabelul nu există sau nu are model SQL."}), 404
 
+    try:
+        fmt = negotiate_format(request.args, request.accept_mimetypes)
+    except FormatError as e:
+        return jsonify({"eroare": str(e)}), e.status
+
     Model = MODEL_MAP[table_name]
     sensitive_fields = SENSITIVE_FIELDS.get(table_name, [])
+    columns = [c for c in Model.__table__.columns if c.key not in sensitive_fields]
+    fieldnames = [c.key for c in columns]
+
+    try:
+        plan = _export_plan(table_name, Model, select(*columns))
+    except ValueError as e:
+        return jsonify({"eroare": str(e)}), 400
+    except Exception as e:
+        return jsonify({"eroare": f"Eroare la interogare: {str(e)}"}), 500
+    stmt, next_watermark, deleted = plan
+
+    # citire server-side pe bucăți: memoria rămâne constantă indiferent de nr. de rânduri
+    chunk_size = get_setting('csv.export_chunk_size', 1000)
+    stmt = stmt.execution_options(yield_per=chunk_size)
 
     try:
-        data = Model.query.all()
+        chunks = db.session.execute(stmt).partitions()
+        first_chunk = next(chunks, None)
     except Exception as e:
         return jsonify({"eroare": f"Eroare la interogare: {str(e)}"}), 500
 
-    if not data:
+    delta = any(k in request.args for k in WATERMARKS)
+    if not first_chunk and not delta:
         return jsonify({"eroare": "Tabelul este gol."}), 404
 
-    rows = []
-    for item in data:
-        row = {col: getattr(item, col) for col in item.__table__.columns.keys() if col not in sensitive_fields}
-        rows.append(row)
-
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=list(rows[0].keys()))
-    writer.writeheader()
-    writer.writerows(rows)
-    output.seek(0)
-
-    return send_file(
-        io.BytesIO(output.getvalue().encode("utf-8")),
-        mimetype="text/csv",
-        as_attachment=True,
-        download_name=f"{table_name}.csv"
+    if deleted is not None:  # since_version: coloana _op + rândurile șterse la final
+        pk_index = fieldnames.index(single_pk(Model).key)
+        chunks = _with_op(first_chunk, chunks, deleted, pk_index, len(fieldnames), chunk_size)
+        first_chunk = next(chunks, None)
+        fieldnames = fieldnames + ["_op"]
+
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    headers = {"Content-Disposition": f"attachment; filename={table_name}.{extension}", "Vary": "Accept"}
+    if next_watermark:
+        headers["X-Next-Watermark"] = next_watermark
+    return Response(
+        stream_with_context(export_stream(fmt, columns, fieldnames, first_chunk, chunks)),
+        mimetype=mimetype,
+        headers=headers
     )
+
+
+WATERMARKS = ("since_version", "since_id", "since")
+
+
+def _export_plan(table_name, Model, stmt):
+    """
+    (statement, următorul watermark, chei șterse sau None) pentru parametrii cererii.
+    Limita superioară e citită înainte de export, ca rândurile scrise între timp să
+    intre în delta următoare; ValueError → 400.
+    """
+    args = request.args
+    pk = single_pk(Model)
+
+    if "since_version" in args:
+        if pk is None:
+            raise ValueError("since_version necesită o cheie primară simplă.")
+        since = _parse(args["since_version"], int, "since_version trebuie să fie un număr întreg.")
+        until = current_version()
+        changes = changes_since(table_name, pk, since, until)
+        if changes is None:  # notificare fără chei în interval: tot tabelul, ca upsert
+            return stmt, f"since_version={_next(until, since)}", []
+        upserts, deleted = changes
+        return stmt.where(pk.in_(upserts)).order_by(pk), f"since_version={_next(until, since)}", deleted
+
+    if "since_id" in args:
+        pk = integer_pk(Model)
+        if pk is None:
+            raise ValueError("since_id necesită o cheie primară întreagă.")
+        since = _parse(args["since_id"], int, "since_id trebuie să fie un număr întreg.")
+        until = max(db.session.scalar(select(func.max(pk))) or since, since)
+        return stmt.where(pk > since, pk <= until).order_by(pk), f"since_id={_next(until, since)}", None
+
+    if "since" in args:
+        column = getattr(Model, "__watermark__", None)
+        if column is None:
+            raise ValueError(f"Tabelul '{table_name}' nu are o coloană de timp; folosiți since_id sau since_version.")
+        column = Model.__table__.columns[column]
+        since = _parse(args["since"], datetime.fromisoformat, "since trebuie să fie o dată ISO 8601.")
+        until = db.session.scalar(select(func.max(column)))
+        until = max(until, since) if until is not None else since
+        return (stmt.where(column > since, column <= until).order_by(column),
+                f"since={_next_time(until, since).isoformat()}", None)
+
+    # export complet: watermark-ul de la care poate continua un consumator incremental
+    if pk is not None and changelog_enabled():
+        return stmt, f"since_version={_next(current_version())}", None
+    pk = integer_pk(Model)
+    if pk is not None:
+        until = db.session.scalar(select(func.max(pk))) or 0
+        return stmt.where(pk <= until), f"since_id={_next(until)}", None
+    return stmt, None, None
+
+
+def _next(until, since=0):
+    """Watermark-ul următor: `until` minus fereastra de siguranță, dar nu sub `since`."""
+    return max(since, until - max(0, get_setting('csv.watermark_window', 100)))
+
+
+def _next_time(until, since):
+    """
+    Ca _next, pentru ?since=: coboară cu csv.watermark_window_seconds. Acoperă commit-urile
+    întârziate, rândurile cu același timestamp ca `until` și pe cele datate în urmă (DateSent
+    vine de la client) cu cel mult fereastra; unul datat mai devreme de atât e ratat.
+    """
+    return max(since, until - timedelta(seconds=max(0, get_setting('csv.watermark_window_seconds', 300))))
+
+
+def _parse(value, parse, message):
+    try:
+        return parse(value)
+    except (TypeError, ValueError):
+        raise ValueError(message)
+
+
+def _with_op(first_chunk, chunks, deleted, pk_index, width, chunk_size):
+    """Rândurile exportate primesc _op=upsert; cheile șterse vin la final cu _op=delete."""
+    for chunk in chain([first_chunk] if first_chunk else [], chunks):
+        yield [(*row, "upsert") for row in chunk]
+    for start in range(0, len(deleted), chunk_size):
+        yield [
+            tuple(row_id if i == pk_index else None for i in range(width)) + ("delete",)
+            for row_id in deleted[start:start + chunk_size]
+        ]
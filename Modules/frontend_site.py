@@ -1,17 +1,46 @@
 from flask import Blueprint, jsonify, abort, request
 from Modules.jwt_utils import allowed_users
 from Modules.SQLModels import db, Camera, CameraDisponibila, Feedback
+from Modules.response_cache import response_cache
+from Modules.signals import rows_changed
+from Modules.changelog import record_changes
+from Modules.logs import get_logger, debug_sampled
+from sqlalchemy import select, update, func, case, and_, or_
+from sqlalchemy.orm import joinedload
 from datetime import datetime
 
 frontend_site = Blueprint("frontend", __name__)
+log = get_logger(__name__)
+
+# ========================
+# Invalidare cache catalog
+# ========================
+# "camere"          -> /lista_camere
+# "camera:<id>"     -> /detalii_camera/<id>
+# "camere_detalii"  -> toate /detalii_camera/*
+# "disponibilitate" -> /lista_camere?disponibilitate=true
+
+@rows_changed.connect_via("camera")
+def _camere_changed(sender, op, ids=None, **extra):
+    if ids is None:
+        response_cache.invalidate("camere", "camere_detalii")
+    else:
+        response_cache.invalidate("camere", *[f"camera:{i}" for i in ids])
+
+
+@rows_changed.connect_via("cameradisponibila")
+def _camere_disponibile_changed(sender, op, ids=None, **extra):
+    # ids sunt ale camerelor fizice, nu ale tipurilor: invalidăm toate detaliile
+    response_cache.invalidate("camere_detalii", "disponibilitate")
 
 # ========================
 # List of camera types
 # ========================
 @frontend_site.route("/lista_camere", methods=["GET"])
+@response_cache.cached(lambda: ["camere", "disponibilitate"] if _cu_disponibilitate() else ["camere"])
 def get_list():
     camere = Camera.query.all()
-    print("DEBUG: camere query returned:", camere)  # ✅ print raw SQLAlchemy objects
+    debug_sampled(log, "camere query returned: %s", camere)
 
     camere_scurte = [
         {
@@ -25,17 +54,46 @@ def get_list():
         for c in camere
     ]
 
-    print("DEBUG: camere_scurte:", camere_scurte)  # ✅ print formatted list
+    # ?disponibilitate=true: Libere/Total pe tip, dintr-un singur GROUP BY
+    if _cu_disponibilitate():
+        disponibilitate = _disponibilitate_pe_tip()
+        for c in camere_scurte:
+            libere, total = disponibilitate.get(c["Id"], (0, 0))
+            c["Libere"] = libere
+            c["Total"] = total
+
+    debug_sampled(log, "camere_scurte: %s", camere_scurte)
     return jsonify(camere_scurte)
 
 
+def _cu_disponibilitate():
+    return request.args.get("disponibilitate", "false").lower() in ("1", "true", "da")
+
+
+def _disponibilitate_pe_tip():
+    """{CameraId: (libere, total)} pentru toate tipurile, într-un singur query."""
+    rows = db.session.execute(
+        select(
+            CameraDisponibila.CameraId,
+            func.sum(case((CameraDisponibila.Libera == True, 1), else_=0)),  # noqa: E712
+            func.count()
+        ).group_by(CameraDisponibila.CameraId)
+    )
+    return {camera_id: (int(libere or 0), total) for camera_id, libere, total in rows}
+
+
 # ========================
 # Detalii camera
 # ========================
 @frontend_site.route("/detalii_camera/<string:id>", methods=["GET"])
+@response_cache.cached(lambda id: [f"camera:{id}", "camere_detalii"])
 def get_camera(id):
-    camera = Camera.query.filter_by(Id=id).first()
-    print(f"DEBUG: query camera id={id} returned:", camera)
+    # camerele disponibile vin în același query (JOIN), nu la primul acces
+    camera = (Camera.query
+              .options(joinedload(Camera.camere_disponibile))
+              .filter_by(Id=id)
+              .first())
+    debug_sampled(log, "query camera id=%s returned: %s", id, camera)
 
     if not camera:
         abort(404, description=f"Camera cu id '{id}' nu a fost găsită")
@@ -43,7 +101,7 @@ def get_camera(id):
     camere_disp = [
         {"Id": cd.Id, "Libera": cd.Libera} for cd in camera.camere_disponibile
     ]
-    print("DEBUG: camere disponibile:", camere_disp)
+    debug_sampled(log, "camere disponibile: %s", camere_disp)
 
     camera_dict = {
         "Id": camera.Id,
@@ -55,7 +113,7 @@ def get_camera(id):
         "camereDisponibile": camere_disp
     }
 
-    print("DEBUG: final camera_dict:", camera_dict)
+    debug_sampled(log, "final camera_dict: %s", camera_dict)
     return jsonify(camera_dict)
 
 
@@ -66,7 +124,7 @@ def get_camera(id):
 @allowed_users(["Client", "Angajat", "Administrator"])
 def rezerva_camera():
     data = request.json
-    print("DEBUG: rezervare payload:", data)
+    debug_sampled(log, "rezervare payload: %s", data)
 
     camera_tip = data.get("camera_id")
     camera_id = data.get("camera_disponibila_id")
@@ -74,17 +132,24 @@ def rezerva_camera():
     if not camera_tip or not camera_id:
         abort(400, description="Trebuie să specifici 'camera_id' și 'camera_disponibila_id'")
 
-    cam_disp = CameraDisponibila.query.filter_by(Id=camera_id, CameraId=camera_tip).first()
-    print(f"DEBUG: CameraDisponibila query returned: {cam_disp}")
-
-    if not cam_disp:
-        abort(404, description=f"Camera disponibilă '{camera_id}' nu a fost găsită")
-    if not cam_disp.Libera:
-        abort(400, description=f"Camera {camera_id} este deja rezervată")
+    # verificarea și rezervarea într-un singur UPDATE condiționat: două rezervări
+    # simultane nu pot trece amândouă de "Libera=1"
+    result = db.session.execute(
+        update(CameraDisponibila)
+        .where(CameraDisponibila.Id == camera_id,
+               CameraDisponibila.CameraId == camera_tip,
+               CameraDisponibila.Libera == True)  # noqa: E712
+        .values(Libera=False)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        db.session.rollback()
+        _rezervare_esuata([(camera_tip, camera_id)])
 
-    cam_disp.Libera = False
+    record_changes("cameradisponibila", "update", [camera_id])
     db.session.commit()
-    print(f"DEBUG: Camera {camera_id} marked as reserved")
+    response_cache.invalidate(f"camera:{camera_tip}", "disponibilitate")
+    log.info("Camera %s marked as reserved", camera_id)
 
     return jsonify({
         "status": "succes",
@@ -94,13 +159,78 @@ def rezerva_camera():
     })
 
 
+@frontend_site.route("/rezerva_camere", methods=["POST"])
+@allowed_users(["Client", "Angajat", "Administrator"])
+def rezerva_camere():
+    """Rezervă mai multe camere deodată: toate sau niciuna."""
+    data = request.json or {}
+    camere = data.get("camere")
+    debug_sampled(log, "rezervare multiplă payload: %s", data)
+
+    if not isinstance(camere, list) or not camere:
+        abort(400, description="Trebuie să specifici 'camere': o listă de {'camera_id', 'camera_disponibila_id'}")
+
+    perechi = []
+    for c in camere:
+        if not isinstance(c, dict) or not c.get("camera_id") or not c.get("camera_disponibila_id"):
+            abort(400, description="Fiecare element trebuie să conțină 'camera_id' și 'camera_disponibila_id'")
+        perechi.append((c["camera_id"], c["camera_disponibila_id"]))
+
+    if len(set(id for _, id in perechi)) != len(perechi):
+        abort(400, description="Aceeași cameră apare de mai multe ori în cerere")
+
+    result = db.session.execute(
+        update(CameraDisponibila)
+        .where(or_(*[
+                   and_(CameraDisponibila.Id == id, CameraDisponibila.CameraId == tip)
+                   for tip, id in perechi
+               ]),
+               CameraDisponibila.Libera == True)  # noqa: E712
+        .values(Libera=False)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != len(perechi):
+        db.session.rollback()
+        _rezervare_esuata(perechi)
+
+    record_changes("cameradisponibila", "update", [id for _, id in perechi])
+    db.session.commit()
+    tipuri = sorted({tip for tip, _ in perechi})
+    response_cache.invalidate(*[f"camera:{tip}" for tip in tipuri], "disponibilitate")
+    log.info("%d camere marked as reserved", len(perechi))
+
+    return jsonify({
+        "status": "succes",
+        "rezervate": [{"camera_id": id, "camera_tip": tip} for tip, id in perechi],
+        "mesaj": f"{len(perechi)} camere au fost rezervate cu succes."
+    })
+
+
+def _rezervare_esuata(perechi):
+    """Doar pe calea de eșec: stabilește dacă o cameră lipsește (404) sau e ocupată (400)."""
+    gasite = {
+        (cd.CameraId, cd.Id): cd.Libera
+        for cd in CameraDisponibila.query.filter(
+            CameraDisponibila.Id.in_([id for _, id in perechi])
+        )
+    }
+    lipsa = [id for tip, id in perechi if (tip, id) not in gasite]
+    if lipsa:
+        abort(404, description=f"Camera disponibilă '{', '.join(lipsa)}' nu a fost găsită")
+    ocupate = [id for tip, id in perechi if not gasite[(tip, id)]]
+    if ocupate:
+        abort(400, description=f"Camera {', '.join(ocupate)} este deja rezervată")
+    # camerele s-au eliberat între UPDATE și verificare: nu avem ce cameră să numim
+    abort(409, description="Rezervarea nu a putut fi efectuată din cauza unei modificări concurente; reîncercați")
+
+
 # ========================
 # Feedback/contact
 # ========================
 @frontend_site.route("/contact", methods=["POST"])
 def contact():
     data = request.json
-    print("DEBUG: contact payload:", data)
+    debug_sampled(log, "contact payload: %s", data)
 
     if not data or "name" not in data or "email" not in data or "message" not in data:
         abort(400, description="Date invalide")
@@ -114,7 +244,9 @@ def contact():
     )
 
     db.session.add(feedback)
+    db.session.flush()  # Id-ul generat, pentru ChangeLog în aceeași tranzacție
+    record_changes("feedback", "insert", [feedback.Id])
     db.session.commit()
-    print("DEBUG: Feedback saved:", feedback)
+    log.info("Feedback saved: %s", feedback.Id)
 
     return jsonify({"status": "success"})
@@ -0,0 +1,89 @@
+# json_provider.py — serializare JSON rapidă pentru toată aplicația (jsonify, /search NDJSON)
+#
+# orjson dacă e instalat, altfel json din stdlib cu separatori compacți. În ambele cazuri
+# valorile arată ca în DefaultJSONProvider din Flask, deci clienții existenți nu se schimbă:
+#   Decimal, UUID  → string (fără pierdere de precizie)
+#   date/datetime  → HTTP date ("Mon, 01 Jan 2024 10:00:00 GMT")
+# Exportul NDJSON (/csv/<tabel>?format=ndjson) e nou și cere iso_dates=True: ISO 8601
+# ("2024-01-01T10:00:00"), ca exportul Arrow.
+import dataclasses
+import datetime
+import decimal
+import json
+import uuid
+
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+from Modules.misc import config, get_setting
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default_iso(value):
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, (datetime.date, datetime.time)):  # datetime e subclasă de date
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _default(value):
+    if isinstance(value, datetime.date):
+        return http_date(value)  # ca Flask: naive = UTC
+    return _default_iso(value)
+
+
+def dumps_bytes(obj, sort_keys=False, iso_dates=False):
+    """Un obiect → JSON compact (bytes, UTF-8); datele ca HTTP date, sau ISO 8601 cu iso_dates."""
+    default = _default_iso if iso_dates else _default
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        if not iso_dates:
+            option |= orjson.OPT_PASSTHROUGH_DATETIME  # altfel orjson scrie singur ISO 8601
+        return orjson.dumps(obj, default=default, option=option)
+    return json.dumps(obj, default=default, ensure_ascii=False, separators=(",", ":"),
+                      sort_keys=sort_keys).encode("utf-8")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Provider-ul Flask (app.json) peste dumps_bytes; indent doar în debug / compact=False."""
+
+    sort_keys = get_setting('json.sort_keys', True)  # actualizat de _apply_settings la reload
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.keys() <= {"separators"}:
+            return dumps_bytes(obj, self.sort_keys).decode("utf-8")
+        kwargs.setdefault("default", _default)
+        kwargs.setdefault("sort_keys", self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj, self.sort_keys) + b"\n", mimetype=self.mimetype)
+
+
+def init_json(app):
+    app.json = FastJSONProvider(app)
+
+
+@config.on_reload
+def _apply_settings(cfg):
+    FastJSONProvider.sort_keys = cfg.get('json.sort_keys', True)
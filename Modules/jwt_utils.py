@@ -5,10 +5,24 @@ from flask_jwt_extended import (
 )
 from datetime import timedelta
 from Modules.SQLModels import User
+from Modules.caching import TTLCache
+from Modules.misc import config, get_setting
+from Modules.signals import rows_changed
 from functools import wraps
 
 jwt = JWTManager()  # Will initialize in server.py with jwt.init_app(app)
 
+# Cache de principal: evită un SELECT pe Users la fiecare request autorizat
+principal_cache = TTLCache(
+    max_size=config.cache.principal_max_size,
+    ttl=config.cache.principal_ttl
+)
+
+
+@config.on_reload
+def _resize_principal_cache(cfg):
+    principal_cache.resize(cfg.cache.principal_max_size, cfg.cache.principal_ttl)
+
 # --------------------------
 # GEN JWT
 # --------------------------
@@ -21,29 +35,71 @@ def generate_jwt(user):
         additional_claims={
             "role": user.role,
             "id": user.id,
-            "email": user.email
+            "email": user.email,
+            "nume": user.nume,
+            "is_active": user.is_active
         },
         expires_delta=timedelta(hours=1)
     )
 
 # --------------------------
-# GET CURRENT USER (from DB)
+# GET CURRENT USER (cache -> DB)
 # --------------------------
 def get_current_user():
     username = get_jwt_identity()
     claims = get_jwt()
 
+    # fast path: rolul vine din token-ul semnat, fără DB și fără cache
+    if get_setting('cache.principal.trust_role_claims', False) and "role" in claims and "id" in claims:
+        return {
+            "id": claims["id"],
+            "username": username,
+            "email": claims.get("email"),
+            "role": claims["role"],
+            "nume": claims.get("nume"),
+            "is_active": claims.get("is_active", True)
+        }
+
+    cached = principal_cache.get(username)
+    if cached is not None:
+        return cached
+
     user = User.query.filter_by(username=username).first()
     if not user:
         return None
 
-    return {
+    principal = {
         "id": user.id,
         "username": user.username,
         "email": user.email,
         "role": user.role,
-        "nume": user.nume
+        "nume": user.nume,
+        "is_active": user.is_active
     }
+    principal_cache.set(username, principal)
+    return principal
+
+
+def invalidate_principals(user_ids=None, usernames=None):
+    """Scoate din cache userii modificați/șterși (după id sau username)."""
+    user_ids = set(user_ids or ())
+    usernames = set(usernames or ())
+    if not user_ids and not usernames:
+        return 0
+    return principal_cache.delete_where(
+        lambda key, p: key in usernames or p["id"] in user_ids
+    )
+
+
+@rows_changed.connect_via("users")
+def _users_changed(sender, op, ids=None, **extra):
+    # /update/users sau /delete/users: rolul / is_active pot fi altele acum
+    if op == "insert":
+        return
+    if ids is None:
+        principal_cache.clear()
+    else:
+        invalidate_principals(user_ids=ids)
 
 # --------------------------
 # CHECK ROLE (simple)
@@ -61,7 +117,7 @@ def allowed_users(allowed_roles):
         @jwt_required()
         def decorated(*args, **kwargs):
             user = get_current_user()
-            if not user or user["role"] not in allowed_roles:
+            if not user or not user["is_active"] or user["role"] not in allowed_roles:
                 return jsonify({"error": "Acces interzis"}), 403
             return fn(*args, **kwargs)  # <- make sure args/kwargs are passed
         return decorated
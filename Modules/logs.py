@@ -0,0 +1,39 @@
+# logs.py — logging pe niveluri, cu eșantionare pentru mesajele DEBUG de pe calea fierbinte
+#
+#   log = get_logger(__name__)
+#   debug_sampled(log, "payload: %s", data)
+#
+# Când nivelul DEBUG e dezactivat, apelul se oprește la isEnabledFor(): argumentele
+# nu sunt formatate deloc. Când e activ, doar o fracțiune din mesaje (logging.debug_sample_rate)
+# ajunge în log, ca un payload mare la fiecare request să nu domine timpul de răspuns.
+import logging
+import random
+
+from Modules.misc import config, get_setting
+
+
+def _level():
+    return getattr(logging, str(get_setting('logging.level', 'INFO')).upper(), logging.INFO)
+
+
+def setup_logging():
+    logging.basicConfig(level=_level(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    config.on_reload(_apply_level)
+
+
+def _apply_level(cfg):
+    # logging.level schimbat în settings.json se aplică fără restart
+    logging.getLogger().setLevel(_level())
+
+
+def get_logger(name):
+    return logging.getLogger(name)
+
+
+def debug_sampled(logger, msg, *args):
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    rate = float(get_setting('logging.debug_sample_rate', 1.0))
+    if rate < 1.0 and random.random() >= rate:
+        return
+    logger.debug(msg, *args)
@@ -0,0 +1,265 @@
+# metrics.py — instrumentare per request + endpoint /metrics în format text Prometheus
+#
+#   http_request_duration_seconds   histogramă pe blueprint / rută / metodă / status
+#   http_response_size_bytes        histogramă pe blueprint / rută (fără răspunsurile streamed)
+#   db_statements_per_request       histogramă: câte query-uri a rulat un request
+#   db_statement_time_per_request_seconds  histogramă: timpul SQL cumulat al unui request
+#   db_statements_total / db_statement_seconds_total  toate query-urile (inclusiv fan-out)
+#   db_pool_checkout_wait_seconds   histogramă: cât a așteptat o conexiune din pool
+#   db_pool_*                       starea pool-ului (DBConn.pool_stats)
+#   cache_*                         statisticile cache-urilor (ca /cache/stats)
+#
+# Fără dependențe externe; valorile sunt per proces (per worker).
+# /metrics cere metrics.token (Bearer) sau un JWT de Administrator.
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+from flask import Response, g, has_app_context, request
+from sqlalchemy import event
+
+from Modules.DBConn import db, pool_stats
+from Modules.jwt_utils import allowed_users
+from Modules.misc import get_setting
+
+LATENCY_BUCKETS = get_setting(
+    'metrics.latency_buckets',
+    [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+)
+SIZE_BUCKETS = get_setting(
+    'metrics.size_buckets',
+    [256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304]
+)
+COUNT_BUCKETS = [1, 2, 3, 5, 10, 20, 50, 100]
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name, doc, labelnames=()):
+        self.name, self.doc, self.labelnames = name, doc, tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, *labels):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, doc, buckets, labelnames=()):
+        self.name, self.doc, self.labelnames = name, doc, tuple(labelnames)
+        self.buckets = sorted(buckets)
+        self._series = {}   # labels -> [numărători pe bucket..., +Inf, sumă]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[i] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} histogram"]
+        names = self.labelnames + ("le",)
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        for labels, series in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + ["+Inf"], series[:-1]):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_labels(names, labels + (bound,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {round(series[-1], 6)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Durata request-urilor HTTP.",
+    LATENCY_BUCKETS, ("blueprint", "route", "method", "status")
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Dimensiunea corpului răspunsului (fără cele streamed).",
+    SIZE_BUCKETS, ("blueprint", "route")
+)
+REQUEST_STATEMENTS = Histogram(
+    "db_statements_per_request", "Query-uri SQL rulate de un request.",
+    COUNT_BUCKETS, ("blueprint", "route")
+)
+REQUEST_SQL_TIME = Histogram(
+    "db_statement_time_per_request_seconds", "Timpul SQL cumulat al unui request.",
+    LATENCY_BUCKETS, ("blueprint", "route")
+)
+STATEMENTS = Counter("db_statements_total", "Query-uri SQL executate.")
+STATEMENT_TIME = Counter("db_statement_seconds_total", "Timpul total petrecut în query-uri SQL.")
+POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Așteptarea unei conexiuni din pool.", LATENCY_BUCKETS
+)
+
+REGISTRY = [REQUEST_LATENCY, RESPONSE_SIZE, REQUEST_STATEMENTS, REQUEST_SQL_TIME,
+            STATEMENTS, STATEMENT_TIME, POOL_WAIT]
+
+
+# -------------------------------------------------------------------------
+# SQLAlchemy
+# -------------------------------------------------------------------------
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._metrics_start
+    STATEMENTS.inc()
+    STATEMENT_TIME.inc(elapsed)
+    if has_app_context() and "metrics_sql" in g:
+        g.metrics_sql[0] += 1
+        g.metrics_sql[1] += elapsed
+
+
+def instrument_engine(engine):
+    """Query-uri (număr + timp) și așteptarea la checkout din pool pentru un engine."""
+    if getattr(engine, "_metrics_instrumented", False):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    # Connection() cere conexiunea prin engine.raw_connection(): timpul acelui apel
+    # e exact așteptarea după pool (plus deschiderea unei conexiuni noi, dacă e cazul)
+    raw_connection = engine.raw_connection
+
+    @wraps(raw_connection)
+    def timed_raw_connection(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return raw_connection(*args, **kwargs)
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - start)
+
+    engine.raw_connection = timed_raw_connection
+    engine._metrics_instrumented = True
+
+
+# -------------------------------------------------------------------------
+# Flask
+# -------------------------------------------------------------------------
+def _route_labels():
+    rule = request.url_rule.rule if request.url_rule else "<necunoscută>"
+    return request.blueprint or "", rule
+
+
+def _before_request():
+    g.metrics_start = time.perf_counter()
+    g.metrics_sql = [0, 0.0]
+
+
+def _after_request(response):
+    start = g.get("metrics_start")
+    if start is None:
+        return response
+    blueprint, rule = _route_labels()
+    REQUEST_LATENCY.observe(time.perf_counter() - start, blueprint, rule,
+                            request.method, response.status_code)
+    if not response.is_streamed and response.content_length is not None:
+        RESPONSE_SIZE.observe(response.content_length, blueprint, rule)
+    statements, sql_time = g.metrics_sql
+    REQUEST_STATEMENTS.observe(statements, blueprint, rule)
+    REQUEST_SQL_TIME.observe(sql_time, blueprint, rule)
+    return response
+
+
+def _cache_lines():
+    # importate aici: metrics.py nu trebuie să depindă de ordinea blueprint-urilor
+    from Modules.jwt_utils import principal_cache
+    from Modules.query_plan import plan_cache
+    from Modules.response_cache import response_cache
+
+    caches = {
+        "principal": principal_cache.stats(),
+        "search_plans": plan_cache.stats(),
+        "responses": response_cache.stats(),
+    }
+    lines = []
+    for metric, kind in (("hits", "counter"), ("misses", "counter"),
+                         ("size", "gauge"), ("hit_ratio", "gauge")):
+        name = f"cache_{metric}" + ("_total" if kind == "counter" else "")
+        lines += [f"# HELP {name} Statistici cache: {metric}.", f"# TYPE {name} {kind}"]
+        for cache, stats in caches.items():
+            if metric in stats:
+                lines.append(f'{name}{{cache="{cache}"}} {stats[metric]}')
+    return lines
+
+
+def _pool_lines():
+    stats = pool_stats()
+    lines = []
+    for name, doc in (("size", "Dimensiunea configurată a pool-ului."),
+                      ("checkedout", "Conexiuni împrumutate acum."),
+                      ("checkedin", "Conexiuni libere în pool."),
+                      ("overflow", "Conexiuni peste pool_size.")):
+        if name in stats:
+            lines += [f"# HELP db_pool_{name} {doc}", f"# TYPE db_pool_{name} gauge",
+                      f"db_pool_{name} {stats[name]}"]
+    return lines
+
+
+def render_metrics():
+    lines = []
+    for metric in REGISTRY:
+        lines += metric.render()
+    lines += _pool_lines()
+    lines += _cache_lines()
+    return "\n".join(lines) + "\n"
+
+
+def _metrics_response():
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
+
+
+_admin_metrics = allowed_users(["Administrator"])(_metrics_response)
+
+
+def metrics_view():
+    """
+    metrics.token setat (ex. APP_METRICS__TOKEN): scraper-ul trimite `Authorization: Bearer <token>`;
+    altfel e nevoie de un JWT de Administrator, ca la /cache/stats.
+    """
+    token = get_setting('metrics.token')
+    if not token:
+        return _admin_metrics()
+    expected = f"Bearer {token}".encode()
+    if not hmac.compare_digest(request.headers.get("Authorization", "").encode(), expected):
+        return Response("Acces interzis\n", status=401, mimetype="text/plain",
+                        headers={"WWW-Authenticate": "Bearer"})
+    return _metrics_response()
+
+
+def init_metrics(app):
+    """Hook-uri before/after request, evenimente pe engine și ruta /metrics."""
+    if not get_setting('metrics.enabled', True):
+        return
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    with app.app_context():
+        instrument_engine(db.engine)
+    app.add_url_rule(get_setting('metrics.path', '/metrics'), "metrics", metrics_view, methods=["GET"])
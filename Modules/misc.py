@@ -1,8 +1,21 @@
 # misc.py
 import json
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies
+    fcntl = None
+
 SETTINGS_FILE = Path('Modules/settings.json')
+ENV_PREFIX = "APP_"
+
+log = logging.getLogger(__name__)
 
 
 def load_settings() -> dict:
@@ -14,17 +27,57 @@ def load_settings() -> dict:
 
 
 def save_settings(settings: dict):
-    """Save settings back to the JSON file."""
-    with SETTINGS_FILE.open('w', encoding='utf-8') as f:
-        json.dump(settings, f, indent=2, ensure_ascii=False)
+    """Save settings back to the JSON file atomically (temp file + rename)."""
+    fd, tmp = tempfile.mkstemp(dir=SETTINGS_FILE.parent, prefix=".settings.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(settings, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, SETTINGS_FILE)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
 
 
-def get_setting(key: str, default=None):
-    """Get a single setting by key, supports nested keys via dots."""
-    settings = load_settings()
-    keys = key.split(".")
+def apply_env_overrides(settings: dict, environ=None, prefix=ENV_PREFIX) -> dict:
+    """
+    APP_DB__PASSWORD=x overrides settings["db"]["password"] ("__" separates levels).
+    Values are parsed as JSON unless the setting they replace is a string.
+    """
+    environ = os.environ if environ is None else environ
+    for name, raw in environ.items():
+        if not name.startswith(prefix) or len(name) == len(prefix):
+            continue
+        target = settings
+        parts = name[len(prefix):].lower().split("__")
+        for part in parts[:-1]:
+            key = _match_key(target, part)
+            if not isinstance(target.get(key), dict):
+                target[key] = {}
+            target = target[key]
+        key = _match_key(target, parts[-1])
+        if isinstance(target.get(key), str):
+            target[key] = raw
+        else:
+            try:
+                target[key] = json.loads(raw)
+            except ValueError:
+                target[key] = raw
+    return settings
+
+
+def _match_key(mapping: dict, lowered: str) -> str:
+    for key in mapping:
+        if key.lower() == lowered:
+            return key
+    return lowered
+
+
+def _lookup(settings: dict, key: str, default=None):
     val = settings
-    for k in keys:
+    for k in key.split("."):
         if isinstance(val, dict):
             val = val.get(k, default)
         else:
@@ -32,21 +85,222 @@ def get_setting(key: str, default=None):
     return val
 
 
+# ---------------------------------------------------------------------------
+# Typed sections
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True)
+class PoolConfig:
+    size: int = 10
+    max_overflow: int = 20
+    pre_ping: bool = True
+    recycle: int = 1800
+    timeout: float = 30.0
+    warm: int = 1
+
+    @classmethod
+    def from_settings(cls, s: dict):
+        return cls(
+            size=int(_lookup(s, 'db.pool.size', cls.size)),
+            max_overflow=int(_lookup(s, 'db.pool.max_overflow', cls.max_overflow)),
+            pre_ping=bool(_lookup(s, 'db.pool.pre_ping', cls.pre_ping)),
+            recycle=int(_lookup(s, 'db.pool.recycle', cls.recycle)),
+            timeout=float(_lookup(s, 'db.pool.timeout', cls.timeout)),
+            warm=int(_lookup(s, 'db.pool.warm', cls.warm)),
+        )
+
+
+@dataclass(frozen=True)
+class CacheConfig:
+    principal_ttl: float = 60.0
+    principal_max_size: int = 2048
+    search_plans_max_size: int = 512
+    responses_ttl: float = 300.0
+    responses_max_size: int = 1024
+
+    @classmethod
+    def from_settings(cls, s: dict):
+        return cls(
+            principal_ttl=float(_lookup(s, 'cache.principal.ttl', cls.principal_ttl)),
+            principal_max_size=int(_lookup(s, 'cache.principal.max_size', cls.principal_max_size)),
+            search_plans_max_size=int(_lookup(s, 'cache.search_plans.max_size', cls.search_plans_max_size)),
+            responses_ttl=float(_lookup(s, 'cache.responses.ttl', cls.responses_ttl)),
+            responses_max_size=int(_lookup(s, 'cache.responses.max_size', cls.responses_max_size)),
+        )
+
+
+@dataclass(frozen=True)
+class LimitsConfig:
+    search_default: int = 100
+    search_max: int = 1000
+    search_tables: dict = field(default_factory=dict)
+    search_stream_max: int = 100000
+    delete_batch_size: int = 1000
+
+    @classmethod
+    def from_settings(cls, s: dict):
+        return cls(
+            search_default=int(_lookup(s, 'limits.search.default', cls.search_default)),
+            search_max=int(_lookup(s, 'limits.search.max', cls.search_max)),
+            search_tables=dict(_lookup(s, 'limits.search.tables', None) or {}),
+            search_stream_max=int(_lookup(s, 'limits.search.stream_max', cls.search_stream_max)),
+            delete_batch_size=int(_lookup(s, 'limits.delete_batch_size', cls.delete_batch_size)),
+        )
+
+    def page(self, table_name):
+        """(default, max) page size for a table."""
+        per_table = self.search_tables.get(table_name) or {}
+        return per_table.get("default", self.search_default), per_table.get("max", self.search_max)
+
+
+class Config:
+    """
+    settings.json loaded once, plus APP_* environment overrides. Lookups never touch
+    the disk; a watcher thread reloads the file when its mtime changes.
+    Code that sizes something from a setting at startup (caches, pools) registers
+    on_reload() to follow later changes; plain values are read with get_setting() at call time.
+    """
+
+    def __init__(self, path=None):
+        self._path = path
+        self._lock = threading.RLock()
+        self._watcher = None
+        self._interval = None
+        self._stop = threading.Event()
+        self._callbacks = []
+        self._bad_mtime = None
+        self.reload()
+
+    @property
+    def path(self):
+        return self._path or SETTINGS_FILE
+
+    def reload(self):
+        with self._lock:
+            mtime = self.path.stat().st_mtime_ns
+            data = apply_env_overrides(load_settings())
+            # every section is parsed before anything is replaced: a bad value
+            # (e.g. "size": null → int(None)) raises and leaves the previous config intact
+            pool = PoolConfig.from_settings(data)
+            cache = CacheConfig.from_settings(data)
+            limits = LimitsConfig.from_settings(data)
+            self.data, self.pool, self.cache, self.limits = data, pool, cache, limits
+            self.mtime = mtime
+        for callback in list(self._callbacks):
+            try:
+                callback(self)
+            except Exception:
+                log.exception("settings reload: callback %s failed", getattr(callback, "__qualname__", callback))
+
+    def on_reload(self, callback):
+        """Call callback(config) after every successful reload. Usable as a decorator."""
+        if callback not in self._callbacks:
+            self._callbacks.append(callback)
+        return callback
+
+    def reload_if_changed(self) -> bool:
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except FileNotFoundError:  # between unlink and rename, or deleted: keep the old values
+            return False
+        if mtime in (self.mtime, self._bad_mtime):
+            return False
+        try:
+            self.reload()
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            # half-written by an editor or an invalid value: keep the previous config
+            # and try again when the file changes
+            self._bad_mtime = mtime
+            log.error("settings reload failed, keeping the previous config: %s", e)
+            return False
+        return True
+
+    def get(self, key: str, default=None):
+        return _lookup(self.data, key, default)
+
+    def set(self, key: str, value):
+        """Change one setting in the file (not the env overrides) and reload."""
+        with self._lock, _file_lock(self.path):
+            settings = load_settings()
+            keys = key.split(".")
+            target = settings
+            for k in keys[:-1]:
+                if k not in target or not isinstance(target[k], dict):
+                    target[k] = {}
+                target = target[k]
+            target[keys[-1]] = value
+            save_settings(settings)
+            self.reload()
+
+    # -- watcher ----------------------------------------------------------
+    def start_watcher(self, interval=None):
+        """Poll the file's mtime in a daemon thread (restarted in forked children)."""
+        interval = interval or float(self.get('config.reload_interval', 2))
+        with self._lock:
+            if self._watcher is not None and self._watcher.is_alive():
+                return
+            self._stop.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, args=(interval,), name="settings-watcher", daemon=True
+            )
+            self._watcher.start()
+            self._interval = interval
+
+    def stop_watcher(self):
+        self._stop.set()
+
+    def _watch(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.reload_if_changed()
+            except Exception:  # the watcher must outlive any single bad reload
+                log.exception("settings watcher: reload failed")
+
+    def _after_fork(self):
+        # threads do not survive fork(): the child gets fresh locks and its own watcher
+        was_running = self._watcher is not None and not self._stop.is_set()
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._watcher = None
+        if was_running:
+            self.start_watcher(self._interval)
+
+
+class _file_lock:
+    """Exclusive lock on settings.json.lock so concurrent writers (other workers) serialize."""
+
+    def __init__(self, path):
+        self._path = Path(str(path) + ".lock")
+        self._f = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self._f = open(self._path, "a")
+            fcntl.flock(self._f, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self._f is not None:
+            fcntl.flock(self._f, fcntl.LOCK_UN)
+            self._f.close()
+
+
+config = Config()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=config._after_fork)
+
+
+def get_setting(key: str, default=None):
+    """Get a single setting by key, supports nested keys via dots."""
+    return config.get(key, default)
+
+
 def change_setting(key: str, value):
     """Change a single setting by key and save to file, supports nested keys via dots."""
-    settings = load_settings()
-    keys = key.split(".")
-    target = settings
-    for k in keys[:-1]:
-        if k not in target or not isinstance(target[k], dict):
-            target[k] = {}
-        target = target[k]
-    target[keys[-1]] = value
-    save_settings(settings)
+    config.set(key, value)
 
 
 # Shortcut variables (optional)
-settings = load_settings()
+settings = config.data
 SSL_CONTEXT = (get_setting('ssl_context.cert'), get_setting('ssl_context.key'))
 # ALLOWED_TERMS = get_setting('allowed_terms')
 JWT_SECRET_KEY = get_setting('jwt_secret_key')
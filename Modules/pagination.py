@@ -0,0 +1,88 @@
+# pagination.py — paginare keyset (cursor opac) și limite de pagină pentru /search
+import base64
+import json
+from sqlalchemy import Integer, String, and_, or_
+from Modules.misc import config
+
+# chei rezervate: nu sunt tratate ca filtre pe coloane
+SEARCH_OPTIONS = ("limit", "cursor", "order_by", "count_only", "fields")
+
+
+def page_limits(table_name):
+    """(default, max) pentru tabel: limits.search.tables.<tabel> peste limits.search."""
+    return config.limits.page(table_name)
+
+
+def encode_cursor(table_name, order_key, values):
+    raw = json.dumps([table_name, order_key, values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, table_name, order_key):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        tbl, key, values = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception:
+        raise ValueError("Cursor invalid")
+    if tbl != table_name or key != order_key:
+        raise ValueError("Cursor-ul nu aparține acestui tabel / acestei ordonări")
+    return values
+
+
+def _as_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ("1", "true", "yes", "da")
+
+
+class PageRequest:
+    """Fereastra cerută: limită, coloana de ordonare și poziția după cursor."""
+
+    def __init__(self, schema, options, streaming=False):
+        default, maximum = page_limits(schema.name)
+        if streaming:
+            # NDJSON: rândurile nu sunt ținute în memorie, deci pagina poate fi mult mai mare
+            maximum = max(maximum, config.limits.search_stream_max)
+
+        try:
+            self.limit = int(options.get("limit", default))
+        except (TypeError, ValueError):
+            raise ValueError("'limit' trebuie să fie un număr întreg")
+        if self.limit < 1:
+            raise ValueError("'limit' trebuie să fie pozitiv")
+        self.limit = min(self.limit, maximum)
+
+        order_key = options.get("order_by") or schema.primary_key.key
+        order_col = schema.indexed_columns.get(order_key)
+        if order_col is None or not isinstance(order_col.type, (Integer, String)):
+            raise ValueError(
+                f"'order_by' trebuie să fie o coloană indexată: {', '.join(schema.indexed_columns)}"
+            )
+        # coloana cerută + cheia primară completă ca departajare → ordine totală
+        self.order_by = [order_col] + [
+            c for c in schema.table.primary_key.columns if c is not order_col
+        ]
+        self.count_only = _as_bool(options.get("count_only", False))
+
+        self.table_name = schema.name
+        self.after = None
+        if options.get("cursor"):
+            self.after = decode_cursor(options["cursor"], schema.name, order_key)
+            if not isinstance(self.after, list) or len(self.after) != len(self.order_by):
+                raise ValueError("Cursor invalid")
+
+    def sort_key(self, row):
+        return tuple(getattr(row, c.key) for c in self.order_by)
+
+    def keyset(self):
+        """Condiția „după cursor” (comparație lexicografică): costă la fel pe orice pagină."""
+        if self.after is None:
+            return []
+        alternatives = []
+        for i, col in enumerate(self.order_by):
+            equal = [c == v for c, v in zip(self.order_by[:i], self.after[:i])]
+            alternatives.append(and_(*equal, col > self.after[i]))
+        return [or_(*alternatives)]
+
+    def next_cursor(self, row):
+        return encode_cursor(self.table_name, self.order_by[0].key, list(self.sort_key(row)))
@@ -0,0 +1,139 @@
+# passwords.py — hash-uri de parolă calculate într-un pool de procese, nu pe thread-ul request-ului
+#
+# scrypt / pbkdf2 sunt lente intenționat: calculate inline, un val de /login ține ocupați
+# toți workerii și blochează restul API-ului. Aici calculul rulează în `passwords.workers`
+# procese, cu cel mult `passwords.max_pending` cereri în așteptare; peste limită,
+# PasswordHashingBusy → 503 imediat, în loc să crească coada la nesfârșit.
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+
+from werkzeug.security import (DEFAULT_PBKDF2_ITERATIONS, check_password_hash,
+                               generate_password_hash)
+from Modules.misc import config
+
+# setate (și actualizate la reîncărcarea settings.json) de _apply_settings
+METHOD = SALT_LENGTH = TIMEOUT = None
+WORKERS = None          # 0 = calcul inline (fără pool)
+MAX_PENDING = None
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = None
+
+
+class PasswordHashingBusy(Exception):
+    """Pool-ul de hashing e saturat (sau n-a răspuns la timp): clientul poate reîncerca."""
+
+
+def normalize_method(method):
+    """Forma completă pe care werkzeug o scrie în hash: 'scrypt' → 'scrypt:32768:8:1'."""
+    name, *args = method.split(":")
+    if name == "scrypt":
+        n, r, p = args if args else (2 ** 15, 8, 1)
+        return f"scrypt:{n}:{r}:{p}"
+    if name == "pbkdf2":
+        hash_name = args[0] if args else "sha256"
+        iterations = args[1] if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}:{iterations}"
+    return method
+
+
+def needs_rehash(stored_hash):
+    """Hash-ul salvat folosește altă metodă / alt cost decât cele configurate."""
+    stored_method = stored_hash.split("$", 1)[0]
+    return normalize_method(stored_method) != normalize_method(METHOD)
+
+
+def _mp_context():
+    """
+    forkserver (spawn pe Windows): procesele pool-ului nu sunt copii prin fork ale unui
+    proces cu thread-uri (request-uri, watcher, fan-out), deci nu moștenesc lock-uri ținute.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _get_executor():
+    global _executor
+    if WORKERS <= 0:
+        return None
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(max_workers=WORKERS, mp_context=_mp_context())
+    return _executor
+
+
+def _run(fn, *args):
+    executor = _get_executor()
+    if executor is None:
+        return fn(*args)
+    slots = _slots  # semaforul poate fi înlocuit la reload: eliberăm același pe care l-am luat
+    if not slots.acquire(blocking=False):
+        raise PasswordHashingBusy("Prea multe cereri de autentificare în curs")
+    try:
+        future = executor.submit(fn, *args)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    try:
+        return future.result(timeout=TIMEOUT)
+    except FutureTimeout:
+        future.cancel()
+        raise PasswordHashingBusy(f"Hash-ul parolei nu a fost calculat în {TIMEOUT}s")
+
+
+def hash_password(password):
+    return _run(generate_password_hash, password, METHOD, SALT_LENGTH)
+
+
+def verify_password(stored_hash, password):
+    return _run(check_password_hash, stored_hash, password)
+
+
+def shutdown():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+@config.on_reload
+def _apply_settings(cfg):
+    """
+    passwords.* → variabilele modulului. Pool-ul și limita de cereri în așteptare sunt
+    refăcute doar când workers / max_pending se schimbă; hash-urile în curs se termină
+    în pool-ul vechi.
+    """
+    global METHOD, SALT_LENGTH, TIMEOUT, WORKERS, MAX_PENDING, _executor, _slots
+    METHOD = cfg.get('passwords.method', 'scrypt')
+    SALT_LENGTH = cfg.get('passwords.salt_length', 16)
+    TIMEOUT = cfg.get('passwords.timeout', 10)
+    workers, max_pending = int(cfg.get('passwords.workers', 2)), int(cfg.get('passwords.max_pending', 32))
+    if (workers, max_pending) == (WORKERS, MAX_PENDING):
+        return
+    slots = threading.BoundedSemaphore(max_pending)
+    with _executor_lock:
+        old, _executor = _executor, None
+        WORKERS, MAX_PENDING, _slots = workers, max_pending, slots
+    if old is not None:
+        old.shutdown(wait=False)
+
+
+_apply_settings(config)
+
+
+def _after_fork():
+    # procesele pool-ului aparțin părintelui: copilul își creează propriul pool la nevoie
+    global _executor, _executor_lock, _slots
+    _executor = None
+    _executor_lock = threading.Lock()
+    _slots = threading.BoundedSemaphore(MAX_PENDING)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
@@ -0,0 +1,216 @@
+# query_plan.py — metadate pe model (construite o dată) + compilatorul de filtre pentru /search
+from sqlalchemy import (DECIMAL, Date, DateTime, Float, Integer, String, Text, and_, bindparam,
+                        false, or_)
+from Modules.SQLModels import MODEL_MAP
+from Modules.caching import TTLCache
+from Modules.misc import config, SENSITIVE_FIELDS
+
+
+class ModelSchema:
+    """
+    Coloanele unui model, clasificate o singură dată la pornire, după clasa tipului.
+    Criteriile "string" / "number" din /search folosesc aceleași coloane ca vechiul search_data:
+      string  String, fără Text (Products.descriere nu e căutată)
+      number  Integer, Float și DECIMAL; Numeric simplu (Products.pret) e exclus explicit,
+              deși Float și DECIMAL îl moștenesc
+    """
+
+    __slots__ = ("name", "model", "table", "columns", "primary_key", "public_columns",
+                 "string_columns", "numeric_columns", "date_columns", "indexed_columns")
+
+    def __init__(self, name, model):
+        table = model.__table__
+        self.name = name
+        self.model = model
+        self.table = table
+        self.columns = {c.key: c for c in table.columns}
+        self.primary_key = table.primary_key.columns.values()[0]
+        self.string_columns = [
+            c for c in table.columns if isinstance(c.type, String) and not isinstance(c.type, Text)
+        ]
+        self.numeric_columns = [
+            c for c in table.columns
+            if isinstance(c.type, (Integer, Float)) or type(c.type) is DECIMAL
+        ]
+        self.date_columns = [c for c in table.columns if isinstance(c.type, (Date, DateTime))]
+        self.indexed_columns = {
+            c.key: c for c in table.columns if c.primary_key or c.unique or c.index
+        }
+        # SENSITIVE_FIELDS aplicat ca proiecție: coloanele astea nu sunt selectate deloc
+        sensitive = SENSITIVE_FIELDS.get(name, [])
+        self.public_columns = [c for c in table.columns if c.key not in sensitive]
+
+    def projection(self, fields=None):
+        """Coloanele cerute prin `fields` ("id,nume" sau listă); implicit toate cele publice."""
+        if not fields:
+            return list(self.public_columns)
+        if isinstance(fields, str):
+            fields = [f.strip() for f in fields.split(",") if f.strip()]
+        public = {c.key: c for c in self.public_columns}
+        invalid = [f for f in fields if f not in public]
+        if invalid:
+            raise ValueError(f"Câmpuri inexistente sau indisponibile: {', '.join(map(str, invalid))}")
+        return [public[f] for f in dict.fromkeys(fields)]
+
+
+def build_schema_registry(model_map):
+    return {name: ModelSchema(name, model) for name, model in model_map.items()}
+
+
+SCHEMA_REGISTRY = build_schema_registry(MODEL_MAP)
+
+
+def get_schema(table_name):
+    """Același lookup ca MODEL_MAP.get(tbl.capitalize()) or MODEL_MAP.get(tbl)."""
+    return SCHEMA_REGISTRY.get(table_name.capitalize()) or SCHEMA_REGISTRY.get(table_name)
+
+
+# -------------------------------------------------------------------------
+# Compilator de filtre
+# -------------------------------------------------------------------------
+# Un filtru {"nume": "x", "pret": {"min": 1}} e normalizat la o "formă"
+# (("nume", "eq", "p0"), ("pret", None, "p1", None)) + parametri {"p0": "x", "p1": 1}.
+# Clauza WHERE cu bindparam-uri e construită o singură dată per (tabel, formă),
+# iar SQLAlchemy reutilizează statement-ul compilat pentru orice valori.
+
+# setat de text_search.init_text_search() la pornire
+text_backend = None
+
+plan_cache = TTLCache(
+    max_size=config.cache.search_plans_max_size,
+    ttl=float("inf")
+)
+
+
+@config.on_reload
+def _resize_plan_cache(cfg):
+    plan_cache.resize(cfg.cache.search_plans_max_size)
+
+
+def normalize_filter(schema, criteria, params=None):
+    """Filtru → (formă, parametri). Cheile necunoscute sunt ignorate, ca înainte."""
+    shape = []
+    params = {} if params is None else params
+
+    def bind(value):
+        name = f"p{len(params)}"
+        params[name] = value
+        return name
+
+    for col, val in sorted(criteria.items()):
+        if col == "string":
+            term = val.get("like", val) if isinstance(val, dict) else val
+            shape.append(_string_criterion(schema, str(term).lower(), bind, params))
+            continue
+
+        if col == "number":
+            min_v = val.get("min", None)
+            max_v = val.get("max", None)
+            shape.append((
+                "number",
+                bind(min_v) if min_v is not None else None,
+                bind(max_v) if max_v is not None else None
+            ))
+            continue
+
+        if col not in schema.columns:
+            continue
+
+        if isinstance(val, dict):  # min/max or LIKE
+            shape.append((
+                col,
+                bind(f"%{val['like']}%") if "like" in val else None,
+                bind(val["min"]) if "min" in val else None,
+                bind(val["max"]) if "max" in val else None
+            ))
+        elif val is None:
+            shape.append((col, "null"))
+        else:
+            shape.append((col, "eq", bind(val)))
+
+    return tuple(shape), params
+
+
+def bound_parameters(params):
+    """Câți parametri trimite statement-ul (o listă expanding = câte unul per element)."""
+    return sum(len(v) if isinstance(v, (list, tuple)) else 1 for v in params.values())
+
+
+def _string_criterion(schema, term, bind, params):
+    """Backend-ul de text search (text_search.py) dacă poate răspunde, altfel ILIKE."""
+    if text_backend is not None:
+        # bugetul de parametri e pe tot statement-ul (filtrele legate prin OR îl împart)
+        entry = text_backend.criterion(schema, term, bind, bound_parameters(params))
+        if entry is not None:
+            return entry
+    return ("string", bind(f"%{term}%"))
+
+
+def _build_clauses(schema, shape):
+    clauses = []
+    for entry in shape:
+        kind = entry[0]
+
+        if kind == "text":
+            clauses.append(text_backend.build_clause(schema, entry))
+            continue
+
+        if kind == "string":
+            p = bindparam(entry[1])
+            clauses.append(or_(*[c.ilike(p) for c in schema.string_columns]))
+            continue
+
+        if kind == "number":
+            _, p_min, p_max = entry
+            num_conditions = []
+            for c in schema.numeric_columns:
+                if p_min:
+                    num_conditions.append(c >= bindparam(p_min))
+                if p_max:
+                    num_conditions.append(c <= bindparam(p_max))
+            if num_conditions:
+                clauses.append(and_(*num_conditions))
+            continue
+
+        column = schema.columns[kind]
+        if entry[1] == "null":
+            clauses.append(column.is_(None))
+        elif entry[1] == "eq":
+            clauses.append(column == bindparam(entry[2]))
+        else:
+            _, p_like, p_min, p_max = entry
+            if p_like:
+                clauses.append(column.ilike(bindparam(p_like)))
+            if p_min:
+                clauses.append(column >= bindparam(p_min))
+            if p_max:
+                clauses.append(column <= bindparam(p_max))
+    return clauses
+
+
+def compile_filters(schema, filters):
+    """
+    Listă de filtre → (clauze WHERE, parametri) pentru UN singur query:
+    filtrele sunt legate prin OR, deci fiecare rând apare o singură dată.
+    Clauzele vin din plan_cache când forma listei a mai fost văzută.
+    """
+    params = {}
+    shapes = tuple(normalize_filter(schema, f, params)[0] for f in filters)
+    key = (schema.name, shapes)
+    clauses = plan_cache.get(key)
+    if clauses is None:
+        per_filter = [_build_clauses(schema, shape) for shape in shapes]
+        if not per_filter:
+            clauses = [false()]  # lista goală de filtre nu potrivește nimic (ca înainte)
+        elif any(not c for c in per_filter):
+            clauses = []  # un filtru gol potrivește tot tabelul
+        elif len(per_filter) == 1:
+            clauses = per_filter[0]
+        else:
+            clauses = [or_(*[and_(*c) for c in per_filter])]
+        plan_cache.set(key, clauses)
+    return clauses, params
+
+
+def compile_filter(schema, criteria):
+    return compile_filters(schema, [criteria])
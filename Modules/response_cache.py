@@ -0,0 +1,167 @@
+# response_cache.py — cache de răspunsuri HTTP cu ETag / 304 pentru endpoint-uri publice
+#
+# Fiecare răspuns cache-uit declară "tag-uri" (ex. "camere", "camera:DBL").
+# Cheia include versiunea curentă a fiecărui tag, așa că invalidarea unui tag
+# înseamnă doar incrementarea versiunii: intrările vechi nu mai sunt găsite și
+# ies singure din LRU / expiră. Un răspuns calculat în timp ce tag-ul era
+# invalidat e salvat sub versiunea veche, deci nu poate fi servit stale.
+import hashlib
+import threading
+from functools import wraps
+
+from flask import Response, make_response, request
+from Modules.caching import TTLCache
+from Modules.misc import config, get_setting
+from Modules.logs import get_logger
+
+log = get_logger(__name__)
+
+
+class MemoryBackend:
+    """LRU în proces (per worker)."""
+
+    def __init__(self, max_size, ttl):
+        self._entries = TTLCache(max_size=max_size, ttl=ttl)
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def resize(self, max_size, ttl):
+        self._entries.resize(max_size, ttl)
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def set(self, key, value):
+        self._entries.set(key, value)
+
+    def version(self, tag):
+        return self._versions.get(tag, 0)
+
+    def bump(self, tag):
+        with self._lock:
+            self._versions[tag] = self._versions.get(tag, 0) + 1
+
+
+class RedisBackend:
+    """Backend partajat între workeri/procese (necesită pachetul `redis`)."""
+
+    def __init__(self, url, ttl, prefix="resp:"):
+        import redis
+        self._redis = redis.Redis.from_url(url)
+        self._ttl = int(ttl)
+        self._prefix = prefix
+
+    def resize(self, max_size, ttl):
+        self._ttl = int(ttl)  # dimensiunea e limitată de maxmemory din Redis
+
+    def get(self, key):
+        data = self._redis.hgetall(self._prefix + key)
+        if not data:
+            return None
+        return data[b"etag"].decode(), data[b"mimetype"].decode(), data[b"body"]
+
+    def set(self, key, value):
+        etag, mimetype, body = value
+        pipe = self._redis.pipeline()
+        pipe.hset(self._prefix + key, mapping={"etag": etag, "mimetype": mimetype, "body": body})
+        pipe.expire(self._prefix + key, self._ttl)
+        pipe.execute()
+
+    def version(self, tag):
+        return int(self._redis.get(self._prefix + "v:" + tag) or 0)
+
+    def bump(self, tag):
+        self._redis.incr(self._prefix + "v:" + tag)
+
+
+class ResponseCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def invalidate(self, *tags):
+        for tag in tags:
+            self.backend.bump(tag)
+
+    def cached(self, tags_for):
+        """
+        Decorator pentru view-uri GET. tags_for(**view_args) → lista de tag-uri
+        de care depinde răspunsul. Doar răspunsurile 200 sunt păstrate.
+        """
+        def wrapper(fn):
+            @wraps(fn)
+            def decorated(*args, **kwargs):
+                tags = tags_for(**kwargs)
+                versions = ",".join(f"{t}={self.backend.version(t)}" for t in tags)
+                key = f"{request.full_path}|{versions}"
+
+                entry = self.backend.get(key)
+                if entry is not None:
+                    self.hits += 1
+                    return self._respond(*entry, cache_status="HIT")
+
+                self.misses += 1
+                response = make_response(fn(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+
+                body = response.get_data()
+                etag = hashlib.sha256(body).hexdigest()
+                self.backend.set(key, (etag, response.mimetype, body))
+                return self._respond(etag, response.mimetype, body, cache_status="MISS")
+            return decorated
+        return wrapper
+
+    def _respond(self, etag, mimetype, body, cache_status):
+        if etag in request.if_none_match:
+            self.not_modified += 1
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype=mimetype)
+        response.set_etag(etag)
+        response.headers["X-Cache"] = cache_status
+        return response
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+def response_backend_name():
+    """
+    cache.responses.backend: "memory", "redis" sau null (implicit) → redis când
+    server.workers > 1. Backend-ul memory invalidează doar în procesul care a făcut
+    modificarea, deci cu mai mulți workeri ceilalți servesc răspunsuri vechi până la TTL.
+    """
+    workers = get_setting('server.workers') or 1
+    name = get_setting('cache.responses.backend')
+    if name is None:
+        return "redis" if workers > 1 else "memory"
+    if name == "memory" and workers > 1:
+        log.warning("cache.responses.backend=memory cu %d workeri: invalidarea nu ajunge în ceilalți "
+                    "workeri (răspunsuri vechi până la %ss)", workers, config.cache.responses_ttl)
+    return name
+
+
+def create_response_cache():
+    ttl = config.cache.responses_ttl
+    if response_backend_name() == "redis":
+        backend = RedisBackend(get_setting('cache.responses.redis_url', 'redis://localhost:6379/0'), ttl)
+    else:
+        backend = MemoryBackend(config.cache.responses_max_size, ttl)
+    return ResponseCache(backend)
+
+
+response_cache = create_response_cache()
+
+
+@config.on_reload
+def _resize_response_cache(cfg):
+    response_cache.backend.resize(cfg.cache.responses_max_size, cfg.cache.responses_ttl)
@@ -0,0 +1,13 @@
+# signals.py — notificări după commit când rândurile unui tabel se schimbă
+from blinker import Namespace
+
+_signals = Namespace()
+
+# sender = numele tabelului din MODEL_MAP ("products", "users", ...)
+# op = "insert" | "update" | "delete"; ids = cheile primare atinse sau None (necunoscute, ex. import CSV)
+# after_id (opțional, doar cu ids=None la insert): rândurile noi au cheia > after_id
+rows_changed = _signals.signal("rows-changed")
+
+
+def notify_rows_changed(table_name, op, ids=None, **extra):
+    rows_changed.send(table_name, op=op, ids=ids, **extra)
@@ -0,0 +1,102 @@
+# testing.py — aplicație Flask pe SQLite + date de test, comune pentru tests/ (pytest) și benchmarks/
+import random
+from datetime import date
+
+from flask import Flask
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+from Modules.DBConn import db
+from Modules.SQLModels import Camera, CameraDisponibila, Product, User
+from Modules.api import api
+from Modules.Auth import auth
+from Modules.frontend_site import frontend_site
+from Modules.file_IO import CSV_IO
+from Modules.jwt_utils import init_jwt, generate_jwt
+
+BRANDS = ["Lenovo", "Dell", "Asus", "Acer", "HP", "Apple", "Samsung", "Xiaomi"]
+CATEGORII = ["laptop", "telefon", "monitor", "tableta", "periferice"]
+STATUSURI = ["testare", "activ", "inactiv"]
+
+
+def make_app(uri, name="testing"):
+    """Blueprint-urile aplicației pe baza de date `uri`, cu tabelele create de la zero."""
+    app = Flask(name)
+    app.config["SQLALCHEMY_DATABASE_URI"] = uri
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["JWT_SECRET_KEY"] = "test-secret-key-test-secret-key!!"
+    app.register_blueprint(api, url_prefix="/")
+    app.register_blueprint(auth, url_prefix="/")
+    app.register_blueprint(frontend_site, url_prefix="/data")
+    app.register_blueprint(CSV_IO, url_prefix="/csv")
+    db.init_app(app)
+    init_jwt(app)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    return app
+
+
+def auth_headers(app, role="Administrator"):
+    """Creează un user cu rolul dat și întoarce header-ul Authorization."""
+    with app.app_context():
+        username = f"test_{role.lower()}"
+        user = User.query.filter_by(username=username).first()
+        if not user:
+            user = User(
+                username=username, nume=role, email=f"{role.lower()}@test.ro",
+                password=generate_password_hash("test", method="pbkdf2:sha256:1000"),
+                role=role, is_active=True
+            )
+            db.session.add(user)
+            db.session.commit()
+        return {"Authorization": f"Bearer {generate_jwt(user)}"}
+
+
+def product_rows(n, start=1, seed=42):
+    rnd = random.Random(seed)
+    for i in range(start, start + n):
+        brand = rnd.choice(BRANDS)
+        yield {
+            "id": i,
+            "nume": f"{brand} produs {i}",
+            "brand": brand,
+            "model": f"M{rnd.randint(100, 999)}",
+            "descriere": "Descriere produs " * rnd.randint(5, 30),
+            "pret": round(rnd.uniform(10, 10000), 2),
+            "categorie": rnd.choice(CATEGORII),
+            "garantie": rnd.choice([12, 24, 36]),
+            "status": rnd.choice(STATUSURI),
+            "imagine": f"img/{i}.png",
+            "data_adaugare": date(2024, 1, 1),
+        }
+
+
+def seed_products(app, n, batch=10000):
+    with app.app_context():
+        rows = []
+        for row in product_rows(n):
+            rows.append(row)
+            if len(rows) == batch:
+                db.session.execute(insert(Product.__table__), rows)
+                rows = []
+        if rows:
+            db.session.execute(insert(Product.__table__), rows)
+        db.session.commit()
+
+
+def seed_rooms(app, tipuri, camere, toate_libere=False):
+    """
+    `tipuri` tipuri de cameră T0, T1, ... cu câte `camere` camere T<t>-0, T<t>-1, ...
+    Fără toate_libere, fiecare a treia cameră (T<t>-0, T<t>-3, ...) e ocupată.
+    """
+    with app.app_context():
+        db.session.execute(insert(Camera.__table__), [
+            {"Id": f"T{t}", "Nume": f"Tip {t}", "Pret": 100 + t, "Moneda": "RON",
+             "Imagine": f"img/T{t}.png", "Descriere": "Cameră " * 20}
+            for t in range(tipuri)
+        ])
+        db.session.execute(insert(CameraDisponibila.__table__), [
+            {"Id": f"T{t}-{c}", "CameraId": f"T{t}", "Libera": toate_libere or c % 3 != 0}
+            for t in range(tipuri) for c in range(camere)
+        ])
+        db.session.commit()
@@ -0,0 +1,357 @@
+# text_search.py — backend-uri pentru criteriul "string" din /search
+#
+#   trigram  (implicit) index invers de trigrame în proces, construit la pornire și
+#            actualizat după /add, /update, /delete (pe loc) și importul CSV (în fundal)
+#   fulltext CONTAINS din SQL Server, dacă tabelul are un index full-text activ
+#   like     fără backend: ILIKE '%termen%' pe coloanele text (scan)
+#
+# Backend-ul întoarce o intrare de "formă" pentru query_plan sau None, caz în care
+# se folosește ILIKE. Rezultatele trigram sunt identice cu ILIKE: indexul doar restrânge
+# candidații, iar potrivirea finală o face tot ILIKE-ul din DB, pe cheile candidate:
+#   WHERE pk IN (:candidați) AND (col1 ILIKE :t OR ...)  OR  <coloanele neindexate> ILIKE :t
+# Indexul compară textul pliat (casefold + fără diacritice), mai permisiv decât orice
+# colație CI/CS, AI/AS: candidații includ mereu rândurile pe care ILIKE le-ar găsi, iar
+# diferențele de pliere Python vs. colație (ex. „Ș”/„ș” pe SQLite, care pliază doar ASCII)
+# nu mai schimbă rezultatul.
+#
+# Implicit (settings: text_search.tables) Products e indexat pe nume/brand/model/categorie.
+# Criteriul caută în coloanele VARCHAR (query_plan.ModelSchema.string_columns, Text exclus);
+# cele neindexate (la Products: status) rămân pe ILIKE, deci cu scan, ca semantica să fie
+# aceeași; `"products": null` indexează toate coloanele VARCHAR (fără scan).
+import threading
+import unicodedata
+from array import array
+
+from flask import current_app
+from sqlalchemy import and_, bindparam, or_, select, text
+from colorama import Fore
+
+from Modules.DBConn import db
+from Modules.misc import get_setting
+from Modules import query_plan
+from Modules.signals import rows_changed
+from Modules.logs import get_logger
+
+LIKE_WILDCARDS = ("%", "_", "[", "\\")
+log = get_logger(__name__)
+
+
+def trigrams(value):
+    return set(zip(value, value[1:], value[2:]))
+
+
+def fold(value):
+    """Textul pliat pentru index: casefold și fără semne diacritice („Ștefan” → „stefan”)."""
+    if value.isascii():
+        return value.lower()
+    decomposed = unicodedata.normalize("NFKD", value.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+class _TableIndex:
+    """Documentele unui tabel: ordinal → (pk, texte pe coloană); trigramă → ordinale."""
+
+    def __init__(self):
+        self.pks = []           # ordinal -> pk (None = șters)
+        self.texts = []         # ordinal -> tuple de texte pliate cu fold() (None = șters)
+        self.ordinals = {}      # pk -> ordinal
+        self.postings = {}      # trigramă -> array de ordinale (crescătoare)
+        self.deleted = 0
+
+    def add(self, pk, values):
+        self.remove(pk)
+        ordinal = len(self.pks)
+        texts = tuple(fold(v) for v in values if v)
+        self.pks.append(pk)
+        self.texts.append(texts)
+        self.ordinals[pk] = ordinal
+        grams = set()
+        for t in texts:
+            grams |= trigrams(t)
+        for g in grams:
+            posting = self.postings.get(g)
+            if posting is None:
+                posting = self.postings[g] = array("I")
+            posting.append(ordinal)
+
+    def remove(self, pk):
+        ordinal = self.ordinals.pop(pk, None)
+        if ordinal is not None:
+            self.pks[ordinal] = None
+            self.texts[ordinal] = None
+            self.deleted += 1
+
+    def search(self, term, max_results):
+        """Cheile documentelor care conțin termenul; None dacă sunt peste max_results."""
+        if len(term) < 3:
+            candidates = range(len(self.pks))
+        else:
+            postings = [self.postings.get(g) for g in trigrams(term)]
+            if any(p is None for p in postings):
+                return []
+            candidates = min(postings, key=len)
+        texts, pks = self.texts, self.pks
+        found = []
+        for o in candidates:
+            doc = texts[o]
+            if doc is not None and any(term in t for t in doc):
+                found.append(pks[o])
+                if len(found) > max_results:
+                    return None
+        return found
+
+    def compacted(self):
+        fresh = _TableIndex()
+        for pk, texts in zip(self.pks, self.texts):
+            if pk is not None:
+                fresh.add(pk, texts)
+        return fresh
+
+
+class TrigramBackend:
+    name = "trigram"
+
+    def __init__(self, tables, max_ids=2000):
+        self.tables = tables            # {tabel: [coloane] sau None = toate coloanele VARCHAR}
+        # parametri pe tot statement-ul (SQL Server acceptă cel mult 2100): când cheile
+        # găsite nu mai încap lângă cei deja legați, criteriul cade pe ILIKE
+        self.max_ids = max_ids
+        self._indexes = {}
+        self._lock = threading.RLock()
+        self._running = {}              # tabel -> chei modificate cât rulează o reconstruire în fundal
+        self._pending = set()           # tabele de reconstruit din nou după jobul curent
+        self._threads = {}
+
+    def _columns(self, schema):
+        configured = self.tables.get(schema.name)
+        if not configured:
+            return list(schema.string_columns)
+        return [c for c in schema.string_columns if c.key in configured]
+
+    def _load(self, schema, pks=None, after_id=None):
+        """Rândurile (pk, texte) din DB; toate, cele cu cheile date sau cele cu cheia > after_id."""
+        columns = self._columns(schema)
+        pk = schema.primary_key
+        query = select(pk, *columns)
+        if after_id is not None:
+            query = query.where(pk > after_id)
+        if pks is None:
+            yield from db.session.execute(query.execution_options(yield_per=5000))
+            return
+        pks = list(pks)
+        for i in range(0, len(pks), 1000):
+            yield from db.session.execute(query.where(pk.in_(pks[i:i + 1000])))
+
+    def build(self, schema):
+        index = _TableIndex()
+        for row in self._load(schema):
+            index.add(row[0], row[1:])
+        with self._lock:
+            self._indexes[schema.name] = index
+        return len(index.ordinals)
+
+    def refresh(self, schema, pks):
+        rows = list(self._load(schema, pks))
+        with self._lock:
+            index = self._indexes.get(schema.name)
+            if index is None:
+                return
+            for pk in pks:
+                index.remove(pk)
+            for row in rows:
+                index.add(row[0], row[1:])
+            self._maybe_compact(schema.name, index)
+            self._mark_dirty(schema.name, pks)
+
+    def remove(self, schema, pks):
+        with self._lock:
+            index = self._indexes.get(schema.name)
+            if index is None:
+                return
+            for pk in pks:
+                index.remove(pk)
+            self._maybe_compact(schema.name, index)
+            self._mark_dirty(schema.name, pks)
+
+    def add_after(self, schema, after_id):
+        """Indexează rândurile noi (cheie > after_id) pe bucăți, fără a ține lock-ul pe durata citirii."""
+        batch = []
+        for row in self._load(schema, after_id=after_id):
+            batch.append(row)
+            if len(batch) >= 5000:
+                self._add_rows(schema.name, batch)
+                batch = []
+        self._add_rows(schema.name, batch)
+
+    def _add_rows(self, name, rows):
+        with self._lock:
+            index = self._indexes.get(name)
+            if index is not None:
+                for row in rows:
+                    index.add(row[0], row[1:])
+
+    # --- reconstruire în fundal (import CSV: ids=None) ---------------------
+    # Jobul rulează pe un thread propriu, ca request-ul de import să nu aștepte indexarea.
+    # Cheile modificate între timp de /update, /delete sunt reîncărcate după job, ca
+    # instantaneul citit de job să nu le suprascrie cu valori vechi.
+
+    def _mark_dirty(self, name, pks):
+        dirty = self._running.get(name)
+        if dirty is not None:
+            dirty.update(pks)
+
+    def in_background(self, app, schema, after_id=None):
+        name = schema.name
+        with self._lock:
+            if name in self._running:
+                self._pending.add(name)  # jobul curent poate fi ratat schimbarea: încă o reconstruire
+                return
+            self._running[name] = set()
+
+        def run():
+            with app.app_context():
+                try:
+                    if after_id is not None:
+                        self.add_after(schema, after_id)
+                    else:
+                        self.build(schema)
+                    with self._lock:
+                        dirty = self._running.pop(name)
+                    if dirty:
+                        self.refresh(schema, dirty)
+                except Exception as e:
+                    db.session.rollback()
+                    with self._lock:
+                        self._running.pop(name, None)
+                    log.warning("Text search (%s): reindexarea '%s' a eșuat: %s", self.name, name, e)
+                finally:
+                    db.session.remove()
+            with self._lock:
+                again = name in self._pending
+                self._pending.discard(name)
+            if again:
+                self.in_background(app, schema)
+
+        thread = threading.Thread(target=run, name=f"text-search-{name}", daemon=True)
+        self._threads[name] = thread
+        thread.start()
+
+    def wait(self, timeout=None):
+        """Așteaptă joburile din fundal (benchmark-uri, teste)."""
+        for thread in list(self._threads.values()):
+            thread.join(timeout)
+
+    def _maybe_compact(self, name, index):
+        if index.deleted > 1000 and index.deleted > len(index.ordinals):
+            self._indexes[name] = index.compacted()
+
+    def criterion(self, schema, term, bind, bound=0):
+        index = self._indexes.get(schema.name)
+        budget = self.max_ids - bound - 1  # -1: parametrul ILIKE pentru coloanele neindexate
+        if index is None or budget <= 0 or any(w in term for w in LIKE_WILDCARDS):
+            return None
+        with self._lock:
+            ids = index.search(fold(term), budget)
+        if ids is None:
+            return None
+        return ("text", "ids", bind(ids), bind(f"%{term}%"))
+
+    def build_clause(self, schema, entry):
+        _, _, p_ids, p_like = entry
+        like = bindparam(p_like)
+        indexed = self._columns(schema)
+        # candidații din index, confirmați de ILIKE; coloanele text neindexate rămân pe ILIKE
+        clause = and_(schema.primary_key.in_(bindparam(p_ids, expanding=True)),
+                      or_(*[c.ilike(like) for c in indexed]))
+        uncovered = [c for c in schema.string_columns if c not in indexed]
+        if uncovered:
+            clause = or_(clause, *[c.ilike(like) for c in uncovered])
+        return clause
+
+    def on_rows_changed(self, schema, op, ids, after_id=None):
+        if schema.name not in self._indexes:
+            return
+        if ids is None:
+            # import CSV: doar rândurile noi dacă se știe de unde încep, altfel tot tabelul
+            self.in_background(current_app._get_current_object(), schema,
+                               after_id if op == "insert" else None)
+        elif op == "delete":
+            self.remove(schema, ids)
+        else:
+            self.refresh(schema, ids)
+
+
+class FullTextBackend:
+    """CONTAINS((coloane), '"termen*"') — căutare după prefix de cuvânt, nu subșir."""
+
+    name = "fulltext"
+
+    def __init__(self, tables):
+        self.tables = tables
+        self._available = set()
+
+    def build(self, schema):
+        available = db.session.execute(
+            text("SELECT OBJECTPROPERTY(OBJECT_ID(:t), 'TableHasActiveFulltextIndex')"),
+            {"t": schema.table.name}
+        ).scalar()
+        if available:
+            self._available.add(schema.name)
+        return bool(available)
+
+    def criterion(self, schema, term, bind, bound=0):
+        if schema.name not in self._available:
+            return None
+        return ("text", "fts", bind('"' + term.replace('"', '""') + '*"'))
+
+    def build_clause(self, schema, entry):
+        configured = self.tables.get(schema.name)
+        columns = [c.name for c in schema.string_columns if not configured or c.key in configured]
+        return text(f"CONTAINS(({', '.join(columns)}), :{entry[2]})")
+
+    def on_rows_changed(self, schema, op, ids, after_id=None):
+        pass  # SQL Server întreține singur indexul full-text
+
+
+def create_backend():
+    backend = get_setting('text_search.backend', 'trigram')
+    tables = get_setting('text_search.tables', {}) or {}
+    if backend == "trigram":
+        return TrigramBackend(tables, get_setting('text_search.max_ids', 2000))
+    if backend == "fulltext":
+        return FullTextBackend(tables)
+    return None
+
+
+def init_text_search(app):
+    """Construiește indexul la pornire și îl leagă de query_plan și de rows_changed."""
+    backend = create_backend()
+    if backend is None:
+        return None
+
+    with app.app_context():
+        for name in backend.tables:
+            schema = query_plan.get_schema(name)
+            if not schema:
+                continue
+            try:
+                result = backend.build(schema)
+                print(Fore.GREEN + f"Text search ({backend.name}) pentru '{name}': {result}")
+            except Exception as e:
+                db.session.rollback()
+                print(Fore.RED + f"Text search ({backend.name}) indisponibil pentru '{name}': {e}")
+            finally:
+                db.session.remove()
+
+    # receptor la nivel de modul: conectat o singură dată oricâte aplicații se construiesc,
+    # folosește mereu backend-ul curent
+    rows_changed.connect(_rows_changed)
+    query_plan.text_backend = backend
+    return backend
+
+
+def _rows_changed(sender, op, ids=None, after_id=None, **extra):
+    backend = query_plan.text_backend
+    schema = query_plan.get_schema(sender)
+    if backend is not None and schema and sender in backend.tables:
+        backend.on_rows_changed(schema, op, ids, after_id)
@@ -0,0 +1,57 @@
+# bench_add.py — POST /add: INSERT în masă cu RETURNING vs. add() + flush() per rând
+#
+#   python benchmarks/bench_add.py --sizes 1 100 10000
+import argparse
+import json
+import time
+
+from common import make_app, product_rows
+from Modules.DBConn import db
+from Modules.SQLModels import Product
+from Modules.bulk import insertable, insert_rows_returning
+
+
+def legacy_loop(rows):
+    ids = []
+    for obj in rows:
+        instance = Product(**obj)
+        db.session.add(instance)
+        db.session.flush()
+        ids.append(instance.id)
+    return ids
+
+
+def bulk(rows):
+    return insert_rows_returning(Product, [insertable(Product, r) for r in rows])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--db", default="sqlite:///bench_add.db")
+    args = parser.parse_args()
+
+    app = make_app(args.db)
+    results = []
+    with app.app_context():
+        for size in args.sizes:
+            payload = [dict(r, id=None) for r in product_rows(size)]
+            for name, fn in (("legacy", legacy_loop), ("bulk", bulk)):
+                best = None
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    ids = fn(payload)
+                    db.session.commit()
+                    elapsed = time.perf_counter() - start
+                    assert len(ids) == size
+                    best = elapsed if best is None else min(best, elapsed)
+                results.append({
+                    "rows": size, "mode": name, "best_ms": round(best * 1000, 2),
+                    "rows_per_sec": round(size / best, 1),
+                })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# bench_catalogue.py — /data/lista_camere și /data/detalii_camera: număr de query-uri + timp
+#
+# Numărul de query-uri trebuie să rămână constant oricâte camere are un tip
+# (fără N+1); scriptul se oprește cu AssertionError dacă nu e așa.
+# Aceleași aserțiuni rulează în tests/test_catalogue.py (pytest).
+#
+#   python benchmarks/bench_catalogue.py --tipuri 50 --camere 200
+import argparse
+import json
+import statistics
+import time
+
+from sqlalchemy import event
+
+from common import make_app, seed_rooms
+from Modules.DBConn import db
+from Modules.response_cache import response_cache
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+
+def measure(client, counter, path, repeat):
+    timings, queries = [], set()
+    for _ in range(repeat):
+        response_cache.invalidate("camere", "camere_detalii", "disponibilitate")
+        counter.count = 0
+        start = time.perf_counter()
+        response = client.get(path)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.data
+        queries.add(counter.count)
+    assert len(queries) == 1, f"{path}: număr variabil de query-uri {queries}"
+    return {"path": path, "queries": queries.pop(), "median_ms": round(statistics.median(timings), 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tipuri", type=int, default=50)
+    parser.add_argument("--camere", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--db", default="sqlite:///bench_catalogue.db")
+    args = parser.parse_args()
+
+    app = make_app(args.db)
+    seed_rooms(app, args.tipuri, args.camere)
+    client = app.test_client()
+    with app.app_context():
+        counter = QueryCounter(db.engine)
+
+    lista = measure(client, counter, "/data/lista_camere", args.repeat)
+    disponibilitate = measure(client, counter, "/data/lista_camere?disponibilitate=true", args.repeat)
+    detalii = measure(client, counter, "/data/detalii_camera/T0", args.repeat)
+
+    assert lista["queries"] == 1, lista
+    assert disponibilitate["queries"] == 2, disponibilitate
+    assert detalii["queries"] == 1, detalii
+
+    camere = client.get("/data/lista_camere?disponibilitate=true").get_json()
+    assert camere[0]["Total"] == args.camere
+    assert camere[0]["Libere"] == sum(1 for c in range(args.camere) if c % 3 != 0)
+
+    print(json.dumps({
+        "tipuri": args.tipuri, "camere_pe_tip": args.camere,
+        "results": [lista, disponibilitate, detalii]
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
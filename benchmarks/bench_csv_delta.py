@@ -0,0 +1,69 @@
+# bench_csv_delta.py — GET /csv/products complet vs. incremental (since_id / since_version)
+#
+#   python benchmarks/bench_csv_delta.py --rows 200000 --changes 100
+#
+# După exportul complet se inserează, actualizează și șterg `changes` rânduri prin API;
+# exportul incremental trebuie să conțină exact delta, indiferent de mărimea tabelului.
+import argparse
+import csv
+import io
+import json
+import os
+import time
+
+from common import make_app, auth_headers, seed_products
+from Modules.changelog import init_changelog
+from Modules.misc import config
+
+DB_URI = "sqlite:///bench_csv_delta.db"
+
+
+def export(client, headers, query=""):
+    start = time.perf_counter()
+    response = client.get(f"/csv/products{query}", headers=headers)
+    elapsed = time.perf_counter() - start
+    assert response.status_code == 200, response.data[:200]
+    rows = list(csv.reader(io.StringIO(response.data.decode("utf-8"))))[1:]
+    return rows, response.headers.get("X-Next-Watermark"), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--changes", type=int, default=100)
+    args = parser.parse_args()
+
+    # fără fereastra de siguranță a watermark-ului: delta trebuie să fie exact modificările
+    os.environ["APP_CSV__WATERMARK_WINDOW"] = "0"
+    config.reload()
+
+    app = make_app(DB_URI)
+    init_changelog(app)
+    seed_products(app, args.rows)
+    headers = auth_headers(app)
+    client = app.test_client()
+
+    rows, since_version, full_s = export(client, headers)
+    assert len(rows) == args.rows
+    since_id = f"since_id={args.rows}"
+
+    n = args.changes
+    new = [{"nume": f"nou {i}", "brand": "b", "model": "m", "pret": 1, "categorie": "c"} for i in range(n)]
+    assert client.post("/add/products", json=new, headers=headers).status_code == 201
+    updates = [{"filter": {"id": i}, "update": {"pret": 1}} for i in range(1, n + 1)]
+    assert client.put("/update", json={"products": updates}, headers=headers).status_code == 200
+    deletes = [{"filter": {"id": i}} for i in range(n + 1, 2 * n + 1)]
+    assert client.delete("/delete", json={"products": deletes}, headers=headers).status_code == 200
+
+    results = [{"mode": "complet", "rows": len(rows), "ms": round(full_s * 1000, 1)}]
+    for query, expected in ((since_id, n), (since_version, 3 * n)):
+        delta, next_watermark, elapsed = export(client, headers, f"?{query}")
+        assert len(delta) == expected, (query, len(delta))
+        results.append({"mode": query.split("=")[0], "rows": len(delta), "ms": round(elapsed * 1000, 1),
+                        "next": next_watermark})
+
+    print(json.dumps({"table_rows": args.rows, "changes": n, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# bench_csv_export.py — export CSV streaming vs. varianta veche (StringIO + BytesIO)
+#
+#   python benchmarks/bench_csv_export.py --rows 200000
+#
+# Fiecare mod rulează într-un proces separat, ca vârful RSS să fie măsurat izolat.
+import argparse
+import csv
+import io
+import json
+import subprocess
+import sys
+import time
+
+from common import make_app, auth_headers, seed_products, peak_rss_mb
+
+DB_URI = "sqlite:///bench_csv_export.db"
+
+
+def legacy_export(table_name):
+    """Calea dinainte: Model.query.all() -> dict-uri -> StringIO -> BytesIO."""
+    from flask import send_file
+    from Modules.SQLModels import MODEL_MAP
+    from Modules.misc import SENSITIVE_FIELDS
+
+    Model = MODEL_MAP[table_name]
+    sensitive_fields = SENSITIVE_FIELDS.get(table_name, [])
+    rows = [
+        {col: getattr(item, col) for col in item.__table__.columns.keys() if col not in sensitive_fields}
+        for item in Model.query.all()
+    ]
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=list(rows[0].keys()))
+    writer.writeheader()
+    writer.writerows(rows)
+    return send_file(io.BytesIO(output.getvalue().encode("utf-8")), mimetype="text/csv")
+
+
+def run_mode(mode):
+    from Modules.DBConn import db
+
+    app = _open_app()
+    headers = auth_headers(app)
+    base_rss = peak_rss_mb()
+
+    start = time.perf_counter()
+    if mode == "legacy":
+        with app.test_request_context():
+            response = legacy_export("products")
+            body = iter(response.response)
+            first = next(body)
+            ttfb = time.perf_counter() - start
+            size = len(first) + sum(len(b) for b in body)
+    else:
+        response = app.test_client().get("/csv/products", headers=headers, buffered=False)
+        body = iter(response.response)
+        first = next(body)
+        ttfb = time.perf_counter() - start
+        size = len(first) + sum(len(b) for b in body)
+        response.close()
+    total = time.perf_counter() - start
+
+    with app.app_context():
+        db.session.remove()
+    return {
+        "mode": mode,
+        "ttfb_ms": round(ttfb * 1000, 1),
+        "total_ms": round(total * 1000, 1),
+        "bytes": size,
+        "rss_base_mb": base_rss,
+        "rss_peak_mb": peak_rss_mb(),
+    }
+
+
+def _open_app():
+    """Aplicația pe baza de date deja populată (fără drop/create)."""
+    from flask import Flask
+    from Modules.DBConn import db
+    from Modules.file_IO import CSV_IO
+    from Modules.api import api
+    from Modules.jwt_utils import init_jwt
+
+    app = Flask("bench")
+    app.config["SQLALCHEMY_DATABASE_URI"] = DB_URI
+    app.config["JWT_SECRET_KEY"] = "bench-secret-key-bench-secret-key!"
+    app.register_blueprint(api, url_prefix="/")
+    app.register_blueprint(CSV_IO, url_prefix="/csv")
+    db.init_app(app)
+    init_jwt(app)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--mode", choices=["legacy", "stream"])
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode)))
+        return
+
+    app = make_app(DB_URI)
+    seed_products(app, args.rows)
+    results = []
+    for mode in ("legacy", "stream"):
+        out = subprocess.run([sys.executable, __file__, "--mode", mode],
+                             capture_output=True, text=True, check=True)
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    print(json.dumps({"rows": args.rows, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# bench_delete.py — DELETE set-based pe loturi vs. query.all() + session.delete()
+#
+#   python benchmarks/bench_delete.py --rows 20000
+#
+# "lock_hold_ms" = de la primul statement de scriere până la COMMIT, adică
+# intervalul în care tranzacția ține lock-uri exclusive.
+import argparse
+import json
+import time
+
+from sqlalchemy import event
+
+from common import make_app, seed_products
+from Modules.DBConn import db
+from Modules.SQLModels import Product
+from Modules.api import delete_matching, filter_conditions
+
+
+class WriteWindow:
+    def __init__(self, engine):
+        self.first_write = None
+        self.statements = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements += 1
+        if self.first_write is None and statement.lstrip().upper().startswith(("DELETE", "UPDATE")):
+            self.first_write = time.perf_counter()
+
+    def reset(self):
+        self.first_write = None
+        self.statements = 0
+
+
+def legacy(criteria):
+    items = db.session.query(Product).filter(*filter_conditions(Product, criteria)).all()
+    ids = []
+    for item in items:
+        ids.append(item.id)
+        db.session.delete(item)
+    return ids
+
+
+def set_based(criteria):
+    return delete_matching(Product, filter_conditions(Product, criteria))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--db", default="sqlite:///bench_delete.db")
+    args = parser.parse_args()
+
+    criteria = {"status": "testare"}
+    results = []
+    for name, fn in (("legacy", legacy), ("set_based", set_based)):
+        app = make_app(args.db)
+        seed_products(app, args.rows)
+        with app.app_context():
+            window = WriteWindow(db.engine)
+            start = time.perf_counter()
+            ids = fn(criteria)
+            db.session.commit()
+            end = time.perf_counter()
+            results.append({
+                "mode": name,
+                "deleted": len(ids),
+                "latency_ms": round((end - start) * 1000, 1),
+                "lock_hold_ms": round((end - window.first_write) * 1000, 1),
+                "statements": window.statements,
+            })
+            db.session.remove()
+            db.engine.dispose()
+    print(json.dumps({"rows": args.rows, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
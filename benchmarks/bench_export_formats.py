@@ -0,0 +1,56 @@
+# bench_export_formats.py — GET /csv/products în fiecare format: bytes pe fir și timp CPU
+#
+#   python benchmarks/bench_export_formats.py --rows 1000000
+#
+# Fiecare format e descărcat integral prin clientul de test (streaming, fără buffer);
+# timpul CPU e cel al procesului (interogare + serializare + compresie);
+# raport_bytes e relativ la primul format din --formats (implicit csv).
+import argparse
+import json
+import time
+
+from common import make_app, auth_headers, seed_products
+from Modules.export_formats import EXPORT_FORMATS, pyarrow
+
+DB_URI = "sqlite:///bench_export_formats.db"
+
+
+def download(client, headers, fmt):
+    cpu, wall = time.process_time(), time.perf_counter()
+    response = client.get(f"/csv/products?format={fmt}", headers=headers, buffered=False)
+    assert response.status_code == 200, response.status_code
+    size = sum(len(b) for b in response.response)
+    response.close()
+    return size, time.process_time() - cpu, time.perf_counter() - wall
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--formats", nargs="+", default=list(EXPORT_FORMATS))
+    args = parser.parse_args()
+
+    app = make_app(DB_URI)
+    seed_products(app, args.rows)
+    headers = auth_headers(app)
+    client = app.test_client()
+
+    results = []
+    baseline = None
+    for fmt in args.formats:
+        if fmt == "arrow" and pyarrow is None:
+            results.append({"format": fmt, "eroare": "pyarrow nu este instalat"})
+            continue
+        size, cpu, wall = download(client, headers, fmt)
+        baseline = baseline or size
+        results.append({
+            "format": fmt, "bytes": size, "raport_bytes": round(size / baseline, 3),
+            "cpu_s": round(cpu, 2), "wall_s": round(wall, 2),
+            "rows_per_cpu_sec": round(args.rows / cpu, 1) if cpu else None,
+        })
+
+    print(json.dumps({"rows": args.rows, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
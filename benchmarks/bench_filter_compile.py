@@ -0,0 +1,88 @@
+# bench_filter_compile.py — costul construirii clauzelor WHERE pentru /search
+#
+#   python benchmarks/bench_filter_compile.py --iterations 20000
+#
+# "legacy" reface clasificarea str(c.type) la fiecare filtru (ca înainte);
+# "compiled" folosește registry-ul de schemă + plan_cache (formă deja văzută).
+# Variantele "+sql" includ și generarea cheii de cache SQLAlchemy (compilare o dată).
+import argparse
+import json
+import time
+
+import common  # noqa: F401  (sys.path / cwd)
+from sqlalchemy import and_, or_, select
+from sqlalchemy.dialects import mssql
+from Modules.SQLModels import Product
+from Modules.query_plan import compile_filter, get_schema, plan_cache
+
+FILTER = {"string": {"like": "lenovo"}, "number": {"min": 10, "max": 5000}, "status": "activ"}
+
+
+def legacy(model, f):
+    conditions = []
+    for col, val in f.items():
+        if col == "string":
+            like_val = val.get("like", val).lower()
+            conditions.append(or_(*[model.__dict__[c.name].ilike(f"%{like_val}%")
+                                    for c in model.__table__.columns
+                                    if str(c.type).startswith("VARCHAR")]))
+            continue
+        if col == "number":
+            num_cols = [c.name for c in model.__table__.columns
+                        if "INT" in str(c.type).upper() or "FLOAT" in str(c.type).upper()
+                        or "DECIMAL" in str(c.type).upper()]
+            num_conditions = []
+            for nc in num_cols:
+                column = getattr(model, nc)
+                num_conditions.append(column >= val["min"])
+                num_conditions.append(column <= val["max"])
+            conditions.append(and_(*num_conditions))
+            continue
+        conditions.append(getattr(model, col) == val)
+    return select(model).where(and_(*conditions))
+
+
+def compiled(schema, f):
+    clauses, params = compile_filter(schema, f)
+    return select(schema.model).where(*clauses), params
+
+
+def timeit(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    schema = get_schema("products")
+    dialect = mssql.dialect()
+    cache = {}
+
+    results = {
+        "legacy_us": timeit(lambda: legacy(Product, FILTER), args.iterations),
+        "compiled_us": timeit(lambda: compiled(schema, FILTER), args.iterations),
+        "legacy+sql_us": timeit(
+            lambda: _cached_compile(legacy(Product, FILTER), dialect, cache), args.iterations),
+        "compiled+sql_us": timeit(
+            lambda: _cached_compile(compiled(schema, FILTER)[0], dialect, cache), args.iterations),
+    }
+    results = {k: round(v, 2) for k, v in results.items()}
+    results["plan_cache"] = plan_cache.stats()
+    print(json.dumps(results, indent=2))
+
+
+def _cached_compile(stmt, dialect, cache):
+    """Ca în Engine: cheia de cache a statement-ului → compilat o singură dată."""
+    key = stmt._generate_cache_key().key
+    if key not in cache:
+        cache[key] = stmt.compile(dialect=dialect)
+    return cache[key]
+
+
+if __name__ == "__main__":
+    main()
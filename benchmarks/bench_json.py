@@ -0,0 +1,93 @@
+# bench_json.py — /search/products cu 100k rânduri: jsonify stdlib vs. FastJSONProvider vs. NDJSON
+#
+#   python benchmarks/bench_json.py --rows 100000
+#
+# Fiecare mod rulează într-un proces separat, ca vârful RSS să fie măsurat izolat.
+# Limita de pagină e ridicată din mediu (APP_LIMITS__...) ca un singur răspuns să conțină tot.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from common import make_app, auth_headers, seed_products, peak_rss_mb
+
+DB_URI = "sqlite:///bench_json.db"
+MODES = ("stdlib", "fast", "ndjson")
+
+
+def run_mode(mode, rows):
+    from flask import Flask
+    from Modules.DBConn import db
+    from Modules.api import api
+    from Modules.jwt_utils import init_jwt
+    from Modules.json_provider import init_json, orjson
+
+    app = Flask("bench")
+    app.config["SQLALCHEMY_DATABASE_URI"] = DB_URI
+    app.config["JWT_SECRET_KEY"] = "bench-secret-key-bench-secret-key!"
+    app.register_blueprint(api, url_prefix="/")
+    db.init_app(app)
+    init_jwt(app)
+    if mode != "stdlib":
+        init_json(app)
+
+    headers = auth_headers(app)
+    if mode == "ndjson":
+        headers["Accept"] = "application/x-ndjson"
+    client = app.test_client()
+    base_rss = peak_rss_mb()
+
+    start = time.perf_counter()
+    response = client.get(f"/search/products?limit={rows}", headers=headers, buffered=False)
+    body = iter(response.response)
+    first = next(body)
+    ttfb = time.perf_counter() - start
+    size = len(first) + sum(len(b) for b in body)
+    response.close()
+    total = time.perf_counter() - start
+    assert response.status_code == 200
+
+    with app.app_context():
+        db.session.remove()
+    return {
+        "mode": mode,
+        "encoder": "orjson" if mode != "stdlib" and orjson else "json",
+        "ttfb_ms": round(ttfb * 1000, 1),
+        "total_ms": round(total * 1000, 1),
+        "rows_per_sec": round(rows / total, 1),
+        "bytes": size,
+        "rss_base_mb": base_rss,
+        "rss_peak_mb": peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--mode", choices=MODES)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.rows)))
+        return
+
+    app = make_app(DB_URI)
+    seed_products(app, args.rows)
+    auth_headers(app)
+
+    env = dict(os.environ,
+               APP_LIMITS__SEARCH__MAX=str(args.rows),
+               APP_LIMITS__SEARCH__STREAM_MAX=str(args.rows),
+               APP_LIMITS__SEARCH__TABLES__PRODUCTS__MAX=str(args.rows))
+    results = []
+    for mode in MODES:
+        out = subprocess.run([sys.executable, __file__, "--mode", mode, "--rows", str(args.rows)],
+                             capture_output=True, text=True, check=True, env=env)
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    print(json.dumps({"rows": args.rows, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# bench_multi_filter.py — /search cu o listă de filtre: un query per filtru vs. un singur OR
+#
+#   python benchmarks/bench_multi_filter.py --rows 50000 --filters 1 5 10 50
+#
+# Verifică și echivalența: rândurile întoarse = calea veche fără duplicate.
+import argparse
+import json
+import random
+import statistics
+import time
+
+from sqlalchemy import func, select
+
+from common import make_app, seed_products, BRANDS, CATEGORII
+from Modules.DBConn import db
+from Modules.query_plan import compile_filter, compile_filters, get_schema
+
+
+def make_filters(n, seed=7):
+    rnd = random.Random(seed)
+    filters = []
+    for _ in range(n):
+        kind = rnd.choice(("brand", "pret", "categorie"))
+        if kind == "brand":
+            filters.append({"brand": rnd.choice(BRANDS), "garantie": {"min": 24}})
+        elif kind == "pret":
+            low = rnd.uniform(10, 9000)
+            filters.append({"pret": {"min": low, "max": low + 200}})
+        else:
+            filters.append({"categorie": rnd.choice(CATEGORII), "status": "activ"})
+    return filters
+
+
+def legacy(schema, filters):
+    ids = []
+    for f in filters:
+        clauses, params = compile_filter(schema, f)
+        ids.extend(db.session.execute(select(schema.primary_key).where(*clauses), params).scalars())
+    return ids
+
+
+def single_query(schema, filters):
+    clauses, params = compile_filters(schema, filters)
+    return db.session.execute(select(schema.primary_key).where(*clauses), params).scalars().all()
+
+
+def single_count(schema, filters):
+    clauses, params = compile_filters(schema, filters)
+    return db.session.execute(
+        select(func.count()).select_from(schema.table).where(*clauses), params).scalar()
+
+
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(timings), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--filters", type=int, nargs="+", default=[1, 5, 10, 25, 50])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--db", default="sqlite:///bench_multi_filter.db")
+    args = parser.parse_args()
+
+    app = make_app(args.db)
+    seed_products(app, args.rows)
+    results = []
+    with app.app_context():
+        schema = get_schema("products")
+        for n in args.filters:
+            filters = make_filters(n)
+            old_ids = legacy(schema, filters)
+            new_ids = single_query(schema, filters)
+            assert sorted(new_ids) == sorted(set(old_ids)), "rezultate diferite"
+            assert single_count(schema, filters) == len(new_ids)
+            results.append({
+                "filters": n,
+                "rows_legacy": len(old_ids),
+                "rows_unique": len(new_ids),
+                "legacy_ms": timed(lambda: legacy(schema, filters), args.repeat),
+                "single_query_ms": timed(lambda: single_query(schema, filters), args.repeat),
+            })
+    print(json.dumps({"rows": args.rows, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
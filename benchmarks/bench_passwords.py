@@ -0,0 +1,136 @@
+# bench_passwords.py — /login în rafală vs. latența /search, cu hashing inline sau în pool de procese
+#
+# Serverul HTTP are un număr fix de "workeri" (--worker-threads, ca thread-urile gunicorn).
+# Inline, fiecare /login ține un worker ocupat cât durează hash-ul, deci /search așteaptă.
+# Cu pool-ul, cel mult `max_pending` login-uri sunt în lucru; restul primesc 503 imediat
+# și workerii rămân liberi pentru /search.
+#
+#   python benchmarks/bench_passwords.py --duration 5 --login-threads 8 --worker-threads 4
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from common import make_app, auth_headers, seed_products
+from Modules import passwords
+from Modules.DBConn import db
+from Modules.SQLModels import User
+
+PAROLA = "bench-parola"
+
+
+class LimitedWorkers:
+    """Middleware WSGI: cel mult n request-uri procesate simultan (restul așteaptă un worker)."""
+
+    def __init__(self, app, n):
+        self.app = app
+        self.slots = threading.Semaphore(n)
+
+    def __call__(self, environ, start_response):
+        with self.slots:
+            return [b"".join(self.app(environ, start_response))]
+
+
+class QuietHandler(WSGIRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def configure(mode, workers, max_pending):
+    passwords.shutdown()
+    passwords.WORKERS = 0 if mode == "inline" else workers
+    passwords._slots = threading.BoundedSemaphore(max_pending)
+
+
+def load(port, duration, login_threads, search_threads, headers):
+    stop = time.perf_counter() + duration
+    logins = {"ok": 0, "503": 0, "alte": 0}
+    search_ms = []
+    lock = threading.Lock()
+
+    def login_worker():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+        body = json.dumps({"username": "bench_login", "password": PAROLA})
+        while time.perf_counter() < stop:
+            conn.request("POST", "/login", body=body, headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            key = "ok" if response.status == 200 else "503" if response.status == 503 else "alte"
+            with lock:
+                logins[key] += 1
+            if response.status == 503:
+                time.sleep(0.01)  # clientul respectă Retry-After, nu bate în buclă
+
+    def search_worker():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            conn.request("GET", "/search/products?brand=Dell&limit=20", headers=headers)
+            response = conn.getresponse()
+            response.read()
+            assert response.status == 200, response.status
+            with lock:
+                search_ms.append((time.perf_counter() - t0) * 1000)
+
+    threads = ([threading.Thread(target=login_worker) for _ in range(login_threads)] +
+               [threading.Thread(target=search_worker) for _ in range(search_threads)])
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    q = statistics.quantiles(search_ms, n=100) if len(search_ms) > 1 else [0] * 99
+    return {
+        "logins_pe_secunda": round(logins["ok"] / duration, 1),
+        "logins": logins,
+        "search_cereri": len(search_ms),
+        "search_p50_ms": round(q[49], 2),
+        "search_p95_ms": round(q[94], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--login-threads", type=int, default=8)
+    parser.add_argument("--search-threads", type=int, default=2)
+    parser.add_argument("--worker-threads", type=int, default=4)
+    parser.add_argument("--pool-workers", type=int, default=2)
+    parser.add_argument("--max-pending", type=int, default=2)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--db", default="sqlite:///bench_passwords.db")
+    args = parser.parse_args()
+
+    app = make_app(args.db)
+    seed_products(app, args.rows)
+    headers = auth_headers(app)
+    with app.app_context():
+        db.session.add(User(username="bench_login", nume="Login", email="login@bench.ro",
+                            password=passwords.generate_password_hash(PAROLA, passwords.METHOD),
+                            role="Client", is_active=True))
+        db.session.commit()
+
+    server = make_server("127.0.0.1", 0, LimitedWorkers(app, args.worker_threads),
+                         threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    results = {"metoda": passwords.METHOD, "worker_threads": args.worker_threads}
+    configure("inline", args.pool_workers, args.max_pending)
+    results["fara_login"] = load(server.server_port, args.duration, 0, args.search_threads, headers)
+    for mode in ("inline", "pool"):
+        configure(mode, args.pool_workers, args.max_pending)
+        results[mode] = load(server.server_port, args.duration, args.login_threads,
+                             args.search_threads, headers)
+    server.shutdown()
+    passwords.shutdown()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# bench_projection.py — /search/products cu și fără `fields` (proiecție SQL)
+#
+#   python benchmarks/bench_projection.py --rows 50000 --limit 500
+import argparse
+import json
+import statistics
+import time
+
+from common import make_app, auth_headers, seed_products
+
+
+def measure(client, headers, query, repeat):
+    timings, size = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(f"/search/products?{query}", headers=headers)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.data
+        size = len(response.data)
+    return {"query": query, "bytes": size, "median_ms": round(statistics.median(timings), 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--db", default="sqlite:///bench_projection.db")
+    args = parser.parse_args()
+
+    app = make_app(args.db)
+    seed_products(app, args.rows)
+    headers = auth_headers(app)
+    client = app.test_client()
+
+    results = [
+        measure(client, headers, f"limit={args.limit}", args.repeat),
+        measure(client, headers, f"limit={args.limit}&fields=id,nume,pret", args.repeat),
+    ]
+    print(json.dumps({"rows": args.rows, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
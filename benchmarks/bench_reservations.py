@@ -0,0 +1,93 @@
+# bench_reservations.py — rezervări concurente pe SQLite: fără dublă rezervare + rezervări/s
+#
+# Fiecare thread încearcă să rezerve TOATE camerele (în ordine aleatoare), deci
+# fiecare cameră e disputată de toate thread-urile. La final fiecare cameră trebuie
+# să aibă exact o rezervare reușită; altfel scriptul se oprește cu AssertionError.
+#
+#   python benchmarks/bench_reservations.py --camere 500 --threads 8 --batch 5
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+
+from common import make_app, auth_headers, seed_rooms
+from Modules.SQLModels import CameraDisponibila
+
+
+def run(app, headers, ids, threads, batch):
+    """Toate thread-urile pornesc deodată; întoarce (rezervări reușite, status-uri, durată)."""
+    reusite = Counter()
+    statusuri = Counter()
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+
+    def worker(seed):
+        client = app.test_client()
+        ordine = list(ids)
+        random.Random(seed).shuffle(ordine)
+        barrier.wait()
+        for i in range(0, len(ordine), batch):
+            grup = ordine[i:i + batch]
+            if batch == 1:
+                response = client.post("/data/rezerva_camera", headers=headers, json={
+                    "camera_id": "T0", "camera_disponibila_id": grup[0]
+                })
+            else:
+                response = client.post("/data/rezerva_camere", headers=headers, json={
+                    "camere": [{"camera_id": "T0", "camera_disponibila_id": id} for id in grup]
+                })
+            with lock:
+                statusuri[response.status_code] += 1
+                if response.status_code == 200:
+                    reusite.update(grup)
+
+    workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return reusite, statusuri, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--camere", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--batch", type=int, default=1, help="1 = /rezerva_camera, >1 = /rezerva_camere")
+    parser.add_argument("--db", default="sqlite:///bench_reservations.db?timeout=30")
+    args = parser.parse_args()
+
+    app = make_app(args.db)
+    seed_rooms(app, 1, args.camere, toate_libere=True)
+    headers = auth_headers(app, "Client")
+    ids = [f"T0-{i}" for i in range(args.camere)]
+
+    reusite, statusuri, durata = run(app, headers, ids, args.threads, args.batch)
+
+    duble = {id: n for id, n in reusite.items() if n > 1}
+    assert not duble, f"Camere rezervate de mai multe ori: {duble}"
+    with app.app_context():
+        libere = CameraDisponibila.query.filter_by(Libera=True).count()
+    assert libere + len(reusite) == args.camere, (libere, len(reusite))
+    if args.batch == 1:
+        assert len(reusite) == args.camere, f"{args.camere - len(reusite)} camere nerezervate"
+
+    incercari = sum(statusuri.values())
+    print(json.dumps({
+        "camere": args.camere,
+        "threads": args.threads,
+        "batch": args.batch,
+        "rezervate": len(reusite),
+        "ramase_libere": libere,
+        "status": {str(k): v for k, v in sorted(statusuri.items())},
+        "durata_s": round(durata, 3),
+        "cereri_pe_secunda": round(incercari / durata, 1),
+        "rezervari_pe_secunda": round(len(reusite) / durata, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
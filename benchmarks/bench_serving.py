@@ -0,0 +1,114 @@
+# bench_serving.py — `python server.py` (app.run) vs. gunicorn: timp de pornire și cereri/s
+#
+# Ambele pornesc ca procese separate pe același SQLite și aceleași certificate
+# TLS din ssl_context; clientul e un generator de încărcare cu thread-uri și keep-alive.
+#
+#   python benchmarks/bench_serving.py --duration 10 --concurrency 16 --workers 4
+import argparse
+import http.client
+import json
+import os
+import shutil
+import signal
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from common import ROOT
+
+SSL = ssl._create_unverified_context()
+
+
+def wait_ready(port, path, proc, limit=60):
+    start = time.perf_counter()
+    while time.perf_counter() - start < limit:
+        if proc.poll() is not None:
+            raise RuntimeError(f"serverul s-a oprit la pornire (cod {proc.returncode})")
+        try:
+            conn = http.client.HTTPSConnection("127.0.0.1", port, timeout=2, context=SSL)
+            conn.request("GET", path)
+            if conn.getresponse().status == 200:
+                return time.perf_counter() - start
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("serverul nu a răspuns la timp")
+
+
+def load(port, path, concurrency, duration):
+    counts, errors = [0] * concurrency, [0] * concurrency
+    stop = time.perf_counter() + duration
+
+    def worker(n):
+        conn = http.client.HTTPSConnection("127.0.0.1", port, timeout=30, context=SSL)
+        while time.perf_counter() < stop:
+            try:
+                conn.request("GET", path)
+                response = conn.getresponse()
+                response.read()
+                counts[n] += response.status == 200
+                errors[n] += response.status != 200
+            except (OSError, http.client.HTTPException):
+                errors[n] += 1
+                conn.close()
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return {"cereri_pe_secunda": round(sum(counts) / duration, 1), "erori": sum(errors)}
+
+
+def run(name, command, env, port, args):
+    proc = subprocess.Popen(command, cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        startup = wait_ready(port, args.path, proc)
+        result = {"server": name, "pornire_s": round(startup, 2)}
+        result.update(load(port, args.path, args.concurrency, args.duration))
+        return result
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8543)
+    parser.add_argument("--path", default="/data/lista_camere")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_serving_")
+    env = dict(os.environ,
+               APP_DB__URI=f"sqlite:///{os.path.join(tmp, 'serving.db')}?timeout=30",
+               APP_SERVER__BIND=f"127.0.0.1:{args.port}",
+               APP_SERVER__WORKERS=str(args.workers),
+               APP_SERVER__THREADS=str(args.threads),
+               APP_LOGGING__LEVEL="WARNING")
+
+    results = [run("app.run", [sys.executable, "server.py"], env, args.port, args)]
+    if shutil.which("gunicorn"):
+        results.append(run(f"gunicorn ({args.workers}x{args.threads})",
+                           ["gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"], env, args.port, args))
+    else:
+        results.append({"server": "gunicorn", "eroare": "gunicorn nu este instalat"})
+    shutil.rmtree(tmp, ignore_errors=True)
+
+    print(json.dumps({
+        "path": args.path, "concurrency": args.concurrency, "duration_s": args.duration,
+        "cpu": os.cpu_count(), "results": results
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
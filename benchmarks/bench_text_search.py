@@ -0,0 +1,80 @@
+# bench_text_search.py — criteriul "string" din /search: index trigram vs. ILIKE '%x%'
+#
+#   python benchmarks/bench_text_search.py --rows 100000
+#
+# Verifică și că ambele căi întorc exact aceleași rânduri.
+import argparse
+import json
+import statistics
+import time
+
+from common import make_app, auth_headers, seed_products, peak_rss_mb
+from Modules import query_plan
+from Modules.text_search import init_text_search
+
+TERMS = ["lenovo produs 4242", "m512", "xiaomi", "periferice", "produs 9999", "zzz"]
+
+
+def search(client, headers, term):
+    body = {"string": {"like": term}, "fields": ["id"], "count_only": False}
+    response = client.get("/search/products", json=body, headers=headers)
+    assert response.status_code == 200, response.data
+    return response.json["products"]
+
+
+def measure(client, headers, repeat):
+    out = {}
+    for term in TERMS:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = search(client, headers, term)
+            timings.append((time.perf_counter() - start) * 1000)
+        out[term] = {"median_ms": round(statistics.median(timings), 2),
+                     "ids": [r["id"] for r in result["results"]]}
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--db", default="sqlite:///bench_text_search.db")
+    args = parser.parse_args()
+
+    app = make_app(args.db)
+    seed_products(app, args.rows)
+    headers = auth_headers(app)
+    client = app.test_client()
+
+    like = measure(client, headers, args.repeat)
+
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    init_text_search(app)
+    build_s = time.perf_counter() - start
+    rss_after = peak_rss_mb()
+
+    trigram = measure(client, headers, args.repeat)
+    query_plan.text_backend = None
+
+    results = []
+    for term in TERMS:
+        assert like[term]["ids"] == trigram[term]["ids"], f"rezultate diferite pentru {term!r}"
+        results.append({
+            "term": term,
+            "matches_in_page": len(like[term]["ids"]),
+            "ilike_ms": like[term]["median_ms"],
+            "trigram_ms": trigram[term]["median_ms"],
+        })
+    print(json.dumps({
+        "rows": args.rows,
+        "index_build_s": round(build_s, 2),
+        "rss_before_mb": rss_before,
+        "rss_after_index_mb": rss_after,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
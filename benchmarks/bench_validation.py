@@ -0,0 +1,92 @@
+# bench_validation.py — validare DTO: un model per rând vs. validatorul list[DTO] precompilat
+#
+#   python benchmarks/bench_validation.py --rows 10000
+#
+# Măsoară doar validarea (rânduri/s), apoi POST /add și POST /csv/products cap-coadă pe același lot.
+import argparse
+import csv
+import io
+import json
+import time
+
+from common import make_app, auth_headers, product_rows
+from Modules.DTOs import ProductDTO, validate_rows
+
+
+def payload(n):
+    # ca într-un body JSON: fără id; data_adaugare lipsește (SQLite Date nu acceptă string-uri)
+    return [{k: v for k, v in r.items() if k != "data_adaugare"} | {"id": None} for r in product_rows(n)]
+
+
+def per_row(rows):
+    return [ProductDTO(**obj).model_dump() for obj in rows]
+
+
+def batch(rows):
+    valid, errors = validate_rows("products", rows)
+    assert not errors
+    return valid
+
+
+def best_of(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def as_csv(rows):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows({k: "" if v is None else v for k, v in r.items()} for r in rows)
+    return out.getvalue().encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--db", default="sqlite:///bench_validation.db")
+    args = parser.parse_args()
+
+    rows = payload(args.rows)
+    assert per_row(rows) == batch(rows)  # același rezultat, rând cu rând
+
+    # erori per index, în formatul de la /add
+    bad = rows[:3] + [dict(rows[0], pret=-1), {"nume": "fara restul"}]
+    valid, errors = validate_rows("products", bad)
+    assert len(valid) == 3 and [e["index"] for e in errors] == [3, 4]
+    assert errors[0]["error"][0]["loc"] == ("pret",)
+    json.dumps(errors, default=str)
+
+    results = []
+    for name, fn in (("per_row", per_row), ("batch", batch)):
+        best = best_of(lambda: fn(rows), args.repeat)
+        results.append({"mode": name, "best_ms": round(best * 1000, 2),
+                        "rows_per_sec": round(args.rows / best, 1)})
+
+    app = make_app(args.db)
+    headers = auth_headers(app)
+    client = app.test_client()
+    body = as_csv(rows)
+    for name, call in (
+        ("POST /add", lambda: client.post("/add/products", json=rows, headers=headers)),
+        ("POST /csv", lambda: client.post("/csv/products", headers=headers, content_type="multipart/form-data",
+                                          data={"file": (io.BytesIO(body), "products.csv")})),
+    ):
+        start = time.perf_counter()
+        response = call()
+        elapsed = time.perf_counter() - start
+        assert response.status_code in (200, 201), response.get_json()
+        results.append({"mode": name, "best_ms": round(elapsed * 1000, 2),
+                        "rows_per_sec": round(args.rows / elapsed, 1)})
+
+    print(json.dumps({"rows": args.rows, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+# common.py — căi pentru benchmark-uri; aplicația și datele de test vin din Modules/testing.py (ca în tests/)
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+os.chdir(ROOT)  # settings.json se citește relativ la rădăcina proiectului
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from Modules import testing
+from Modules.testing import (BRANDS, CATEGORII, STATUSURI, auth_headers, product_rows,  # noqa: F401
+                             seed_products, seed_rooms)
+
+
+def make_app(uri="sqlite:///bench.db"):
+    return testing.make_app(uri, "bench")
+
+
+def peak_rss_mb():
+    """Vârful RSS al procesului curent (MB); None pe platforme fără `resource`."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
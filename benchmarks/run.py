@@ -0,0 +1,371 @@
+# run.py — suita de benchmark: server.py pe un SQLite populat, scenarii pe toate endpoint-urile
+#
+#   python benchmarks/run.py --size 1k                                 # Flask test client
+#   python benchmarks/run.py --size 100k --mode http --concurrency 16  # server HTTP + thread-uri
+#   python benchmarks/run.py --size 100k --save-baseline baseline.json
+#   python benchmarks/run.py --size 100k --compare baseline.json --tolerance 0.15
+#
+# Rezultatul e JSON (p50/p95/p99 în ms, cereri/s, vârful RSS). Cu --compare, fiecare
+# scenariu e comparat cu baseline-ul: p50/p95 mai mari sau throughput mai mic decât
+# toleranța sunt raportate ca regresii și scriptul iese cu codul 1.
+import argparse
+import contextlib
+import http.client
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import threading
+import time
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import create_engine, insert, func, select
+from werkzeug.security import generate_password_hash
+
+from common import product_rows, peak_rss_mb, BRANDS, CATEGORII
+from Modules.misc import config
+from Modules.SQLModels import (db, Product, Stock, Order, OrderProduct, User,
+                               Camera, CameraDisponibila)
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1M": 1_000_000}
+DEPOZITE = ["Cluj", "Iasi", "Timisoara", "Bucuresti", "Brasov"]
+PAROLA = "bench-parola"
+
+
+# -------------------------------------------------------------------------
+# Date
+# -------------------------------------------------------------------------
+def seed(uri, products, batch=10_000, seed=42):
+    """Produse, stoc (1/produs), comenzi (1/10 produse), useri și camere; idempotent pe dimensiune."""
+    engine = create_engine(uri)
+    with engine.connect() as conn:
+        db.metadata.create_all(conn)
+        existing = conn.execute(select(func.count()).select_from(Product.__table__)).scalar()
+        conn.commit()
+    if existing == products:
+        engine.dispose()
+        return False
+
+    rnd = random.Random(seed)
+    orders = max(products // 10, 1)
+    users = min(max(products // 100, 10), 10_000)
+    with engine.begin() as conn:
+        db.metadata.drop_all(conn)
+        db.metadata.create_all(conn)
+
+        def chunks(rows):
+            rows = iter(rows)
+            while True:
+                chunk = list(itertools.islice(rows, batch))
+                if not chunk:
+                    return
+                yield chunk
+
+        for chunk in chunks(product_rows(products, seed=seed)):
+            conn.execute(insert(Product.__table__), chunk)
+        for chunk in chunks({
+            "id": i, "produs_id": i, "cantitate": rnd.randint(0, 500), "depozit": rnd.choice(DEPOZITE)
+        } for i in range(1, products + 1)):
+            conn.execute(insert(Stock.__table__), chunk)
+
+        fast_hash = generate_password_hash("x", method="pbkdf2:sha256:1000")
+        conn.execute(insert(User.__table__), [
+            {"id": i, "username": f"user{i}", "nume": f"User {i}", "email": f"user{i}@bench.ro",
+             "password": fast_hash, "role": "Client", "is_active": True}
+            for i in range(1, users + 1)
+        ])
+        # userii benchmark-ului: parola cu metoda implicită, ca /login să coste cât în producție
+        conn.execute(insert(User.__table__), [
+            {"id": users + 1, "username": "bench_admin", "nume": "Admin", "email": "admin@bench.ro",
+             "password": generate_password_hash(PAROLA), "role": "Administrator", "is_active": True},
+        ])
+        for chunk in chunks({
+            "id": i, "client_id": rnd.randint(1, users), "data_comanda": date(2024, 1, 1),
+            "status": rnd.choice(["noua", "platita", "livrata"])
+        } for i in range(1, orders + 1)):
+            conn.execute(insert(Order.__table__), chunk)
+        for chunk in chunks({
+            "order_id": i, "produs_id": p, "cantitate": rnd.randint(1, 5), "pret_unitate": 100
+        } for i in range(1, orders + 1) for p in rnd.sample(range(1, products + 1), min(3, products))):
+            conn.execute(insert(OrderProduct.__table__), chunk)
+
+        conn.execute(insert(Camera.__table__), [
+            {"Id": tip, "Nume": tip, "Pret": 100 * (i + 1), "Moneda": "RON", "Descriere": "Cameră " * 20}
+            for i, tip in enumerate(("SGL", "DBL", "APT"))
+        ])
+        conn.execute(insert(CameraDisponibila.__table__), [
+            {"Id": f"{tip}-{n}", "CameraId": tip, "Libera": True}
+            for tip in ("SGL", "DBL", "APT") for n in range(50)
+        ])
+    engine.dispose()
+    return True
+
+
+# -------------------------------------------------------------------------
+# Scenarii: fiecare întoarce (metodă, cale, corp, content-type) pentru iterația i
+# -------------------------------------------------------------------------
+def _json(method, path, payload):
+    return method, path, json.dumps(payload).encode("utf-8"), "application/json"
+
+
+def _multipart(field, filename, content):
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"{field}\"; filename=\"{filename}\"\r\n"
+        f"Content-Type: text/csv\r\n\r\n"
+    ).encode("utf-8") + content + f"\r\n--{boundary}--\r\n".encode("utf-8")
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def build_scenarios(products):
+    stock_ids = itertools.count(products, -1)       # /delete consumă stocul de la coadă
+    csv_rows = 500
+
+    def csv_import(i):
+        rnd = random.Random(i)
+        lines = ["produs_id,cantitate,depozit"] + [
+            f"{rnd.randint(1, products)},{rnd.randint(0, 100)},{rnd.choice(DEPOZITE)}"
+            for _ in range(csv_rows)
+        ]
+        body, content_type = _multipart("file", "stock.csv", "\n".join(lines).encode("utf-8"))
+        return "POST", "/csv/stock", body, content_type
+
+    # nume: (cerere(i), necesită token, multiplicator de iterații)
+    return {
+        "search_eq": (lambda i: ("GET", f"/search/products?brand={BRANDS[i % len(BRANDS)]}&limit=50", None, None), True, 1.0),
+        "search_text": (lambda i: ("GET", f"/search/products?string={BRANDS[i % len(BRANDS)].lower()}&limit=50", None, None), True, 1.0),
+        "search_multi": (lambda i: _json("GET", "/search", {
+            # opțiunile (limit) stau lângă filtre; la nivelul de sus orice cheie e un tabel
+            "products": {"filters": [{"categorie": CATEGORII[i % len(CATEGORII)]}, {"pret": {"min": 100, "max": 500}}],
+                         "limit": 50},
+            "orders": {"filters": [{"status": "platita"}], "limit": 50}
+        }), True, 1.0),
+        "add": (lambda i: _json("POST", "/add/products", [
+            dict(row, id=None, data_adaugare=None) for row in product_rows(5, start=products + 1 + i * 5)
+        ]), True, 0.5),
+        "update": (lambda i: _json("PUT", "/update/products", {
+            "filter": {"id": random.Random(i).randint(1, products)}, "update": {"pret": 10 + i % 1000}
+        }), True, 0.5),
+        "delete": (lambda i: _json("DELETE", "/delete/stock", {"filter": {"id": next(stock_ids)}}), True, 0.5),
+        "csv_export": (lambda i: ("GET", "/csv/stock", None, None), True, 0.05),
+        "csv_import": (csv_import, True, 0.1),
+        "login": (lambda i: _json("POST", "/login", {"username": "bench_admin", "password": PAROLA}), False, 0.1),
+        "data_lista": (lambda i: ("GET", "/data/lista_camere?disponibilitate=true", None, None), False, 1.0),
+        "data_detalii": (lambda i: ("GET", f"/data/detalii_camera/{('SGL', 'DBL', 'APT')[i % 3]}", None, None), False, 1.0),
+    }
+
+
+# -------------------------------------------------------------------------
+# Drivere: Flask test client (secvențial) și HTTP (thread-uri, keep-alive)
+# -------------------------------------------------------------------------
+def run_client(app, build, token, iterations):
+    client = app.test_client()
+    timings, errors = [], 0
+    start = time.perf_counter()
+    for i in range(iterations):
+        method, path, body, content_type = build(i)
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        if content_type:
+            headers["Content-Type"] = content_type
+        t0 = time.perf_counter()
+        response = client.open(path, method=method, headers=headers, data=body)
+        response.get_data()  # consumă și răspunsurile streamed
+        timings.append(time.perf_counter() - t0)
+        errors += response.status_code >= 400
+    return timings, errors, time.perf_counter() - start
+
+
+def start_http_server(app):
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class KeepAliveHandler(WSGIRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, name="bench-http", daemon=True).start()
+    return server
+
+
+def run_http(port, build, token, concurrency, duration, max_requests):
+    timings, errors = [], 0
+    lock = threading.Lock()
+    counter = itertools.count()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        nonlocal errors
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        local, local_errors = [], 0
+        while time.perf_counter() < deadline:
+            i = next(counter)
+            if i >= max_requests:
+                break
+            method, path, body, content_type = build(i)
+            headers = {"Authorization": f"Bearer {token}"} if token else {}
+            if content_type:
+                headers["Content-Type"] = content_type
+            t0 = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                local_errors += response.status >= 400
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            local.append(time.perf_counter() - t0)
+        conn.close()
+        with lock:
+            timings.extend(local)
+            errors += local_errors
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return timings, errors, time.perf_counter() - start
+
+
+def summarize(timings, errors, elapsed):
+    ms = sorted(t * 1000 for t in timings)
+    if not ms:
+        return {"requests": 0, "errors": errors}
+    q = statistics.quantiles(ms, n=100, method="inclusive") if len(ms) > 1 else [ms[0]] * 99
+    return {
+        "requests": len(ms),
+        "errors": errors,
+        "p50_ms": round(q[49], 3),
+        "p95_ms": round(q[94], 3),
+        "p99_ms": round(q[98], 3),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "throughput_rps": round(len(ms) / elapsed, 1) if elapsed else None,
+    }
+
+
+# -------------------------------------------------------------------------
+# Comparare cu baseline
+# -------------------------------------------------------------------------
+def compare(current, baseline, tolerance):
+    """Lista de diferențe pe scenariu; regresie = p50/p95 mai mari sau throughput mai mic peste toleranță."""
+    report = []
+    for name, now in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        for metric, higher_is_worse in (("p50_ms", True), ("p95_ms", True), ("throughput_rps", False)):
+            old, new = before.get(metric), now.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            regression = change > tolerance if higher_is_worse else change < -tolerance
+            report.append({
+                "scenario": name, "metric": metric, "baseline": old, "current": new,
+                "change_pct": round(change * 100, 1), "regression": regression,
+            })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", choices=SIZES, default="1k")
+    parser.add_argument("--mode", choices=("client", "http"), default="client")
+    parser.add_argument("--scenarios", nargs="+", help="implicit: toate")
+    parser.add_argument("--iterations", type=int, default=200, help="cereri per scenariu (× multiplicatorul lui)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="secunde per scenariu în modul http")
+    parser.add_argument("--db", default=None, help="implicit: copie a bench_run_<size>.db.seed din rădăcina proiectului")
+    parser.add_argument("--out", help="scrie rezultatul și în acest fișier")
+    parser.add_argument("--save-baseline", help="salvează rezultatul ca baseline")
+    parser.add_argument("--compare", help="baseline JSON cu care se compară")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+
+    products = SIZES[args.size]
+    if args.db:
+        uri = args.db
+        seeded = seed(uri, products)
+    else:
+        # baza populată o dată (șablon) e copiată la fiecare rulare: scenariile de scriere
+        # nu schimbă datele rulării următoare, deci rezultatele rămân comparabile
+        # (cale absolută: Flask-SQLAlchemy ar pune o cale relativă în instance/)
+        working = os.path.abspath(f"bench_run_{args.size}.db")
+        seeded = seed(f"sqlite:///{working}.seed", products)
+        shutil.copyfile(f"{working}.seed", working)
+        uri = f"sqlite:///{working}?timeout=30"
+
+    # server.py citește db.uri din config: suprascrierea din mediu îl mută pe SQLite
+    os.environ["APP_DB__URI"] = uri
+    config.reload()
+    with contextlib.redirect_stdout(sys.stderr):  # mesajele de pornire nu intră în JSON
+        from server import create_app
+        app = create_app()
+
+    with app.test_client() as client:
+        login = client.post("/login", json={"username": "bench_admin", "password": PAROLA})
+        assert login.status_code == 200, login.data
+        token = login.get_json()["access_token"]
+
+    scenarios = build_scenarios(products)
+    selected = args.scenarios or list(scenarios)
+    unknown = [s for s in selected if s not in scenarios]
+    if unknown:
+        parser.error(f"scenarii necunoscute: {', '.join(unknown)}")
+
+    http_server = start_http_server(app) if args.mode == "http" else None
+    results = {}
+    for name in selected:
+        build, needs_auth, weight = scenarios[name]
+        iterations = max(int(args.iterations * weight), 1)
+        if http_server:
+            timings, errors, elapsed = run_http(http_server.server_port, build, token if needs_auth else None,
+                                                args.concurrency, args.duration, iterations)
+        else:
+            timings, errors, elapsed = run_client(app, build, token if needs_auth else None, iterations)
+        results[name] = summarize(timings, errors, elapsed)
+    if http_server:
+        http_server.shutdown()
+
+    output = {
+        "meta": {
+            "size": args.size,
+            "products": products,
+            "seeded": seeded,
+            "mode": args.mode,
+            "concurrency": args.concurrency if args.mode == "http" else 1,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+        },
+        "scenarios": results,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            report = compare(output, json.load(f), args.tolerance)
+        output["comparison"] = report
+        output["regressions"] = [r for r in report if r["regression"]]
+        exit_code = 1 if output["regressions"] else 0
+
+    text = json.dumps(output, indent=2, ensure_ascii=False)
+    print(text)
+    for path in filter(None, (args.out, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# gunicorn.conf.py — server de producție: master + workeri pre-fork, TLS din ssl_context
+#
+#   gunicorn -c gunicorn.conf.py wsgi:app
+#
+# preload_app: aplicația (settings, MODEL_MAP / SCHEMA_REGISTRY, indexul text, cache-uri)
+# e construită o dată în master; workerii o primesc prin fork (copy-on-write).
+# Conexiunile din pool deschise de master nu se împart cu workerii: post_fork le abandonează.
+#
+# Restart grațios: `kill -HUP <master>` pornește workeri noi și le lasă pe cele vechi
+# `graceful_timeout` secunde să termine request-urile în curs. Cu preload_app, codul
+# nou se încarcă prin USR2 (master nou) urmat de TERM către masterul vechi.
+import os
+
+from Modules.misc import get_setting
+
+bind = get_setting('server.bind', '127.0.0.1:5000')
+# Un singur worker implicit: cache-urile (răspunsuri, principal JWT, planuri) și indexul
+# text sunt per proces și se invalidează doar în procesul care a făcut modificarea.
+# Concurența vine din thread-uri. Mai mulți workeri: vezi README (cache.responses.backend=redis).
+workers = get_setting('server.workers') or 1
+threads = get_setting('server.threads', 4)
+worker_class = "gthread" if threads > 1 else "sync"
+keepalive = get_setting('server.keepalive', 5)
+backlog = get_setting('server.backlog', 2048)
+timeout = get_setting('server.timeout', 60)
+graceful_timeout = get_setting('server.graceful_timeout', 30)
+max_requests = get_setting('server.max_requests', 0)
+max_requests_jitter = get_setting('server.max_requests_jitter', 0)
+preload_app = True
+
+_cert, _key = get_setting('ssl_context.cert'), get_setting('ssl_context.key')
+if get_setting('server.tls', True) and _cert and _key and os.path.exists(_cert):
+    certfile, keyfile = _cert, _key
+
+
+def post_fork(server, worker):
+    """Fiecare worker își deschide propriile conexiuni DB (cele moștenite aparțin masterului)."""
+    from Modules.DBConn import db
+
+    app = worker.app.wsgi()
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    server.log.info("Worker %s: pool-ul DB resetat după fork", worker.pid)
+
+
+def worker_int(worker):
+    worker.log.info("Worker %s: oprire cerută, se termină request-urile în curs", worker.pid)
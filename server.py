@@ -1,26 +1,51 @@
 from flask import Flask
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
-from Modules.misc import SSL_CONTEXT,JWT_SECRET_KEY
+from Modules.misc import SSL_CONTEXT,JWT_SECRET_KEY,config,get_setting
 from Modules.api import api
 from Modules.Auth import auth
 from Modules.frontend_site import frontend_site
 from Modules.file_IO import CSV_IO
 from Modules.DBConn import init_db
 from Modules.jwt_utils import init_jwt
-app = Flask(__name__)
-CORS(app)
-app.config['DEBUG'] = False
+from Modules.text_search import init_text_search
+from Modules.metrics import init_metrics
+from Modules.logs import setup_logging
+from Modules.json_provider import init_json
+from Modules.changelog import init_changelog
+
+
+def create_app():
+    """
+    Construiește aplicația: blueprint-uri, DB (pool încălzit), ChangeLog, JWT, index text, metrici.
+    Apelată doar de wsgi.py (gunicorn, preload_app: o dată în master, înainte de fork)
+    și de `python server.py`; importul modulului nu construiește nimic.
+    """
+    setup_logging()
+    config.start_watcher()  # reîncarcă settings.json la modificare
+    app = Flask(__name__)
+    init_json(app)
+    CORS(app)
+    app.config['DEBUG'] = False
+
+    app.register_blueprint(api, url_prefix="/")
+    app.register_blueprint(auth, url_prefix="/")
+    app.register_blueprint(frontend_site, url_prefix="/data")
+    app.register_blueprint(CSV_IO, url_prefix="/csv")
+
+    app.config['JWT_SECRET_KEY'] = JWT_SECRET_KEY
+    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = 3600  # o ora
+    JWTManager(app)
+    init_db(app)
+    init_changelog(app)
+    init_jwt(app)
+    init_text_search(app)
+    init_metrics(app)
+    return app
 
-app.register_blueprint(api, url_prefix="/")
-app.register_blueprint(auth, url_prefix="/")
-app.register_blueprint(frontend_site, url_prefix="/data")
-app.register_blueprint(CSV_IO, url_prefix="/csv")
 
-app.config['JWT_SECRET_KEY'] = JWT_SECRET_KEY 
-app.config['JWT_ACCESS_TOKEN_EXPIRES'] = 3600  # o ora
-jwt = JWTManager(app)
-init_db(app)
-init_jwt(app)
 if __name__ == '__main__':
-  app.run(ssl_context=SSL_CONTEXT)
\ No newline at end of file
+  # server de dezvoltare (un proces); în producție: gunicorn -c gunicorn.conf.py wsgi:app
+  app = create_app()
+  host, _, port = get_setting('server.bind', '127.0.0.1:5000').rpartition(':')
+  app.run(host=host or None, port=int(port), ssl_context=SSL_CONTEXT)
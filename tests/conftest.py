@@ -0,0 +1,33 @@
+# conftest.py — aplicație Flask pe SQLite (fișier temporar per test); helper-ele sunt în Modules/testing.py
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+os.chdir(ROOT)  # settings.json se citește relativ la rădăcina proiectului
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from Modules.DBConn import db
+from Modules.testing import make_app, auth_headers
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = make_app(f"sqlite:///{tmp_path / 'test.db'}", "tests")
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def headers(app):
+    return auth_headers(app)
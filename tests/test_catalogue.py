@@ -0,0 +1,49 @@
+# test_catalogue.py — /data/lista_camere și /data/detalii_camera: număr constant de query-uri (fără N+1)
+import pytest
+from sqlalchemy import event
+
+from Modules.DBConn import db
+from Modules.response_cache import response_cache
+from Modules.testing import seed_rooms
+
+TIPURI = 5
+
+
+def count_queries(app, client, path):
+    """Numărul de query-uri trimise la DB de un GET, fără cache de răspuns."""
+    response_cache.invalidate("camere", "camere_detalii", "disponibilitate")
+    statements = []
+
+    def on_execute(*args, **kwargs):
+        statements.append(args[2])
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        response = client.get(path)
+        assert response.status_code == 200, response.data
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    return len(statements), response.get_json()
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/data/lista_camere", 1),
+    ("/data/lista_camere?disponibilitate=true", 2),
+    ("/data/detalii_camera/T0", 1),
+])
+@pytest.mark.parametrize("camere", [1, 30])
+def test_query_count_does_not_grow_with_rooms(app, client, path, expected, camere):
+    seed_rooms(app, TIPURI, camere)
+    queries, _ = count_queries(app, client, path)
+    assert queries == expected
+
+
+def test_availability_counts(app, client):
+    seed_rooms(app, TIPURI, 30)
+    _, camere = count_queries(app, client, "/data/lista_camere?disponibilitate=true")
+    assert len(camere) == TIPURI
+    for camera in camere:
+        assert camera["Total"] == 30
+        assert camera["Libere"] == sum(1 for c in range(30) if c % 3 != 0)
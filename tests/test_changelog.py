@@ -0,0 +1,83 @@
+# test_changelog.py — ChangeLog scris în aceeași tranzacție cu datele
+import io
+
+import pytest
+from sqlalchemy import func, select
+
+from Modules import changelog
+from Modules.DBConn import db
+from Modules.SQLModels import ChangeLog, Product, Stock
+from Modules.testing import seed_products
+
+
+@pytest.fixture
+def app(app, monkeypatch):
+    monkeypatch.setattr(changelog, "_enabled", True)
+    return app
+
+
+def logged(app, table="products"):
+    with app.app_context():
+        return db.session.execute(
+            select(ChangeLog.RowId, ChangeLog.Op).where(ChangeLog.TableName == table).order_by(ChangeLog.Version)
+        ).all()
+
+
+def new_products(n):
+    return [{"nume": f"nou {i}", "brand": "b", "model": "m", "pret": 1, "categorie": "c"} for i in range(n)]
+
+
+def test_crud_is_logged(app, client, headers):
+    ids = client.post("/add/products", json=new_products(2), headers=headers).get_json()["ids"]
+    client.put("/update", json={"products": [{"filter": {"id": ids[0]}, "update": {"pret": 2}}]}, headers=headers)
+    client.delete("/delete", json={"products": [{"filter": {"id": ids[1]}}]}, headers=headers)
+    assert logged(app) == [(str(ids[0]), "insert"), (str(ids[1]), "insert"),
+                           (str(ids[0]), "update"), (str(ids[1]), "delete")]
+
+
+def test_failed_commit_keeps_neither_data_nor_log(app, client, headers, monkeypatch):
+    def failing_commit():
+        raise RuntimeError("commit eșuat")
+
+    with monkeypatch.context() as m:
+        m.setattr(db.session, "commit", failing_commit)
+        assert client.post("/add/products", json=new_products(2), headers=headers).status_code == 500
+
+    with app.app_context():
+        assert db.session.scalar(select(func.count()).select_from(Product)) == 0
+    assert logged(app) == []
+
+
+@pytest.mark.parametrize("table, header, line, expected", [
+    ("products", "nume,brand,model,pret,categorie", "csv {i},b,m,1,c", [str(i) for i in range(6, 13)]),
+    # cheie text: o notificare fără chei pentru fiecare commit (loturi de 3, 3 și 1 rânduri)
+    ("camera", "Id,Nume,Pret,Moneda,Imagine,Descriere", "C{i},Tip,100,RON,img.png,d", [None] * 3),
+])
+def test_csv_import_commits_log_each_row_once(app, client, headers, table, header, line, expected):
+    seed_products(app, 5)
+    lines = [header] + [line.format(i=i) for i in range(7)]
+    response = client.post(f"/csv/{table}", headers=headers, content_type="multipart/form-data", data={
+        "file": (io.BytesIO("\n".join(lines).encode("utf-8")), f"{table}.csv"),
+        "commit_every": "3",
+    })
+    assert response.status_code == 200, response.data
+    assert response.get_json()["reusite"] == 7
+    assert [row_id for row_id, _ in logged(app, table)] == expected
+
+    export = client.get(f"/csv/{table}?since_version=0", headers=headers)
+    assert export.status_code == 200, export.data
+    assert len(export.data.decode("utf-8").strip().splitlines()) == 1 + 7
+
+
+def test_delete_logs_detached_children(app, client, headers):
+    seed_products(app, 3)
+    with app.app_context():
+        db.session.add_all([Stock(produs_id=p, cantitate=1, depozit="D") for p in (1, 1, 2, 3)])
+        db.session.commit()
+
+    assert client.delete("/delete", json={"products": [{"filter": {"id": {"max": 2}}}]},
+                         headers=headers).status_code == 200
+    assert logged(app, "products") == [("1", "delete"), ("2", "delete")]
+    assert sorted(logged(app, "stock")) == [("1", "update"), ("2", "update"), ("3", "update")]
+    with app.app_context():
+        assert db.session.scalars(select(Stock.id).where(Stock.produs_id.is_(None))).all() == [1, 2, 3]
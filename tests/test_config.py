@@ -0,0 +1,91 @@
+# test_config.py — reîncărcarea settings.json: valori invalide, watcher, callback-uri
+import json
+import os
+import shutil
+import time
+
+import pytest
+
+from Modules import misc, passwords
+from Modules.caching import TTLCache
+
+
+@pytest.fixture
+def settings_file(tmp_path, monkeypatch):
+    path = tmp_path / "settings.json"
+    shutil.copyfile(misc.SETTINGS_FILE, path)
+    monkeypatch.setattr(misc, "SETTINGS_FILE", path)
+    return path
+
+
+def write(path, change):
+    data = json.loads(path.read_text(encoding="utf-8"))
+    change(data)
+    path.write_text(json.dumps(data), encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))  # mtime sigur diferit
+
+
+def test_invalid_value_keeps_previous_config(settings_file):
+    cfg = misc.Config(settings_file)
+    pool, data = cfg.pool, cfg.data
+
+    write(settings_file, lambda d: d["db"]["pool"].update(size=None))  # int(None) → TypeError
+    assert cfg.reload_if_changed() is False
+    assert cfg.pool is pool and cfg.data is data
+    assert cfg.reload_if_changed() is False  # același fișier invalid nu e reîncercat
+
+    write(settings_file, lambda d: d["db"]["pool"].update(size=3))
+    assert cfg.reload_if_changed() is True
+    assert cfg.pool.size == 3
+
+
+def test_watcher_survives_bad_reload(settings_file):
+    cfg = misc.Config(settings_file)
+    cfg.start_watcher(0.02)
+    try:
+        write(settings_file, lambda d: d["cache"]["principal"].update(max_size="multe"))
+        time.sleep(0.1)
+        assert cfg._watcher.is_alive()
+        write(settings_file, lambda d: d["cache"]["principal"].update(max_size=7))
+        deadline = time.monotonic() + 2
+        while cfg.cache.principal_max_size != 7 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert cfg.cache.principal_max_size == 7
+    finally:
+        cfg.stop_watcher()
+
+
+def test_callbacks_run_after_reload(settings_file):
+    cfg = misc.Config(settings_file)
+    cache = TTLCache(max_size=10, ttl=60)
+    for i in range(10):
+        cache.set(i, i)
+
+    def fails(_):
+        raise RuntimeError("callback stricat")
+
+    cfg.on_reload(fails)  # nu oprește callback-urile următoare
+    cfg.on_reload(lambda c: cache.resize(c.cache.search_plans_max_size, 5))
+    write(settings_file, lambda d: d["cache"]["search_plans"].update(max_size=4))
+    assert cfg.reload_if_changed() is True
+
+    assert cache.max_size == 4 and cache.ttl == 5
+    assert len(cache) == 4 and cache.get(9) == 9 and cache.get(0) is None
+
+
+def test_password_pool_follows_settings(monkeypatch):
+    settings = {"passwords.workers": 0, "passwords.max_pending": 3, "passwords.method": "pbkdf2:sha256:1000"}
+
+    class FakeConfig:
+        def get(self, key, default=None):
+            return settings.get(key, default)
+
+    try:
+        passwords._apply_settings(FakeConfig())
+        assert passwords._get_executor() is None  # workers=0: calcul inline
+        assert passwords.verify_password(passwords.hash_password("x"), "x")
+        assert passwords.METHOD == "pbkdf2:sha256:1000"
+    finally:
+        passwords._apply_settings(misc.config)
+    assert passwords.WORKERS == misc.config.get('passwords.workers', 2)
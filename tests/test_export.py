@@ -0,0 +1,167 @@
+# test_export.py — GET /csv/<table>: watermark-uri și formate (csv, csv.gz, ndjson, arrow)
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from werkzeug.datastructures import MIMEAccept
+
+from Modules import export_formats, file_IO
+from Modules.DBConn import db
+from Modules.SQLModels import Feedback
+from Modules.export_formats import FormatError, negotiate_format
+from Modules.testing import seed_products
+
+
+@pytest.fixture
+def window(monkeypatch):
+    original = file_IO.get_setting
+    settings = {"csv.watermark_window": 3, "csv.watermark_window_seconds": 300}
+    monkeypatch.setattr(file_IO, "get_setting", lambda key, default=None: settings.get(key, original(key, default)))
+    return settings
+
+
+def csv_rows(data):
+    return list(csv.DictReader(io.StringIO(data.decode("utf-8"))))
+
+
+def export_ids(client, headers, query=""):
+    r = client.get(f"/csv/products{query}", headers=headers)
+    assert r.status_code == 200, r.data
+    return [int(row["id"]) for row in csv_rows(r.data)], r.headers["X-Next-Watermark"]
+
+
+def test_next_watermark_keeps_a_safety_window(app, client, headers, window):
+    seed_products(app, 10)
+    ids, watermark = export_ids(client, headers)
+    assert len(ids) == 10 and watermark == "since_id=7"
+
+    # ultimele `window` chei revin la apelul următor (un commit întârziat cu cheie mică nu se pierde)
+    ids, watermark = export_ids(client, headers, f"?{watermark}")
+    assert ids == [8, 9, 10] and watermark == "since_id=7"
+
+
+def test_watermark_never_goes_back_past_since(app, client, headers, window):
+    seed_products(app, 10)
+    window["csv.watermark_window"] = 100
+    assert export_ids(client, headers, "?since_id=5") == ([6, 7, 8, 9, 10], "since_id=5")
+
+
+def add_feedback(app, *dates):
+    with app.app_context():
+        rows = [Feedback(Name="n", Email="e@x.ro", Message="m", DateSent=d) for d in dates]
+        db.session.add_all(rows)
+        db.session.commit()
+        return [row.Id for row in rows]
+
+
+def test_since_timestamp_keeps_a_time_window(app, client, headers, window):
+    t0 = datetime(2026, 1, 1, 12, 0, 0)
+    first = add_feedback(app, t0, t0 + timedelta(minutes=10))
+
+    r = client.get(f"/csv/feedback?since={(t0 - timedelta(hours=1)).isoformat()}", headers=headers)
+    assert sorted(int(row["Id"]) for row in csv_rows(r.data)) == first
+    until = t0 + timedelta(minutes=10)
+    assert r.headers["X-Next-Watermark"] == f"since={(until - timedelta(seconds=300)).isoformat()}"
+
+    # commit după export: un rând datat în urmă (în fereastră) și unul cu același timestamp ca `until`
+    late = add_feedback(app, until - timedelta(minutes=2), until)
+    r = client.get(f"/csv/feedback?{r.headers['X-Next-Watermark']}", headers=headers)
+    assert sorted(int(row["Id"]) for row in csv_rows(r.data)) == [first[1], *late]
+
+
+def test_since_timestamp_never_goes_back_past_since(app, client, headers, window):
+    t0 = datetime(2026, 1, 1, 12, 0, 0)
+    add_feedback(app, t0 + timedelta(seconds=30))
+    r = client.get(f"/csv/feedback?since={t0.isoformat()}", headers=headers)
+    assert r.headers["X-Next-Watermark"] == f"since={t0.isoformat()}"
+
+
+# ---------------------------------------------------------------------------
+# Formate: ?format= / Accept, csv.gz, ndjson, arrow
+# ---------------------------------------------------------------------------
+N_ROWS = 25
+
+
+@pytest.fixture
+def products(app):
+    seed_products(app, N_ROWS)
+    return app
+
+
+@pytest.mark.parametrize("args, accept, expected", [
+    ({}, [], "csv"),
+    ({"format": "ndjson"}, [], "ndjson"),
+    ({"format": "GZ"}, [], "csv.gz"),
+    ({"format": "jsonl"}, [("application/gzip", 1)], "ndjson"),  # ?format= are prioritate
+    ({}, [("application/x-ndjson", 1)], "ndjson"),
+    ({}, [("application/gzip", 1), ("text/csv", 0.5)], "csv.gz"),
+    ({}, [("application/json", 1)], "csv"),
+])
+def test_negotiate_format(args, accept, expected):
+    assert negotiate_format(args, MIMEAccept(accept)) == expected
+
+
+def test_unknown_format_is_400():
+    with pytest.raises(FormatError) as e:
+        negotiate_format({"format": "xml"}, MIMEAccept([]))
+    assert e.value.status == 400
+
+
+def test_arrow_without_pyarrow(monkeypatch):
+    monkeypatch.setattr(export_formats, "pyarrow", None)
+    with pytest.raises(FormatError) as e:
+        negotiate_format({"format": "arrow"}, MIMEAccept([]))
+    assert e.value.status == 406
+    # prin Accept: arrow nu mai e candidat, CSV-ul acceptat ca alternativă câștigă
+    accept = MIMEAccept([("application/vnd.apache.arrow.stream", 1), ("text/csv", 0.5)])
+    assert negotiate_format({}, accept) == "csv"
+
+
+def test_gzip_matches_csv(products, client, headers):
+    plain = client.get("/csv/products", headers=headers)
+    r = client.get("/csv/products?format=csv.gz", headers=headers)
+    assert r.status_code == 200
+    assert r.mimetype == "application/gzip"
+    assert "products.csv.gz" in r.headers["Content-Disposition"]
+    assert gzip.decompress(r.data) == plain.data
+    assert len(csv_rows(plain.data)) == N_ROWS
+
+
+def test_ndjson_matches_csv(products, client, headers):
+    expected = csv_rows(client.get("/csv/products", headers=headers).data)
+    r = client.get("/csv/products", headers={**headers, "Accept": "application/x-ndjson"})
+    assert r.status_code == 200
+    assert r.mimetype == "application/x-ndjson"
+    rows = [json.loads(line) for line in r.data.decode("utf-8").splitlines()]
+    assert len(rows) == N_ROWS
+    assert [row["id"] for row in rows] == [int(row["id"]) for row in expected]
+    assert rows[0]["nume"] == expected[0]["nume"]
+
+
+def test_empty_delta_in_every_format(products, client, headers):
+    for fmt in ("csv", "csv.gz", "ndjson"):
+        r = client.get(f"/csv/products?since_id={N_ROWS}&format={fmt}", headers=headers)
+        body = r.data  # citit integral: un răspuns streamed necitit ține contextul deschis
+        assert r.status_code == 200, (fmt, body)
+    assert gzip.decompress(client.get(f"/csv/products?since_id={N_ROWS}&format=csv.gz", headers=headers).data) \
+        .decode("utf-8").strip().startswith("id,")
+    assert client.get(f"/csv/products?since_id={N_ROWS}&format=ndjson", headers=headers).data == b""
+    assert csv_rows(client.get(f"/csv/products?since_id={N_ROWS}", headers=headers).data) == []
+
+
+def test_arrow(products, client, headers):
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+
+    r = client.get("/csv/products?format=arrow", headers=headers)
+    assert r.status_code == 200
+    assert r.mimetype == "application/vnd.apache.arrow.stream"
+    table = pyarrow.ipc.open_stream(r.data).read_all()
+    assert table.num_rows == N_ROWS
+    assert table.schema.field("id").type == pyarrow.int32()
+    assert not table.schema.field("id").nullable
+    assert table.schema.field("data_adaugare").type == pyarrow.date32()
+    assert table.column("id").to_pylist() == list(range(1, N_ROWS + 1))
@@ -0,0 +1,43 @@
+# test_fanout.py — /search pe mai multe tabele: dimensionarea executorului și timeout-ul per query
+import time
+
+from sqlalchemy import text
+
+from Modules.DBConn import db
+from Modules.fanout import fanout_workers, run_parallel
+
+SLOW_QUERY = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 100000000) "
+    "SELECT count(*) FROM c"
+)
+
+
+def slow_job():
+    return db.session.execute(SLOW_QUERY).scalar()
+
+
+def fast_job():
+    return db.session.execute(text("SELECT 1")).scalar()
+
+
+def test_workers_leave_room_for_request_threads(app, monkeypatch):
+    monkeypatch.setitem(app.config, "SQLALCHEMY_ENGINE_OPTIONS", {"pool_size": 10, "max_overflow": 20})
+    with app.app_context():
+        # 30 conexiuni - 4 thread-uri de request (server.threads) - 2 rezervate
+        assert fanout_workers(app, db.engine) == 24
+        monkeypatch.setitem(app.config, "SQLALCHEMY_ENGINE_OPTIONS", {"pool_size": 2, "max_overflow": 0})
+        assert fanout_workers(app, db.engine) == 1
+
+
+def test_running_query_is_interrupted_at_timeout(app):
+    with app.test_request_context():
+        started = time.monotonic()
+        results = run_parallel({"slow": (slow_job, ()), "fast": (fast_job, ())}, {"slow": 0.3, "fast": 5})
+        elapsed = time.monotonic() - started
+
+    assert results["fast"] == 1
+    assert "error" in results["slow"]
+    # executorul are un singur thread: al doilea apel trece doar dacă query-ul lent a fost oprit
+    with app.test_request_context():
+        assert run_parallel({"again": (fast_job, ())}) == {"again": 1}
+    assert elapsed < 5
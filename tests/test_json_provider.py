@@ -0,0 +1,59 @@
+# test_json_provider.py — FastJSONProvider scrie aceleași valori ca providerul implicit din Flask
+import datetime
+import decimal
+import json
+import types
+import uuid
+
+import pytest
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from Modules import json_provider
+from Modules.json_provider import FastJSONProvider, dumps_bytes, init_json
+
+VALUES = {
+    "data": datetime.date(2024, 1, 1),
+    "moment": datetime.datetime(2024, 1, 1, 10, 0, 0),
+    "pret": decimal.Decimal("1999.99"),
+    "cod": uuid.UUID(int=1),
+    "nume": "Laptop ăîșț",
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(json_provider, "orjson", None)
+    elif json_provider.orjson is None:
+        pytest.skip("orjson nu e instalat")
+    return request.param
+
+
+def test_response_matches_flask_default(backend):
+    fast, default = Flask("fast"), Flask("default")
+    init_json(fast)
+    with fast.app_context():
+        ours = json.loads(fast.json.response(VALUES).get_data())
+    with default.app_context():
+        flask_values = json.loads(default.json.response(VALUES).get_data())
+    assert ours == flask_values
+    assert ours["moment"] == "Mon, 01 Jan 2024 10:00:00 GMT"
+
+
+def test_iso_dates_for_exports(backend):
+    assert json.loads(dumps_bytes(VALUES, iso_dates=True))["moment"] == "2024-01-01T10:00:00"
+    assert json.loads(dumps_bytes(VALUES, iso_dates=True))["data"] == "2024-01-01"
+
+
+def test_sort_keys_follows_reload(monkeypatch):
+    monkeypatch.setattr(FastJSONProvider, "sort_keys", DefaultJSONProvider.sort_keys)
+    app = Flask("reload")
+    init_json(app)
+    settings = {"json.sort_keys": False}
+    json_provider._apply_settings(types.SimpleNamespace(get=lambda key, default=None: settings.get(key, default)))
+    assert app.json.dumps({"b": 1, "a": 2}) == '{"b":1,"a":2}'
+
+    settings["json.sort_keys"] = True
+    json_provider._apply_settings(types.SimpleNamespace(get=lambda key, default=None: settings.get(key, default)))
+    assert app.json.dumps({"b": 1, "a": 2}) == '{"a":2,"b":1}'
@@ -0,0 +1,39 @@
+# test_metrics.py — /metrics cere token sau JWT de Administrator
+import pytest
+
+import Modules.metrics as metrics
+from Modules.testing import auth_headers
+
+
+@pytest.fixture
+def app(app):
+    metrics.init_metrics(app)
+    return app
+
+
+def use_token(monkeypatch, token):
+    settings = {"metrics.token": token}
+    original = metrics.get_setting
+    monkeypatch.setattr(metrics, "get_setting", lambda key, default=None: settings.get(key, original(key, default)))
+
+
+def test_anonymous_is_rejected(client):
+    assert client.get("/metrics").status_code == 401
+
+
+def test_non_admin_is_rejected(app, client):
+    assert client.get("/metrics", headers=auth_headers(app, "Client")).status_code == 403
+
+
+def test_admin_jwt(client, headers):
+    r = client.get("/metrics", headers=headers)
+    assert r.status_code == 200
+    assert b"http_request_duration_seconds" in r.data
+
+
+def test_token(monkeypatch, client, headers):
+    use_token(monkeypatch, "s3cret")
+    assert client.get("/metrics", headers={"Authorization": "Bearer s3cret"}).status_code == 200
+    assert client.get("/metrics", headers={"Authorization": "Bearer gresit"}).status_code == 401
+    # cu token configurat, un JWT nu mai ajunge
+    assert client.get("/metrics", headers=headers).status_code == 401
@@ -0,0 +1,12 @@
+# test_passwords.py — hashing în pool-ul de procese
+from Modules import passwords
+
+
+def test_pool_hashes_without_fork():
+    try:
+        stored = passwords.hash_password("parola")
+        assert passwords.verify_password(stored, "parola")
+        assert not passwords.verify_password(stored, "alta")
+        assert passwords._get_executor()._mp_context.get_start_method() in ("forkserver", "spawn")
+    finally:
+        passwords.shutdown()
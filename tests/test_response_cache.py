@@ -0,0 +1,17 @@
+# test_response_cache.py — alegerea backend-ului după numărul de workeri
+import pytest
+
+import Modules.response_cache as rc
+
+
+@pytest.mark.parametrize("backend, workers, expected", [
+    (None, None, "memory"),
+    (None, 1, "memory"),
+    (None, 4, "redis"),
+    ("memory", 4, "memory"),
+    ("redis", 1, "redis"),
+])
+def test_backend_follows_workers(monkeypatch, backend, workers, expected):
+    settings = {"cache.responses.backend": backend, "server.workers": workers}
+    monkeypatch.setattr(rc, "get_setting", lambda key, default=None: settings.get(key, default))
+    assert rc.response_backend_name() == expected
@@ -0,0 +1,20 @@
+# test_rezervari.py — mesajele de eroare ale rezervărilor eșuate
+import pytest
+from werkzeug.exceptions import HTTPException
+
+from Modules.frontend_site import _rezervare_esuata
+from Modules.testing import seed_rooms
+
+
+@pytest.mark.parametrize("perechi, status, mesaj", [
+    ([("T0", "T0-9")], 404, "Camera disponibilă 'T0-9' nu a fost găsită"),
+    ([("T0", "T0-0"), ("T0", "T0-1")], 400, "Camera T0-0 este deja rezervată"),
+    # toate libere (eliberate între UPDATE și verificare): mesaj generic, fără nume gol
+    ([("T0", "T0-1"), ("T0", "T0-2")], 409, "modificări concurente"),
+])
+def test_rezervare_esuata(app, perechi, status, mesaj):
+    seed_rooms(app, 1, 3)  # T0-0 ocupată, T0-1 și T0-2 libere
+    with app.app_context(), pytest.raises(HTTPException) as e:
+        _rezervare_esuata(perechi)
+    assert e.value.code == status
+    assert mesaj in e.value.description
@@ -0,0 +1,121 @@
+# test_search.py — /search (un singur query cu OR) față de vechiul search_data (un query per filtru)
+import pytest
+from sqlalchemy import and_, or_
+
+from Modules.SQLModels import Camera, Product
+from Modules.query_plan import ModelSchema
+from Modules.testing import seed_products
+
+N_PRODUCTS = 300
+
+FILTER_SETS = [
+    [{"brand": "Dell"}],
+    [{"brand": "Dell"}, {"brand": "Asus"}],
+    [{"brand": "Dell"}, {"categorie": "laptop"}],  # se suprapun: Dell-urile laptop apar de două ori în vechiul răspuns
+    [{"string": "lenovo"}, {"string": "produs 1"}],
+    [{"string": {"like": "SAMSUNG"}}, {"status": "activ", "garantie": 24}],
+    [{"pret": {"min": 100, "max": 2000}}, {"pret": {"min": 1500, "max": 5000}}],
+    [{"number": {"min": 24}}, {"brand": "HP"}],
+    [{"model": {"like": "M1"}}, {"model": {"like": "M12"}}, {"categorie": "monitor"}],
+]
+
+
+def legacy_search(model, filters):
+    """Copia buclei din search_data-ul inițial: un query per filtru, rezultatele concatenate."""
+    results_total = []
+    for f in filters:
+        conditions = []
+        for col, val in f.items():
+            if col == "string":
+                like_val = val.get("like", val).lower() if isinstance(val, dict) else val.lower()
+                conditions.append(or_(*[model.__dict__[c.name].ilike(f"%{like_val}%")
+                                        for c in model.__table__.columns
+                                        if str(c.type).startswith("VARCHAR")]))
+                continue
+            if col == "number":
+                num_conditions = []
+                for c in model.__table__.columns:
+                    type_name = str(c.type).upper()
+                    if "INT" in type_name or "FLOAT" in type_name or "DECIMAL" in type_name:
+                        column = getattr(model, c.name)
+                        if val.get("min") is not None:
+                            num_conditions.append(column >= val["min"])
+                        if val.get("max") is not None:
+                            num_conditions.append(column <= val["max"])
+                if num_conditions:
+                    conditions.append(and_(*num_conditions))
+                continue
+
+            column = getattr(model, col)
+            if isinstance(val, dict):
+                if "like" in val:
+                    conditions.append(column.ilike(f"%{val['like']}%"))
+                if "min" in val:
+                    conditions.append(column >= val["min"])
+                if "max" in val:
+                    conditions.append(column <= val["max"])
+            else:
+                conditions.append(column == val)
+        results_total.extend(model.query.filter(and_(*conditions)).all())
+    return [row.id for row in results_total]
+
+
+@pytest.fixture
+def products(app):
+    seed_products(app, N_PRODUCTS)
+    return app
+
+
+@pytest.mark.parametrize("filters", FILTER_SETS)
+def test_search_matches_legacy_without_duplicates(products, client, headers, filters):
+    with products.app_context():
+        legacy = legacy_search(Product, filters)
+    expected = sorted(set(legacy))
+
+    r = client.get("/search", json={"products": {"filters": filters, "limit": 500}}, headers=headers)
+    assert r.status_code == 200
+    ids = [row["id"] for row in r.get_json()["products"]["results"]]
+    assert len(ids) == len(set(ids))
+    assert sorted(ids) == expected
+
+    r = client.get("/search", json={"products": {"filters": filters, "count_only": True}}, headers=headers)
+    assert r.get_json()["products"]["count"] == len(expected)
+
+
+def test_overlapping_filters_were_duplicated_by_legacy(products):
+    # garanția că testul de mai sus chiar acoperă cazul cu duplicate
+    with products.app_context():
+        legacy = legacy_search(Product, [{"brand": "Dell"}, {"categorie": "laptop"}])
+    assert len(legacy) > len(set(legacy))
+
+
+@pytest.mark.parametrize("body", [{"products": []}, {"products": {"filters": []}}])
+def test_empty_filter_list_returns_nothing(products, client, headers, body):
+    r = client.get("/search", json=body, headers=headers)
+    assert r.status_code == 200
+    assert r.get_json()["products"]["results"] == []
+
+
+def test_empty_filter_matches_everything(products, client, headers):
+    r = client.get("/search", json={"products": {"filters": [{}], "count_only": True}}, headers=headers)
+    assert r.get_json()["products"]["count"] == N_PRODUCTS
+
+
+def test_criteria_outside_filters_are_rejected(products, client, headers):
+    r = client.get("/search", json={"products": {"brand": "Dell", "limit": 3}}, headers=headers)
+    assert r.status_code == 400
+    assert "brand" in r.get_json()["error"]
+
+
+def test_schema_classifies_columns_like_legacy():
+    # aceleași coloane ca predicatele vechi pe numele tipului (VARCHAR; INT/FLOAT/DECIMAL)
+    for model in (Product, Camera):
+        schema = ModelSchema(model.__tablename__, model)
+        columns = model.__table__.columns
+        assert schema.string_columns == [c for c in columns if str(c.type).startswith("VARCHAR")]
+        assert schema.numeric_columns == [
+            c for c in columns if any(t in str(c.type).upper() for t in ("INT", "FLOAT", "DECIMAL"))
+        ]
+    products = ModelSchema("products", Product)
+    assert "descriere" not in [c.key for c in products.string_columns]
+    assert "pret" not in [c.key for c in products.numeric_columns]
@@ -0,0 +1,14 @@
+# test_text_search.py — legarea indexului text de rows_changed
+from Modules import query_plan
+from Modules.signals import rows_changed
+from Modules.text_search import init_text_search
+
+
+def test_init_connects_receiver_once(app, monkeypatch):
+    monkeypatch.setattr(query_plan, "text_backend", query_plan.text_backend)  # restaurat după test
+    before = len(rows_changed.receivers)
+    init_text_search(app)
+    connected = len(rows_changed.receivers)
+    init_text_search(app)
+    init_text_search(app)
+    assert len(rows_changed.receivers) == connected <= before + 1
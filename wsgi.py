@@ -0,0 +1,8 @@
+# wsgi.py — punctul de intrare pentru serverele WSGI de producție
+#
+#   gunicorn -c gunicorn.conf.py wsgi:app
+from server import create_app
+
+app = create_app()
+
+__all__ = ["app"]